@@ -0,0 +1,66 @@
+"""
+Micro-benchmark: per-invocation cost of the command restriction check.
+
+Times `CommandRestrictionIndex.get(...).allows(...)`, the work `is_command_allowed` does on every
+command, for guilds with a growing number of restricted commands, channels and roles. The cost
+should stay flat as the number of restrictions grows.
+
+Run from the repository root:
+    python -m benchmarks.bench_command_restrictions
+"""
+import random
+import timeit
+
+from tabulate import tabulate
+
+from modules.utils._cache_utils import CommandRestrictionIndex
+
+GUILD_ID = 1
+MEMBER_ROLE_COUNT = 50
+RESTRICTION_COUNTS = [1, 10, 100, 1000, 10000, 100000]
+NUMBER = 20_000
+
+
+def build_index(restriction_count: int) -> CommandRestrictionIndex:
+    """
+    Builds an index with `restriction_count` restricted commands, where the benchmarked
+    command is restricted to `restriction_count` channels and `restriction_count` roles.
+    """
+    rows = []
+    for command in range(restriction_count):
+        rows.append((GUILD_ID, f"command-{command}", "channel", 10**6 + command))
+        rows.append((GUILD_ID, f"command-{command}", "role", 2 * 10**6 + command))
+    for target in range(restriction_count):
+        rows.append((GUILD_ID, "benchmarked", "channel", 10**6 + target))
+        rows.append((GUILD_ID, "benchmarked", "role", 2 * 10**6 + target))
+    index = CommandRestrictionIndex()
+    index.load(rows)
+    return index
+
+
+def bench(restriction_count: int) -> list:
+    index = build_index(restriction_count)
+    # The member holds none of the restricted roles, the worst case for the role check.
+    member_roles = [random.randrange(3 * 10**6, 4 * 10**6) for _ in range(MEMBER_ROLE_COUNT)]
+    command_name = "benchmarked"
+    channel_id = 10**6
+
+    def check():
+        return index.get(GUILD_ID, command_name).allows(channel_id, (role for role in member_roles))
+
+    def check_unrestricted():
+        return index.get(GUILD_ID, "unrestricted").allows(channel_id, (role for role in member_roles))
+
+    restricted = min(timeit.repeat(check, number=NUMBER, repeat=3)) / NUMBER
+    unrestricted = min(timeit.repeat(check_unrestricted, number=NUMBER, repeat=3)) / NUMBER
+    return [restriction_count, len(index), f"{restricted * 1e9:.0f}", f"{unrestricted * 1e9:.0f}"]
+
+
+if __name__ == "__main__":
+    results = [bench(count) for count in RESTRICTION_COUNTS]
+    print(
+        tabulate(
+            results,
+            headers=["restrictions/command", "restricted commands", "restricted ns/check", "unrestricted ns/check"],
+        )
+    )
@@ -4,7 +4,8 @@ import discord
 import os
 import wavelink
 
-from sqlalchemy import select, insert
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -19,6 +20,16 @@ from modules.cogs.config import Config
 from modules.views.music import PlayerView
 from modules.orm.database import Guild
 from modules.utils._database_utils import get_session
+from modules.utils._cache_utils import LRUCache, CommandRestrictionIndex
+from modules.utils._config_utils import load_command_restrictions
+from modules.utils._search_utils import track_search_cache, track_store
+from modules.utils._prefetch_utils import track_prefetcher
+from modules.utils._node_utils import node_balancer
+from modules.player.ledger import ledger
+from modules.player.jackpot import jackpot_pool
+from modules.player.stakes import open_stakes
+from modules.player.slot_model import SLOT_MODEL, validate_slot_model
+from modules.exceptions import HouseEdgeError
 
 # TODO: Implement commands outside of Music cog. Fun cog, Modding cog.
 # TODO: Implement simple dashboard to visualize, queue, control playstate of music from web.
@@ -37,11 +48,17 @@ class Bot(commands.Bot):
     methods for handling music playback events using Wavelink nodes.
 
     Methods:
-        setup_hook: Asynchronously sets up Wavelink nodes for music playback.
-        on_ready: Logs information when the bot successfully logs in.
+        get_prefix: Resolves the command prefix of a message's guild, served from the guild prefix cache.
+        load_guild_prefixes: Loads every guild prefix into the cache with a single query.
+        ensure_guild_rows: Creates the missing guild rows with a single multi-row upsert.
+        setup_hook: Asynchronously validates the slot machine payouts, warms the caches, starts the cassino ledger, jackpot, open stakes and track store and connects the Wavelink nodes and their balancer.
+        close: Flushes the cassino ledger, jackpot, open stakes and track store and stops the node balancer before closing the bot.
+        on_ready: Logs information when the bot successfully logs in and creates missing guild rows.
+        on_guild_join: Creates the guild row for a newly joined guild.
         on_wavelink_node_ready: Logs information when a Wavelink node is connected.
-        on_wavelink_track_start: Handles the event when a track starts playing.
-        on_wavelink_track_end: Handles the event when a track finishes playing.
+        on_wavelink_node_disconnected: Moves the players of a disconnected Wavelink node to the other nodes.
+        on_wavelink_track_start: Handles the event when a track starts playing and prefetches the next tracks.
+        on_wavelink_track_end: Handles the event when a track finishes playing and plays the next one, prefetched if possible.
     """
 
     def __init__(self) -> None:
@@ -49,9 +66,9 @@ class Bot(commands.Bot):
         Initializes the Bot instance with a specific command prefix, intents, description, and a custom help command.
         Sets up logging and initializes the superclass.
         """
-        self.guild_prefix_cache = {}
-        self.restricted_commands_cache = {}
-        
+        self.guild_prefix_cache = LRUCache(maxsize=config.cache.guild_prefix_max_size)
+        self.restricted_commands_cache = CommandRestrictionIndex()
+
         intents = discord.Intents.all()
         discord.utils.setup_logging()
         super().__init__(
@@ -62,28 +79,52 @@ class Bot(commands.Bot):
         )
 
     async def get_prefix(self, message):
+        """
+        Resolves the prefix for the message's guild.
+        The prefix cache is warmed at startup, so only guilds evicted from (or missing in) the cache
+        cost a database round trip, after which the result is cached again.
+        Guilds without a row resolve to (and cache) the default prefix. Rows are created by
+        `on_ready`/`on_guild_join`, so this method never writes to the database.
+        """
         if not message.guild:
             return commands.when_mentioned_or(config.default_prefix)(bot, message)
-        if message.guild.id in self.guild_prefix_cache.keys():
-            prefix = self.guild_prefix_cache[message.guild.id]
-        else:
+        prefix = self.guild_prefix_cache.get(message.guild.id)
+        if prefix is None:
             async with self.session as session:
                 result = await session.execute(
-                    select(Guild).where(Guild.id == int(message.guild.id))
+                    select(Guild.prefix).where(Guild.id == int(message.guild.id))
                 )
-                guild = result.scalars().first()
-                if not guild:
-                    await session.execute(
-                        insert(Guild).values(
-                            id=message.guild.id, prefix=config.default_prefix
-                        )
-                    )
-                    await session.commit()
-                    prefix = config.default_prefix
-                else:
-                    prefix = guild.prefix
+                prefix = result.scalar() or config.default_prefix
+            self.guild_prefix_cache.put(message.guild.id, prefix)
         return commands.when_mentioned_or(prefix)(self, message)
 
+    async def load_guild_prefixes(self) -> None:
+        """
+        Loads every row of the guilds table into the prefix cache with a single query.
+        """
+        async with self.session as session:
+            result = await session.execute(select(Guild.id, Guild.prefix))
+            for guild_id, prefix in result.all():
+                self.guild_prefix_cache.put(guild_id, prefix)
+        logging.info("Loaded %s guild prefixes into the cache", len(self.guild_prefix_cache))
+
+    async def ensure_guild_rows(self, guild_ids: list[int]) -> None:
+        """
+        Creates the rows of the given guilds with the default prefix, in a single
+        multi-row `INSERT ... ON DUPLICATE KEY UPDATE` that leaves existing rows untouched.
+
+        Args:
+            guild_ids (list[int]): IDs of the guilds that must have a row in the guilds table.
+        """
+        if not guild_ids:
+            return
+        stmt = insert(Guild).values(
+            [{"id": guild_id, "prefix": config.default_prefix} for guild_id in guild_ids]
+        )
+        async with self.session as session:
+            await session.execute(stmt.on_duplicate_key_update(id=stmt.inserted.id))
+            await session.commit()
+
     @property
     def session(self) -> AsyncSession:
         """
@@ -93,22 +134,67 @@ class Bot(commands.Bot):
 
     async def setup_hook(self) -> None:
         """
-        Asynchronously sets up the necessary Wavelink nodes for music playback.
-        This method is a part of the bot's setup process.
+        Asynchronously validates the slot machine payouts, warms the guild prefix and command restriction caches
+        and connects every Wavelink node of `config.lavalink.nodes`, balancing the players between them.
+        This method is a part of the bot's setup process, and refuses to start a slot machine with a negative house edge
+        unless `config.fun.enforce_house_edge` is off.
         """
+        try:
+            slot_value = validate_slot_model(SLOT_MODEL, config.fun.house_retain)
+            logging.info("Slot machine house edge: %.2f%%", slot_value["house_edge"] * 100)
+        except HouseEdgeError as error:
+            if config.fun.enforce_house_edge:
+                raise
+            logging.error("%s. Starting anyway, as ENFORCE_HOUSE_EDGE is false", error)
+        await self.load_guild_prefixes()
+        await load_command_restrictions(self.restricted_commands_cache)
+        ledger.start()
+        jackpot_pool.start()
+        await open_stakes.start()
+        await track_store.start()
         nodes = [
             wavelink.Node(
-                uri=f"{config.lavalink.host}:{config.lavalink.port}",
+                identifier=uri,
+                uri=uri,
                 password=config.lavalink.password,
-            ),
+            )
+            for uri in config.lavalink.nodes
         ]
         await wavelink.Pool.connect(nodes=nodes, client=self)
+        node_balancer.start(self)
+
+    async def close(self) -> None:
+        """
+        Flushes the pending cassino balance, jackpot, open stakes and track store changes to the database,
+        stops the node balancer, then closes the bot.
+        """
+        await node_balancer.stop()
+        await open_stakes.stop()
+        await ledger.stop()
+        await jackpot_pool.stop()
+        await track_store.stop()
+        await super().close()
 
     async def on_ready(self):
         """
-        Event listener that is called when the bot is ready. It logs the bot's username and ID.
+        Event listener that is called when the bot is ready. It logs the bot's username and ID
+        and creates the rows of guilds that are not in the prefix cache yet.
         """
         logging.info("Logged in: %s | %s", self.user, self.user.id)
+        await self.ensure_guild_rows(
+            [guild.id for guild in self.guilds if guild.id not in self.guild_prefix_cache]
+        )
+
+    async def on_guild_join(self, guild: discord.Guild):
+        """
+        Event listener called when the bot joins a guild. Creates its row before any message arrives,
+        keeping the prefix of a guild that is joined again.
+
+        Args:
+            guild (discord.Guild): The guild that was joined.
+        """
+        await self.ensure_guild_rows([guild.id])
+        self.guild_prefix_cache.invalidate(guild.id)
 
     async def on_wavelink_node_ready(self, payload: wavelink.NodeReadyEventPayload):
         """
@@ -123,6 +209,17 @@ class Bot(commands.Bot):
             "Wavelink Node connected: %s | Resumed: %s", payload.node, payload.resumed
         )
 
+    async def on_wavelink_node_disconnected(self, payload: wavelink.NodeDisconnectedEventPayload):
+        """
+        Event listener called when a Wavelink node loses its connection.
+        Moves its players to the least loaded of the other nodes, so that playback resumes there.
+
+        Args:
+            payload (wavelink.NodeDisconnectedEventPayload): The payload containing the Wavelink node that has disconnected.
+        """
+        logging.warning("Wavelink Node disconnected: %s", payload.node)
+        await node_balancer.evacuate(payload.node, disconnected=True)
+
     def log(self, message: str) -> None:
         """
         Logs a message to the console.
@@ -137,7 +234,8 @@ class Bot(commands.Bot):
     ) -> None:
         """
         Event listener for when a track starts playing.
-        It creates an embed and view for the playing track and sends it to the player's designated channel.
+        It creates an embed and view for the playing track and sends it to the player's designated channel,
+        records the transition latency and prefetches the next tracks of the queue.
 
         Args:
             payload (wavelink.TrackStartEventPayload): Payload containing information about the track that started playing.
@@ -145,8 +243,11 @@ class Bot(commands.Bot):
         player: wavelink.Player | None = payload.player
         if not player:
             return
+        track_prefetcher.end_transition(player)
         original: wavelink.Playable | None = payload.original
-        track: wavelink.Playable = payload.track
+        # Prefetched mirrors are displayed as the track they were played for.
+        track: wavelink.Playable = track_prefetcher.original(player, payload.track)
+        track_prefetcher.schedule(player)
         embed = create_track_embed(track, original)
         view = PlayerView(player=player, timeout=track.length)
         await player.home.send(embed=embed, view=view)
@@ -165,7 +266,8 @@ class Bot(commands.Bot):
         if not player:
             return
         if player.queue:
-            await player.play(player.queue.get())  # HACK: Is this necessary?
+            track_prefetcher.start_transition(player)
+            await player.play(track_prefetcher.next_track(player))  # HACK: Is this necessary?
         elif player.autoplay == wavelink.AutoPlayMode.disabled:
             await player.home.send("The queue is over. Goodbye!")
             await player.disconnect()
@@ -211,7 +313,10 @@ class Bot(commands.Bot):
 
         return (f"<Bot {bot_status} | name='{bot_name}' | id={bot_id} | guilds={guild_count} "
                 f"| default_prefix='{default_prefix}' | Wavelink connected={wavelink_connected}>"
-                f"\n Guild Prefix Cache: {guild_prefix_cache} \n Restricted Commands Cache: {restricted_commands_cache}")
+                f"\n Guild Prefix Cache: {guild_prefix_cache.stats} \n Restricted Commands Cache: {len(restricted_commands_cache)} restrictions"
+                f"\n Track Search Cache: {track_search_cache.stats}"
+                f"\n Track Prefetcher: {track_prefetcher.stats}"
+                f"\n Lavalink Nodes: {node_balancer.stats}")
 
 bot: Bot = Bot()
 
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 
 import discord
 
+from modules.player.stakes import open_stakes
 
 class ActionCommand(ABC):
     @abstractmethod
@@ -22,10 +23,7 @@ class ActionCommand(ABC):
         return True
     
     async def subtract_bet(self):
-        await self.view.cassino_player.refresh()
-        self.view.cassino_player.db_player.balance -= self.view.bet
-        self.view.cassino_player.db_player.money_lost += self.view.bet
-        await self.view.cassino_player.update(self.view.cassino_player.db_player)
+        return await self.view.cassino_player.mutate_balance(bet=self.view.bet, money_lost=self.view.bet)
 
     async def finalize_game(self, interaction: discord.Interaction):
         # Determine the outcome
@@ -48,25 +46,16 @@ class ActionCommand(ABC):
 
         # Update the player's balance and stats
         bet = self.view.bet
-        await self.view.cassino_player.refresh()
+        open_stakes.settle(self.view.message.id)
         if win:
             result_content += f"\nYou won ${bet}!"
-            prize = bet * 2
-            self.view.cassino_player.db_player.balance += prize
-            self.view.cassino_player.db_player.money_won += bet
-            self.view.cassino_player.db_player.blackjack_wins += 1
+            await self.view.cassino_player.mutate_balance(prize=bet * 2, money_won=bet, blackjack_wins=1)
         elif tie:
             result_content += f"\nYou get your bet back!"
-            prize = bet
-            self.view.cassino_player.db_player.balance += prize
+            await self.view.cassino_player.mutate_balance(prize=bet)
         else:
             result_content += f"\nYou lost ${bet}!"
-            prize = 0
-            self.view.cassino_player.db_player.balance += prize
-            self.view.cassino_player.db_player.money_lost += bet
-
-        # Update the database with the new player stats
-        await self.view.cassino_player.update(self.view.cassino_player.db_player)
+            await self.view.cassino_player.mutate_balance(money_lost=bet)
 
         # Send the result message
         result_content += f" Your new balance is ${self.view.cassino_player.db_player.balance}"
@@ -134,8 +123,12 @@ class StartAction(ActionCommand):
         
         if not await self.ensure_minimum_balance(interaction, self.view.bet):
             return
+        if not await self.subtract_bet():
+            await interaction.response.send_message("You don't have enough money for this action!", ephemeral=True)
+            return
         
         await self.view.prepare_blackjack()
+        open_stakes.open(self.view.message.id, self.view.bet)
 
         self.view.cassino_player.add_to_hand(self.view.blackjack_dealer.deal_card())
         self.view.cassino_player.add_to_hand(self.view.blackjack_dealer.deal_card())
@@ -149,7 +142,6 @@ class StartAction(ActionCommand):
         self.disable_start_button()
         self.disable_bet_buttons()
 
-        await self.subtract_bet()
         await interaction.response.edit_message(content=content, view=self.view)
 
 
@@ -183,7 +175,10 @@ class DoubleAction(ActionCommand):
         if not await self.ensure_minimum_balance(interaction, self.view.bet * 2):
             return
         
-        await self.subtract_bet()
+        if not await self.subtract_bet():
+            await interaction.response.send_message("You don't have enough money for this action!", ephemeral=True)
+            return
+        open_stakes.open(self.view.message.id, self.view.bet)
         self.view.bet *= 2
         self.view.blackjack_dealer.hit(self.view.cassino_player)
         self.view.blackjack_dealer.play()
@@ -10,6 +10,7 @@ class BlackjackButton(discord.ui.Button):
         disabled: bool = False,
         row: int | None = None,
         style: discord.ButtonStyle | None = discord.ButtonStyle.secondary,
+        custom_id: str | None = None,
     ):
         """
         Initializes the BlackJackButton with specific properties.
@@ -18,6 +19,7 @@ class BlackjackButton(discord.ui.Button):
         - action: The action to be performed when the button is clicked.
         - row: The row where the button should be placed in the Discord UI.
         - style: The style of the button (color/theme).
+        - custom_id: Stable id of the button, so a click can be routed back to its cassino after a restart.
         """
         self.action = action
         super().__init__(
@@ -25,6 +27,7 @@ class BlackjackButton(discord.ui.Button):
             label=label,
             disabled=disabled,
             row=row,
+            custom_id=custom_id,
         )
 
     async def callback(self, interaction: discord.Interaction):
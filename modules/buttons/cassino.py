@@ -8,6 +8,7 @@ from modules.player.player import CassinoPlayer
 class CassinoSelect(discord.ui.Select):
     def __init__(
         self,
+        custom_id: str | None = None,
     ):
         options = [
             discord.SelectOption(label="Slots", value="slots", description="Play Slots"),
@@ -21,6 +22,7 @@ class CassinoSelect(discord.ui.Select):
             min_values=1,
             max_values=1,
             options=options,
+            custom_id=custom_id,
         )
 
     async def callback(self, interaction: discord.Interaction):
@@ -48,35 +50,41 @@ class CassinoSelect(discord.ui.Select):
         The asynchronous callback executed when the button is clicked.
         - interaction: The interaction instance associated with the button click.
         """
-        await self.view.prepare_slots()
-        await interaction.response.edit_message(view=self.view)
+        # Showing the game clears the menu, which detaches this select from the view.
+        view = self.view
+        await view.prepare_slots()
+        await interaction.response.edit_message(view=view)
 
     async def blackjack(self, interaction: discord.Interaction):
         """
         The asynchronous callback executed when the button is clicked.
         - interaction: The interaction instance associated with the button click.
         """
-        await self.view.prepare_blackjack()
-        await interaction.response.edit_message(view=self.view)
+        view = self.view
+        await view.prepare_blackjack()
+        await interaction.response.edit_message(view=view)
 
     async def roulette(self, interaction: discord.Interaction):
         """
         The asynchronous callback executed when the button is clicked.
         - interaction: The interaction instance associated with the button click.
         """
-        await self.view.prepare_roulette()
-        await interaction.response.edit_message(view=self.view)
+        view = self.view
+        await view.prepare_roulette()
+        await interaction.response.edit_message(view=view)
     async def video_poker(self, interaction: discord.Interaction):
         """
         The asynchronous callback executed when the button is clicked.
         - interaction: The interaction instance associated with the button click.
         """
-        await self.view.prepare_video_poker()
-        await interaction.response.edit_message(view=self.view)
+        view = self.view
+        await view.prepare_video_poker()
+        await interaction.response.edit_message(view=view)
     async def dig_trash(self, interaction: discord.Interaction):
         """
         The asynchronous callback executed when the button is clicked.
         - interaction: The interaction instance associated with the button click.
         """
-        await self.view.prepare_dig_trash()
-        await interaction.response.edit_message(view=self.view)
+        view = self.view
+        await view.prepare_dig_trash()
+        await interaction.response.edit_message(view=view)
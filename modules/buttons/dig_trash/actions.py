@@ -23,11 +23,8 @@ class ActionCommand(ABC):
         return True
 
     async def update_balance(self, prize):
-        await self.view.cassino_player.refresh()
-        self.view.cassino_player.db_player.balance += prize
-        self.view.cassino_player.db_player.money_won += max(prize, 0)
-        self.view.cassino_player.db_player.dig_trash_wins += max(prize, 0)
-        await self.view.cassino_player.update(self.view.cassino_player.db_player)
+        prize = max(prize, 0)
+        return await self.view.cassino_player.mutate_balance(prize=prize, money_won=prize, dig_trash_wins=prize)
 
 
 class DigTrashAction(ActionCommand):
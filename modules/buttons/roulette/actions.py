@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
 from modules.globals import config
+from modules.player.roulette import BET_LABELS
 
 import discord
 
@@ -24,26 +25,44 @@ class ActionCommand(ABC):
             return False
         return True
     
-    async def update_balance(self, prize, bet):
-        await self.view.cassino_player.refresh()
-        self.view.cassino_player.db_player.balance += prize
-        self.view.cassino_player.db_player.money_won += max(prize, 0)
-        self.view.cassino_player.db_player.money_lost += bet if prize > 0 else 0
-        self.view.cassino_player.db_player.roulette_wins += prize if prize > 0 else 0
-        await self.view.cassino_player.update(self.view.cassino_player.db_player)
+    async def update_balance(self, bets):
+        """
+        Settles `(bet_type, amount)` bets against the current wheel result with a single balance write.
+        Returns the winnings and lost stakes, or None if the balance does not cover the bets.
+        The stats keep the single bet accounting on the net result of the bets: a net win counts as
+        money won and roulette wins, and the stake counts as money lost only when the net result is a win.
+        """
+        stake = sum(amount for _, amount in bets)
+        won, lost = self.view.roulette.settle(bets)
+        net = max(won - lost, 0)
+        if not await self.view.cassino_player.mutate_balance(
+            bet=stake,
+            prize=stake - lost + won,
+            money_won=net,
+            money_lost=stake if net else 0,
+            roulette_wins=net,
+        ):
+            return None
+        return won, lost
+
+    async def place_bet(self, interaction: discord.Interaction, bet_type: str):
+        if self.view.roulette_slip is not None:
+            await self.add_to_slip(interaction, bet_type)
+        else:
+            await self.spin(interaction, bet_type)
 
-    async def spin(self, interaction: discord.Interaction, condition: bool, prize_modifier: int):
+    async def spin(self, interaction: discord.Interaction, bet_type: str):
         if not await self.ensure_bet(interaction):
             return
         if not await self.ensure_minimum_balance(interaction, self.view.bet):
             return
-        
-        if condition:
-            prize = self.view.bet*prize_modifier
-        else:
-            prize = -self.view.bet
 
-        await self.update_balance(prize, self.view.bet)
+        result = await self.update_balance([(bet_type, self.view.bet)])
+        if result is None:
+            await interaction.response.send_message("You don't have enough money for this action!", ephemeral=True)
+            return
+        won, lost = result
+        prize = won - lost
 
         self.view.bet = None
         content = self.display(prize, self.view.roulette.winning_number)
@@ -51,11 +70,38 @@ class ActionCommand(ABC):
         await self.view.prepare_roulette()
         await interaction.response.edit_message(content=content, view=self.view)
 
+    async def add_to_slip(self, interaction: discord.Interaction, bet_type: str):
+        if not await self.ensure_bet(interaction):
+            return
+        slip = self.view.roulette_slip
+        if not await self.ensure_minimum_balance(interaction, sum(slip.values()) + self.view.bet):
+            return
+        slip[bet_type] = slip.get(bet_type, 0) + self.view.bet
+        self.update_slip_buttons()
+        await interaction.response.edit_message(content=self.display_slip(), view=self.view)
+
+    def display_slip(self):
+        slip = self.view.roulette_slip
+        if not slip:
+            return "Bet slip is empty, pick a bet to add it."
+        content = "Bet slip: " + ", ".join(f"${amount} on {BET_LABELS[bet_type]}" for bet_type, amount in slip.items())
+        content += f"\nTotal: ${sum(slip.values())}"
+        return content
+
+    def update_slip_buttons(self):
+        for item in self.view.children:
+            if isinstance(item, discord.ui.Button) and isinstance(item.action, RouletteSlipAction):
+                item.style = discord.ButtonStyle.green if self.view.roulette_slip is not None else discord.ButtonStyle.grey
+            elif isinstance(item, discord.ui.Button) and isinstance(item.action, RouletteSpinSlipAction):
+                item.disabled = not self.view.roulette_slip
+
     def display(self, prize, number):
         if prize > 0:
             content = f"You won ${prize}!"
         elif prize < 0:
             content = f"You lost ${-prize}!"
+        else:
+            content = "You broke even!"
         content += f"\nThe winning number was {number}!"
         return content
 
@@ -83,6 +129,7 @@ class RouletteReturnAction(ActionCommand):
         self.view = view
 
     async def execute(self, button: discord.ui.Button, interaction: discord.Interaction):
+        self.view.roulette_slip = None
         self.view.prepare_menu()
         await interaction.response.edit_message(content=None, view=self.view)
 
@@ -107,7 +154,7 @@ class BetRedAction(ActionCommand):
         self.view = view
 
     async def execute(self, button: discord.ui.Button, interaction: discord.Interaction):
-        await self.spin(interaction, self.view.roulette.is_red, self.view.roulette.payout['red'])
+        await self.place_bet(interaction, "red")
 
 
 class BetBlackAction(ActionCommand):
@@ -115,7 +162,7 @@ class BetBlackAction(ActionCommand):
         self.view = view
 
     async def execute(self, button: discord.ui.Button, interaction: discord.Interaction):
-        await self.spin(interaction, self.view.roulette.is_black, self.view.roulette.payout['black'])
+        await self.place_bet(interaction, "black")
 
 
 class BetEvenAction(ActionCommand):
@@ -123,7 +170,7 @@ class BetEvenAction(ActionCommand):
         self.view = view
 
     async def execute(self, button: discord.ui.Button, interaction: discord.Interaction):
-        await self.spin(interaction, self.view.roulette.is_even, self.view.roulette.payout['even'])
+        await self.place_bet(interaction, "even")
 
 
 class BetOddAction(ActionCommand):
@@ -131,7 +178,7 @@ class BetOddAction(ActionCommand):
         self.view = view
 
     async def execute(self, button: discord.ui.Button, interaction: discord.Interaction):
-        await self.spin(interaction, self.view.roulette.is_odd, self.view.roulette.payout['odd'])
+        await self.place_bet(interaction, "odd")
 
 
 class Bet1st12Action(ActionCommand):
@@ -139,7 +186,7 @@ class Bet1st12Action(ActionCommand):
         self.view = view
 
     async def execute(self, button: discord.ui.Button, interaction: discord.Interaction):
-        await self.spin(interaction, self.view.roulette.is_1st_12, self.view.roulette.payout['1st_12'])
+        await self.place_bet(interaction, "1st_12")
 
 
 class Bet2nd12Action(ActionCommand):
@@ -147,7 +194,7 @@ class Bet2nd12Action(ActionCommand):
         self.view = view
 
     async def execute(self, button: discord.ui.Button, interaction: discord.Interaction):
-        await self.spin(interaction, self.view.roulette.is_2nd_12, self.view.roulette.payout['2nd_12'])
+        await self.place_bet(interaction, "2nd_12")
 
 
 class Bet3rd12Action(ActionCommand):
@@ -155,7 +202,7 @@ class Bet3rd12Action(ActionCommand):
         self.view = view
 
     async def execute(self, button: discord.ui.Button, interaction: discord.Interaction): 
-        await self.spin(interaction, self.view.roulette.is_3rd_12, self.view.roulette.payout['3rd_12'])
+        await self.place_bet(interaction, "3rd_12")
 
 
 class Bet1to18Action(ActionCommand):
@@ -163,7 +210,7 @@ class Bet1to18Action(ActionCommand):
         self.view = view
     
     async def execute(self, button: discord.ui.Button, interaction: discord.Interaction): 
-        await self.spin(interaction, self.view.roulette.is_1_to_18, self.view.roulette.payout['1_to_18'])
+        await self.place_bet(interaction, "1_to_18")
 
 
 class Bet19to36Action(ActionCommand):
@@ -171,7 +218,7 @@ class Bet19to36Action(ActionCommand):
         self.view = view
     
     async def execute(self, button: discord.ui.Button, interaction: discord.Interaction): 
-        await self.spin(interaction, self.view.roulette.is_19_to_36, self.view.roulette.payout['19_to_36'])
+        await self.place_bet(interaction, "19_to_36")
 
 
 class Bet1stRowAction(ActionCommand):
@@ -179,7 +226,7 @@ class Bet1stRowAction(ActionCommand):
         self.view = view
     
     async def execute(self, button: discord.ui.Button, interaction: discord.Interaction): 
-        await self.spin(interaction, self.view.roulette.is_first_row, self.view.roulette.payout['1st_row'])
+        await self.place_bet(interaction, "1st_row")
 
 
 class Bet2ndRowAction(ActionCommand):
@@ -187,7 +234,7 @@ class Bet2ndRowAction(ActionCommand):
         self.view = view
     
     async def execute(self, button: discord.ui.Button, interaction: discord.Interaction): 
-        await self.spin(interaction, self.view.roulette.is_second_row, self.view.roulette.payout['2nd_row'])
+        await self.place_bet(interaction, "2nd_row")
 
 
 class Bet3rdRowAction(ActionCommand):
@@ -195,7 +242,7 @@ class Bet3rdRowAction(ActionCommand):
         self.view = view
     
     async def execute(self, button: discord.ui.Button, interaction: discord.Interaction): 
-        await self.spin(interaction, self.view.roulette.is_third_row, self.view.roulette.payout['3rd_row'])
+        await self.place_bet(interaction, "3rd_row")
 
 
 class BetGreenAction(ActionCommand):
@@ -203,7 +250,51 @@ class BetGreenAction(ActionCommand):
         self.view = view
     
     async def execute(self, button: discord.ui.Button, interaction: discord.Interaction): 
-        await self.spin(interaction, self.view.roulette.is_green, self.view.roulette.payout['green'])
+        await self.place_bet(interaction, "green")
+
+
+class RouletteSlipAction(ActionCommand):
+    def __init__(self, view):
+        self.view = view
+
+    async def execute(self, button: discord.ui.Button, interaction: discord.Interaction):
+        # Nothing is taken from the balance until the slip is spun, so a dropped slip costs nothing.
+        self.view.roulette_slip = {} if self.view.roulette_slip is None else None
+        self.update_slip_buttons()
+        content = self.display_slip() if self.view.roulette_slip is not None else None
+        await interaction.response.edit_message(content=content, view=self.view)
+
+
+class RouletteSpinSlipAction(ActionCommand):
+    def __init__(self, view):
+        self.view = view
+
+    async def execute(self, button: discord.ui.Button, interaction: discord.Interaction):
+        slip = self.view.roulette_slip
+        if not slip:
+            await interaction.response.send_message("Your bet slip is empty!", ephemeral=True)
+            return
+
+        bets = list(slip.items())
+        result = await self.update_balance(bets)
+        if result is None:
+            await interaction.response.send_message("You don't have enough money for this action!", ephemeral=True)
+            return
+        won, lost = result
+
+        number = self.view.roulette.winning_number
+        lines = []
+        for bet_type, amount in bets:
+            if self.view.roulette.wins(bet_type):
+                lines.append(f"{BET_LABELS[bet_type]}: won ${amount * self.view.roulette.payout[bet_type]}")
+            else:
+                lines.append(f"{BET_LABELS[bet_type]}: lost ${amount}")
+        content = "\n".join(lines) + "\n" + self.display(won - lost, number)
+
+        slip.clear()
+        self.view.roulette.spin_wheel()
+        self.update_slip_buttons()
+        await interaction.response.edit_message(content=content, view=self.view)
 
 
 class GetRouletteTable(ActionCommand):
@@ -10,12 +10,16 @@ class RouletteButton(discord.ui.Button):
         action: ActionCommand,
         row: int | None = None,
         style: discord.ButtonStyle | None = discord.ButtonStyle.secondary,
+        disabled: bool = False,
+        custom_id: str | None = None,
     ):
         self.action = action
         super().__init__(
             style=style,
             label=label,
             row=row,
+            custom_id=custom_id,
+            disabled=disabled,
         )
 
     async def callback(self, interaction: discord.Interaction):
@@ -22,14 +22,10 @@ class ActionCommand(ABC):
         return True
 
     async def update_balance(self, prize, bet):
-        await self.view.cassino_player.refresh()
-        self.view.cassino_player.db_player.balance -= bet
-        self.view.cassino_player.db_player.money_lost += bet
-        if prize > 0:
-            self.view.cassino_player.db_player.money_won += prize
-            self.view.cassino_player.db_player.balance += prize
-            self.view.cassino_player.db_player.slot_wins += prize
-        await self.view.cassino_player.update(self.view.cassino_player.db_player)
+        prize = max(prize, 0)
+        return await self.view.cassino_player.mutate_balance(
+            bet=bet, prize=prize, money_lost=bet, money_won=prize, slot_wins=prize
+        )
 
 
 class SpinAction(ActionCommand):
@@ -43,9 +39,16 @@ class SpinAction(ActionCommand):
             return
         
         machine_result = self.view.slot_machine.spin()
-        prize = await self.view.slot_machine.calculate_prize(machine_result, self.view.bet)
-        await self.update_balance(prize, self.view.bet)
-        
+        prize = self.view.slot_machine.calculate_prize(machine_result, self.view.bet)
+        if not await self.update_balance(prize, self.view.bet):
+            await interaction.response.send_message("You don't have enough money for this action!", ephemeral=True)
+            return
+        # The jackpot is only claimed or fed once the bet went through.
+        jackpot = await self.view.slot_machine.settle_jackpot(machine_result, self.view.bet)
+        if jackpot:
+            await self.view.cassino_player.mutate_balance(prize=jackpot, money_won=jackpot, slot_wins=jackpot)
+            prize += jackpot
+
         content = " ".join(machine_result)
         content += f"\nYou {'won' if prize > 0 else 'lost'} ${prize if prize > 0 else self.view.bet}!"
         content += f"\nYour balance is now ${self.view.cassino_player.db_player.balance}"
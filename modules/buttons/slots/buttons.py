@@ -10,12 +10,14 @@ class SlotButton(discord.ui.Button):
         action: ActionCommand,
         row: int | None = None,
         style: discord.ButtonStyle | None = discord.ButtonStyle.secondary,
+        custom_id: str | None = None,
     ):
         self.action = action
         super().__init__(
             style=style,
             label=label,
             row=row,
+            custom_id=custom_id,
         )
 
     async def callback(self, interaction: discord.Interaction):
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import discord
 
@@ -5,6 +6,12 @@ from abc import ABC, abstractmethod
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
 from modules.globals import config
+from modules.player.cards import RANK_LABELS, SUIT_LABELS
+from modules.player.stakes import open_stakes
+from modules.player.video_poker_solver import best_hold
+
+# Each uncached solve holds a worker thread for around a second, so only a few run at once.
+hint_solves = asyncio.Semaphore(config.fun.video_poker_hint_solves)
 
 
 class ActionCommand(ABC):
@@ -26,14 +33,10 @@ class ActionCommand(ABC):
         return True
 
     async def update_balance(self, prize, bet):
-        await self.view.cassino_player.refresh()
-        player = self.view.cassino_player.db_player
-        player.balance += (prize - bet)
-        player.money_won += max(prize, 0)
-        player.money_lost += bet
-        if prize > 0:
-            player.video_poker_wins += prize
-        await self.view.cassino_player.update(player)
+        prize = max(prize, 0)
+        return await self.view.cassino_player.mutate_balance(
+            bet=bet, prize=prize, money_won=prize, money_lost=bet, video_poker_wins=prize
+        )
 
     def disable_bet_buttons(self):
         for item in self.view.children:
@@ -75,6 +78,16 @@ class ActionCommand(ABC):
             if isinstance(item, discord.ui.Button) and isinstance(item.action, RedrawAction):
                 item.disabled = True
 
+    def enable_hint_button(self):
+        for item in self.view.children:
+            if isinstance(item, discord.ui.Button) and isinstance(item.action, VideoPokerHintAction):
+                item.disabled = False
+
+    def disable_hint_button(self):
+        for item in self.view.children:
+            if isinstance(item, discord.ui.Button) and isinstance(item.action, VideoPokerHintAction):
+                item.disabled = True
+
 class VideoPokerBetAction(ActionCommand):
     def __init__(self, view, amount):
         self.view = view
@@ -101,15 +114,19 @@ class VideoPokerStartAction(ActionCommand):
     async def execute(self, button: discord.ui.Button, interaction: discord.Interaction):
         if not await self.ensure_bet(interaction):
             return
+        if not await self.update_balance(prize=0, bet=self.view.bet):
+            await interaction.response.send_message("You don't have enough money for this action!", ephemeral=True)
+            return
+        open_stakes.open(self.view.message.id, self.view.bet)
         
         self.disable_bet_buttons()
         self.disable_start_button()
         self.enable_lock_buttons()
         self.enable_redraw_button()
+        self.enable_hint_button()
 
         content = f"Your initial hand is: {self.view.cassino_player.display_hand()}"
 
-        await self.update_balance(prize=0, bet=self.view.bet)
         await interaction.response.edit_message(content=content, view=self.view)
 
 class VideoPokerReturnAction(ActionCommand):
@@ -149,6 +166,25 @@ class DisplayHandsAction(ActionCommand):
         except Exception as e:
             logging.error(f"Failed to send image: {str(e)}")
 
+class VideoPokerHintAction(ActionCommand):
+    def __init__(self, view):
+        self.view = view
+
+    async def execute(self, button: discord.ui.Button, interaction: discord.Interaction):
+        if not await self.ensure_bet(interaction):
+            return
+
+        # Solving an uncached hand takes around a second, keep it off the event loop.
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        hand = tuple(self.view.cassino_player.hand)
+        async with hint_solves:
+            hold, value = await asyncio.to_thread(best_hold, hand)
+
+        held = " ".join(f"[{RANK_LABELS[card]} {SUIT_LABELS[card]}]" for card, keep in zip(hand, hold) if keep)
+        content = f"Best hold: {held or 'nothing, draw five new cards'}"
+        content += f"\nExpected payout: ${value * self.view.bet:.2f} for your ${self.view.bet} bet"
+        await interaction.followup.send(content, ephemeral=True)
+
 class LockCardAction(ActionCommand):
     def __init__(self, view, card_index):
         self.view = view
@@ -180,6 +216,7 @@ class RedrawAction(ActionCommand):
             return
         
         self.disable_redraw_button()
+        self.disable_hint_button()
         self.disable_lock_buttons()
         self.enable_bet_buttons()
         self.enable_start_button()
@@ -188,6 +225,7 @@ class RedrawAction(ActionCommand):
         prize = self.view.cassino_player.calculate_winnings(self.view.bet)
 
         await self.update_balance(prize, 0)
+        open_stakes.settle(self.view.message.id)
 
         content = f"Your final hand is: {self.view.cassino_player.display_hand()}"
         content += f"\n You have a {self.view.cassino_player.hand_evaluation}!"
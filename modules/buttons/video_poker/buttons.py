@@ -10,6 +10,7 @@ class VideoPokerButton(discord.ui.Button):
         disabled: bool = False,
         row: int | None = None,
         style: discord.ButtonStyle | None = discord.ButtonStyle.secondary,
+        custom_id: str | None = None,
     ):
         """
         Initializes the VideoPokerButton with specific properties.
@@ -17,6 +18,7 @@ class VideoPokerButton(discord.ui.Button):
         - action: The action to be performed when the button is clicked.
         - row: The row where the button should be placed in the Discord UI.
         - style: The style of the button (color/theme).
+        - custom_id: Stable id of the button, so a click can be routed back to its cassino after a restart.
         """
         self.action = action
         super().__init__(
@@ -24,6 +26,7 @@ class VideoPokerButton(discord.ui.Button):
             label=label,
             disabled=disabled,
             row=row,
+            custom_id=custom_id,
         )
 
     async def callback(self, interaction: discord.Interaction):
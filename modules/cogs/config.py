@@ -33,14 +33,20 @@ Additional Notes:
 import re
 import discord
 
+from io import BytesIO
+
 from discord import Object
 from discord.ext import commands
-from sqlalchemy import select, update
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import insert
 
 from modules.globals import config
-from modules.orm.database import Cassino, Guild, Command, CommandRestriction
+from modules.orm.database import Guild, Command, CommandRestriction
+from modules.player.ledger import ledger
 from modules.utils._database_utils import get_session
-from modules.utils._config_utils import is_command_allowed
+from modules.utils._config_utils import is_command_allowed, get_or_create_command_id
+
+DISCORD_MESSAGE_LIMIT = 2000
 
 
 class Config(commands.Cog):
@@ -74,26 +80,23 @@ class Config(commands.Cog):
         Sets a custom prefix for the bot in your server.
         """
         if not new_prefix:  # if prefix is not passed, display current prefix
-            async with self.bot.session as session:
-                if ctx.guild.id in self.bot.guild_prefix_cache.keys():
-                    prefix = self.bot.guild_prefix_cache[ctx.guild.id]
-                else:
+            prefix = self.bot.guild_prefix_cache.get(ctx.guild.id)
+            if prefix is None:
+                async with self.bot.session as session:
                     result = await session.execute(
-                        select(Guild).where(Guild.id == int(ctx.guild.id))
+                        select(Guild.prefix).where(Guild.id == int(ctx.guild.id))
                     )
-                    prefix = result.scalars().first().prefix
-                await ctx.send(f"Your current guild prefix is {prefix}")
+                    prefix = result.scalar() or config.default_prefix
+                self.bot.guild_prefix_cache.put(ctx.guild.id, prefix)
+            await ctx.send(f"Your current guild prefix is {prefix}")
 
         else:
             async with self.bot.session as session:
-                result = await session.execute(
-                    update(Guild)
-                    .where(Guild.id == int(ctx.guild.id))
-                    .values(prefix=new_prefix)
-                )
-                self.bot.guild_prefix_cache[ctx.guild.id] = new_prefix
-
+                self.bot.guild_prefix_cache.invalidate(ctx.guild.id)
+                stmt = insert(Guild).values(id=int(ctx.guild.id), prefix=new_prefix)
+                await session.execute(stmt.on_duplicate_key_update(prefix=stmt.inserted.prefix))
                 await session.commit()
+                self.bot.guild_prefix_cache.put(ctx.guild.id, new_prefix)
                 await ctx.send(f"Changing prefix to {new_prefix}")
     
     @commands.hybrid_command(name="change-nickname", aliases=["change-nick", "cn", "nick", "nickname"])
@@ -158,40 +161,20 @@ class Config(commands.Cog):
             return
 
         async with get_session() as session:
-            # Find or create the command in the Commands table
-            stmt = select(Command).where(Command.guild_id == ctx.guild.id, Command.command_name == command_name)
-            result = await session.execute(stmt)
-            command_entry = result.scalars().first()
-            
-            if not command_entry:
-                command_entry = Command(guild_id=ctx.guild.id, command_name=command_name)
-                session.add(command_entry)
-                await session.commit()
-
-            # Update or insert the restriction
-            stmt = select(CommandRestriction).where(
-                CommandRestriction.command_id == command_entry.command_id,
-                CommandRestriction.restriction_type == restriction_type,
-                CommandRestriction.restriction_target == restriction_target
+            # Commands rows are only created here, the first time a command gets restricted
+            command_id = await get_or_create_command_id(session, ctx.guild.id, command_name)
+
+            # Insert the restriction, keeping the existing row if it is already there
+            stmt = insert(CommandRestriction).values(
+                command_id=command_id,
+                restriction_type=restriction_type,
+                restriction_target=restriction_target,
             )
-            result = await session.execute(stmt)
-            restriction_entry = result.scalars().first()
-
-            if not restriction_entry:
-                restriction_entry = CommandRestriction(command_id=command_entry.command_id, restriction_type=restriction_type, restriction_target=restriction_target)
-                session.add(restriction_entry)
-                await session.commit()
+            await session.execute(stmt.on_duplicate_key_update(restriction_id=CommandRestriction.restriction_id))
+            await session.commit()
 
             # Update cache
-            guild_restrictions = self.bot.restricted_commands_cache.setdefault(ctx.guild.id, {})
-            command_restrictions = guild_restrictions.setdefault(command_name, {"channels": [], "roles": []})
-
-            if restriction_type == "channel":
-                if restriction_target not in command_restrictions["channels"]:
-                    command_restrictions["channels"].append(restriction_target)
-            elif restriction_type == "role":
-                if restriction_target not in command_restrictions["roles"]:
-                    command_restrictions["roles"].append(restriction_target)
+            self.bot.restricted_commands_cache.add(ctx.guild.id, command_name, restriction_type, restriction_target)
             
             mention_string = f"<#{restriction_target}>" if restriction_type == "channel" else f"<@&{restriction_target}>"
             await ctx.send(f"Restricted {command_name} to {'channel' if restriction_type == 'channel' else 'role'} {mention_string}")
@@ -256,17 +239,7 @@ class Config(commands.Cog):
                     await ctx.send(f"No {restriction_type} restriction found for {command_name}.")
 
                 # Update cache
-                if ctx.guild.id in self.bot.restricted_commands_cache:
-                    guild_restrictions = self.bot.restricted_commands_cache[ctx.guild.id]
-                    if command_name in guild_restrictions:
-                        if restriction_type == "channel" and restriction_target in guild_restrictions[command_name]["channels"]:
-                            guild_restrictions[command_name]["channels"].remove(restriction_target)
-                        elif restriction_type == "role" and restriction_target in guild_restrictions[command_name]["roles"]:
-                            guild_restrictions[command_name]["roles"].remove(restriction_target)
-
-                        if not guild_restrictions[command_name]["channels"] and not guild_restrictions[command_name]["roles"]:
-                            # If there are no more restrictions, remove the command from the cache
-                            del guild_restrictions[command_name]
+                self.bot.restricted_commands_cache.remove(ctx.guild.id, command_name, restriction_type, restriction_target)
             else:
                 await ctx.send(f"Command {command_name} not found.")
 
@@ -288,7 +261,12 @@ class Config(commands.Cog):
             return
         
         if int(ctx.author.id) == int(config.bot_owner_id):
-            await ctx.send(repr(self.bot))
+            report = repr(self.bot)
+            if len(report) <= DISCORD_MESSAGE_LIMIT:
+                await ctx.send(report)
+            else:
+                # Too long for a message once the caches and nodes are listed, sent as a file instead.
+                await ctx.send(file=discord.File(BytesIO(report.encode()), "debug.txt"))
 
     @commands.command(name="award")
     async def award(self, ctx: commands.Context, member: discord.Member, amount: int):
@@ -296,17 +274,8 @@ class Config(commands.Cog):
         Bot owner command to award a user with a specified amount of money.
         """
         if int(ctx.author.id) == int(config.bot_owner_id):
-            async with self.bot.session as session:
-                player = await session.get(Cassino, int(member.id))
-                if not player:
-                    player = Cassino(id=ctx.author.id, balance=1000)
-                    session.add(player)
-                    await session.commit()
-                    await session.refresh(player)
-                player.balance += amount
-                await session.commit()
-                await session.refresh(player)
-            await ctx.send(f"🏆 {member.mention} has been awarded ${amount} for finding a bug! New balance: ${player.balance}")
+            player = await ledger.apply(member.id, balance=amount)
+            await ctx.send(f"🏆 {member.mention} has been awarded ${amount} for finding a bug! New balance: ${player['balance']}")
         else:
             await ctx.send("You must be the owner to use this command!")
 
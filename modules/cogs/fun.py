@@ -32,15 +32,26 @@ from sqlalchemy import select
 
 from modules.globals import config
 from modules.orm.database import Cassino
-from modules.views.fun import CassinoView
+from modules.views.fun import CassinoControl, CassinoView
 from modules.utils._config_utils import is_command_allowed
-from modules.player.slots import SlotMachine
+from modules.player.player import CassinoPlayer
+from modules.player.ledger import ledger
+from modules.player.jackpot import jackpot_pool
 
 
 class Fun(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        """
+        Registers the cassino controls, so clicks on cassinos without a live view are still handled.
+        """
+        self.bot.add_dynamic_items(CassinoControl)
+
+    async def cog_unload(self):
+        self.bot.remove_dynamic_items(CassinoControl)
+
     @commands.command(name="sisyphus")
     async def add_quote(self, ctx: commands.Context, *, quote=None):
         """
@@ -89,7 +100,8 @@ class Fun(commands.Cog):
         if not restricted:
             return
         
-        await ctx.send(view=CassinoView(member=ctx.author))
+        view = CassinoView(member=ctx.author)
+        view.bind(await ctx.send(view=view))
 
     @commands.command(name="jackpot")
     async def jackpot(self, ctx: commands.Context):
@@ -101,8 +113,7 @@ class Fun(commands.Cog):
         if not restricted:
             return
         
-        slot_machine = SlotMachine()
-        jackpot = await slot_machine.get_jackpot()
+        jackpot = await jackpot_pool.get()
         await ctx.send(f"The current jackpot is ${jackpot}\nYou can claim it by getting a {(config.emoji.cassino.diamond + ' ')*3} in the cassino slots game!\nGood luck!")
 
     @commands.command(name="money", aliases=["balance"])
@@ -115,13 +126,7 @@ class Fun(commands.Cog):
         if not restricted:
             return
         
-        async with self.bot.session as session:
-            player = await session.get(Cassino, int(ctx.author.id))
-            if not player:
-                player = Cassino(id=ctx.author.id, balance=1000)
-                session.add(player)
-                await session.commit()
-                await session.refresh(player)
+        player = (await CassinoPlayer.create(ctx.author)).db_player
         await ctx.send(f"You have ${player.balance}")
 
 
@@ -135,13 +140,9 @@ class Fun(commands.Cog):
         if not restricted:
             return
         
+        await ledger.get(ctx.author.id)  # creates the player's row if needed
         async with self.bot.session as session:
             player = await session.get(Cassino, int(ctx.author.id))
-            if not player:
-                player = Cassino(id=ctx.author.id, balance=1000)
-                session.add(player)
-                await session.commit()
-                await session.refresh(player)
             if player.last_daily and player.last_daily.date() == datetime.datetime.now(datetime.timezone.utc).date():
                 next_daily_time = player.last_daily + datetime.timedelta(days=1)
                 aware_last_daily = next_daily_time.replace(tzinfo=datetime.timezone.utc)
@@ -155,11 +156,10 @@ class Fun(commands.Cog):
                 
                 await ctx.send(f"You already claimed your daily for today! Come back in {time_message}.")
                 return
-            player.balance += config.fun.daily_amount
             player.last_daily = datetime.datetime.now(datetime.timezone.utc)
             await session.commit()
-            await session.refresh(player)
-        await ctx.send(f"You claimed your daily! You now have ${player.balance}")
+        values = await ledger.apply(ctx.author.id, balance=config.fun.daily_amount)
+        await ctx.send(f"You claimed your daily! You now have ${values['balance']}")
 
     @commands.command(name="top", aliases=["leaderboard"])
     async def leaderboard(self, ctx: commands.Context):
@@ -171,6 +171,7 @@ class Fun(commands.Cog):
         if not restricted:
             return
         
+        await ledger.flush()
         async with self.bot.session as session:
             players = await session.execute(select(Cassino).order_by(Cassino.balance.desc()).limit(10))
             players = players.scalars().all()
@@ -189,13 +190,7 @@ class Fun(commands.Cog):
         if not restricted:
             return
         
-        async with self.bot.session as session:
-            player = await session.get(Cassino, int(ctx.author.id))
-            if not player:
-                player = Cassino(id=ctx.author.id, balance=1000)
-                session.add(player)
-                await session.commit()
-                await session.refresh(player)
+        player = (await CassinoPlayer.create(ctx.author)).db_player
         embed = discord.Embed(title=f"{ctx.author.name}'s stats", color=discord.Color.green())
         embed.set_thumbnail(url=ctx.author.display_avatar.url)
         embed.add_field(name="Balance", value=f"${player.balance}")
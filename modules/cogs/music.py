@@ -10,7 +10,7 @@ Class Methods:
    - bot: The instance of the bot that the cog is a part of.
 
 2. stop(self, ctx: commands.Context)
-   Stops music playback and clears the queue.
+   Stops music playback, clears the queue and cancels playlists still being added.
    - ctx: The context of the command, which includes information about the command invocation.
 
 3. shuffle(self, ctx: commands.Context)
@@ -69,9 +69,16 @@ Additional Notes:
 - The Music cog integrates with the wavelink library for music playback and control.
 - It uses various commands to manage music in a voice channel, such as playing, pausing, skipping, and adjusting volume.
 - The cog also supports more advanced features like shuffling the queue, setting autoplay modes, and applying audio filters.
+- Searches made by 'play' go through the track search cache, so repeated queries do not reach Lavalink again.
+- Playlists start playing with their first track while the others are added in the background, reporting
+  their progress on a single message.
+- The next queued tracks are prefetched while a track plays, see modules/utils/_prefetch_utils.py.
 - The cog is designed to be added to a discord.ext.commands.Bot or discord.ext.commands.AutoShardedBot instance for use in a Discord bot application.
 """
+import asyncio
+import contextlib
 import random
+import time
 from typing import cast
 import discord
 import wavelink
@@ -81,6 +88,9 @@ from discord.ext import commands
 from modules.globals import config
 from modules.utils._text_utils import create_track_embed, milliseconds_to_mm_ss
 from modules.utils._config_utils import is_command_allowed
+from modules.utils._search_utils import track_search_cache
+from modules.utils._prefetch_utils import track_prefetcher
+from modules.utils._node_utils import node_balancer
 
 # TODO: Make player.queue write to a database to allow seamless bot restarts without losing current music queue
 
@@ -89,6 +99,58 @@ class Music(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def enqueue_playlist(
+        self,
+        player: wavelink.Player,
+        playlist: wavelink.Playlist,
+        status: discord.Message,
+        start: int,
+        previous: asyncio.Task | None = None,
+    ) -> None:
+        """
+        Adds the tracks of a playlist from `start` on to the queue in chunks, editing `status` with the progress.
+        - Waits for the playlist added before it, so playlists keep their order in the queue.
+        - Prefetches the upcoming tracks when a chunk lands within the prefetch depth.
+        - Cancelled by 'stop' and 'leave'.
+        """
+        total = len(playlist.tracks)
+        added = start
+        try:
+            if previous is not None:
+                await asyncio.wait({previous})
+            reported = time.monotonic()
+            for index in range(start, total, config.music.playlist_chunk_size):
+                queued = len(player.queue)
+                added += await player.queue.put_wait(playlist.tracks[index:index + config.music.playlist_chunk_size])
+                # The chunk reached the upcoming tracks, resolve them before the current one ends.
+                if player.playing and queued < track_prefetcher.depth:
+                    track_prefetcher.schedule(player)
+                if time.monotonic() - reported >= config.music.playlist_progress_interval:
+                    reported = time.monotonic()
+                    await self.report(status, f"Adding the playlist **`{playlist.name}`** to the queue... {added}/{total} songs")
+                # Lets other commands and events run between chunks.
+                await asyncio.sleep(0)
+            await self.report(status, f"Added the playlist **`{playlist.name}`** ({added} songs) to the queue.")
+            if not player.playing and player.queue:
+                await player.play(player.queue.get(), volume=30)
+        except asyncio.CancelledError:
+            await self.report(status, f"Stopped adding the playlist **`{playlist.name}`** after {added}/{total} songs.")
+            raise
+
+    @staticmethod
+    async def report(status: discord.Message, content: str) -> None:
+        with contextlib.suppress(discord.HTTPException):
+            await status.edit(content=content)
+
+    @staticmethod
+    def cancel_playlists(player: wavelink.Player) -> None:
+        """
+        Cancels the playlists still being added to the player's queue.
+        """
+        for task in getattr(player, "playlist_tasks", ()):
+            task.cancel()
+        player.playlist_tasks = []
+
     #playback commands
     @commands.hybrid_command(name="stop", aliases=["clear", "stopplaying"])
     async def stop(self, ctx: commands.Context):
@@ -105,6 +167,7 @@ class Music(commands.Cog):
             await ctx.message.add_reaction(f"{config.emoji.fail}")
             return
 
+        self.cancel_playlists(player)
         player.queue.clear()
         player.autoplay = wavelink.AutoPlayMode.disabled
         await player.seek(player.current.length)
@@ -149,7 +212,7 @@ class Music(commands.Cog):
 
         if not player:
             try:
-                player = await ctx.author.voice.channel.connect(cls=wavelink.Player)
+                player = await ctx.author.voice.channel.connect(cls=node_balancer.player)
             except AttributeError:
                 await ctx.send(
                     "Please join a voice channel first before using this command."
@@ -169,28 +232,7 @@ class Music(commands.Cog):
             )
             return
 
-        if query.startswith("http"):
-            tracks: wavelink.Search = await wavelink.Playable.search(query)
-        elif query.startswith("music:"):
-            tracks: wavelink.Search = await wavelink.Playable.search(
-                query.split(":", 1)[1], source="ytmsearch:"
-            )
-        elif query.startswith("spotify:"):
-            tracks: wavelink.Search = await wavelink.Playable.search(
-                query.split(":", 1)[1], source="spsearch:"
-            )
-        elif query.startswith("speak:") or query.startswith("tts:"):
-            tracks: wavelink.Search = await wavelink.Playable.search(
-                query.split(":", 1)[1], source="speak:"
-            )
-        elif query.startswith("ytsearch:") or query.startswith("yt:"):
-            tracks: wavelink.Search = await wavelink.Playable.search(
-                query.split(":", 1)[1], source="ytsearch:"
-            )
-        else:
-            tracks: wavelink.Search = await wavelink.Playable.search(
-                query, source="spsearch:"
-            )
+        tracks: wavelink.Search = await track_search_cache.search(query)
         if not tracks:
             await ctx.send(
                 f"{ctx.author.mention} - Could not find any tracks with that query. Please try again."
@@ -198,17 +240,31 @@ class Music(commands.Cog):
             return
 
         if isinstance(tracks, wavelink.Playlist):
-            added: int = await player.queue.put_wait(tracks)
-            await ctx.send(
-                f"Added the playlist **`{tracks.name}`** ({added} songs) to the queue."
+            pending = [task for task in getattr(player, "playlist_tasks", ()) if not task.done()]
+            previous = pending[-1] if pending else None
+            start = 0
+            if previous is None:
+                # Nothing is being added before it, so its first track can play right away.
+                start = 1
+                if player.playing:
+                    await player.queue.put_wait(tracks.tracks[0])
+                else:
+                    # Played directly, so an older queued track does not start in its place.
+                    await player.play(tracks.tracks[0], volume=30)
+            status = await ctx.send(
+                f"Adding the playlist **`{tracks.name}`** ({len(tracks.tracks)} songs) to the queue..."
             )
+            pending.append(asyncio.create_task(self.enqueue_playlist(player, tracks, status, start, previous)))
+            player.playlist_tasks = pending
         else:
             track: wavelink.Playable = tracks[0]
             await player.queue.put_wait(track)
             await ctx.send(f"Added **`{track}`** to the queue.")
 
-        if not player.playing:
+        if not player.playing and player.queue:
             await player.play(player.queue.get(), volume=30)
+        elif player.playing:
+            track_prefetcher.schedule(player)
 
     @commands.hybrid_command(name="skip", aliases=["fs", "forceskip"])
     async def skip(self, ctx: commands.Context) -> None:
@@ -267,6 +323,7 @@ class Music(commands.Cog):
             await ctx.message.add_reaction(f"{config.emoji.fail}")
             return
 
+        self.cancel_playlists(player)
         await player.disconnect()
         await ctx.message.add_reaction(f"{config.emoji.success}")
 
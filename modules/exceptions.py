@@ -8,3 +8,7 @@ class YTDLError(Exception):
 
 class WavelinkError(Exception):
     pass
+
+
+class HouseEdgeError(Exception):
+    pass
@@ -13,6 +13,19 @@ Each section represents a specific aspect of the bot's functionality and setting
    - font_size: Font size for text-based fun features (`int`).
    - font_path: File path to the font used for text-based fun features (`str`).
    - sisyphus_image_path: File path to the image of Sisyphus used in fun features (`str`).
+   - house_retain: Share of a losing slots bet kept by the house instead of feeding the jackpot (`float`).
+     At 0.1 the slots pay back 110.3% of every bet (87.2% in prizes, 23.1% through the jackpot).
+   - enforce_house_edge: Whether the bot refuses to boot when the slots house edge is negative, from
+     `ENFORCE_HOUSE_EDGE` (default "true"). When "false", the negative edge is only logged (`bool`).
+   - ledger_flush_interval: Seconds between two writes of the cassino balance ledger to the database (`int`).
+   - ledger_idle_ttl: Seconds an idle, flushed player is kept in the balance ledger (`int`).
+   - jackpot_flush_interval: Seconds between two writes of the slots jackpot to the database (`int`).
+   - jackpot_flush_spins: Number of jackpot contributions that triggers a write before the interval (`int`).
+   - blackjack_decks: Number of decks in a blackjack shoe (`int`).
+   - blackjack_penetration: Share of the blackjack shoe dealt before it is reshuffled (`float`).
+   - video_poker_hint_cache_size: Number of hands whose hold payouts are kept for the video poker hint (`int`).
+   - video_poker_hint_solves: Maximum number of video poker hints solved at the same time (`int`).
+   - cassino_live_views: Number of cassino views kept listening. Clicks on older cassinos rebuild their view (`int`).
 
 3. Database Configuration (`config.database`)
    - db_username: Database username, retrieved from environment variables (`str`).
@@ -27,12 +40,33 @@ Each section represents a specific aspect of the bot's functionality and setting
    - host: Host address for Lavalink server, retrieved from environment variables (`str`).
    - port: Port number for Lavalink server, retrieved from environment variables (`str`).
    - password: Password for Lavalink server, retrieved from environment variables (`str`).
-
-5. Emoji Configuration (`config.emoji`)
+   - nodes: URIs of the Lavalink nodes, comma separated in `LAVALINK_NODES`, sharing the password above.
+     Defaults to the host and port above (`list` of `str`).
+   - stats_interval: Seconds between two fetches of the stats of every node (`int`).
+   - degraded_cpu_load: Lavalink CPU load, between 0 and 1, from which the players of a node are moved away (`float`).
+   - degraded_frame_deficit: Share of missing audio frames from which the players of a node are moved away (`float`).
+
+5. Cache Configuration (`config.cache`)
+   - guild_prefix_max_size: Maximum number of guild prefixes kept in memory (`int`).
+   - track_search_max_size: Maximum number of music searches whose results are kept in memory (`int`).
+   - track_search_ttl: Seconds the results of a music search are reused before searching again (`int`).
+   - track_store_max_entries: Maximum number of music searches kept in the `track_cache` table (`int`).
+   - track_store_ttl: Seconds a search stored in the `track_cache` table is reused before searching again (`int`).
+   - track_store_flush_interval: Seconds between two writes of new and played searches to the `track_cache` table (`int`).
+   - track_store_eviction_interval: Seconds between two evictions of the least recently played stored searches (`int`).
+
+6. Emoji Configuration (`config.emoji`)
    - success: Emoji used to indicate success (`str`).
    - fail: Emoji used to indicate failure (`str`).
    - queue_decorators: List of emojis used as decorators for queues (`list` of `str`).
    - av_emoji: Emojis used for player buttons, each with a specific function (`Section`).
+
+7. Music Configuration (`config.music`)
+   - playlist_chunk_size: Number of playlist tracks added to the queue at a time (`int`).
+   - playlist_progress_interval: Minimum seconds between two edits of a playlist's progress message (`float`).
+   - prefetch_depth: Number of queued tracks resolved while the current one plays (`int`).
+   - prefetch_cache_size: Maximum number of prefetched YouTube mirrors of Spotify tracks kept in memory (`int`).
+   - transition_samples: Number of recent track transitions the latency metrics are computed on (`int`).
 """
 import os
 from modules.utils._constants_utils import Struct as Section
@@ -51,10 +85,20 @@ config.fun.sisyphus_image_path = "assets/pictures/sisyphus.jpg"
 config.fun.roulette_table = "assets/pictures/roulette_table.png"
 config.fun.cassino_adjustment_factor = 1.2
 config.fun.house_retain = 0.1
+config.fun.enforce_house_edge = os.getenv("ENFORCE_HOUSE_EDGE", "true").lower() != "false"
 config.fun.cassino_dashboard = "/fc8f40eaa7e24eecbb57e4efd7175e33?orgId=1"
 config.fun.grafana_base_url = "https://grafana.murakams.com/public-dashboards"
 config.fun.poker_table = "assets/pictures/poker_table.png"
 config.fun.daily_amount = 5000
+config.fun.ledger_flush_interval = 5
+config.fun.ledger_idle_ttl = 600
+config.fun.jackpot_flush_interval = 5
+config.fun.jackpot_flush_spins = 50
+config.fun.blackjack_decks = 8
+config.fun.blackjack_penetration = 0.75
+config.fun.video_poker_hint_cache_size = 4096
+config.fun.video_poker_hint_solves = 2
+config.fun.cassino_live_views = 1000
 
 config.database = Section("Database config section")
 config.database.db_username = os.getenv("DB_USERNAME")
@@ -69,6 +113,28 @@ config.lavalink = Section("Lavalink config section")
 config.lavalink.host = os.getenv("LAVALINK_SERVER_HOST")
 config.lavalink.port = os.getenv("LAVALINK_SERVER_PORT")
 config.lavalink.password = os.getenv("LAVALINK_SERVER_PASSWORD")
+config.lavalink.nodes = [
+    uri.strip() for uri in os.getenv("LAVALINK_NODES", "").split(",") if uri.strip()
+] or [f"{config.lavalink.host}:{config.lavalink.port}"]
+config.lavalink.stats_interval = 30
+config.lavalink.degraded_cpu_load = 0.9
+config.lavalink.degraded_frame_deficit = 0.05
+
+config.music = Section("Music config section")
+config.music.playlist_chunk_size = 100
+config.music.playlist_progress_interval = 2
+config.music.prefetch_depth = 3
+config.music.prefetch_cache_size = 2000
+config.music.transition_samples = 500
+
+config.cache = Section("In-memory cache config section")
+config.cache.guild_prefix_max_size = 10000
+config.cache.track_search_max_size = 1000
+config.cache.track_search_ttl = 3600
+config.cache.track_store_max_entries = 50000
+config.cache.track_store_ttl = 30 * 24 * 3600
+config.cache.track_store_flush_interval = 30
+config.cache.track_store_eviction_interval = 600
 
 config.emoji = Section("Emoji config section, holds constants mostly")
 config.emoji.success = "\u2705"
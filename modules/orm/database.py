@@ -125,4 +125,16 @@ class CommandRestriction(Base):
     command_id = mapped_column(BIGINT, ForeignKey('commands.command_id'), nullable=False)
     restriction_type = mapped_column(String(50), nullable=False)
     restriction_target = mapped_column(BIGINT, nullable=False)
-    __table_args__ = (UniqueConstraint('command_id', 'restriction_type', 'restriction_target'),)
\ No newline at end of file
+    __table_args__ = (UniqueConstraint('command_id', 'restriction_type', 'restriction_target'),)
+
+
+class TrackCache(Base):
+    __tablename__ = 'track_cache'
+    key_hash: Mapped[str] = mapped_column(String(40), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(10), nullable=False)
+    payload = mapped_column(JSON, nullable=False)
+    resolved_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False)
+    last_played: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"TrackCache(key_hash={self.key_hash!r}, kind={self.kind!r}, last_played={self.last_played!r})"
@@ -1,77 +1,119 @@
-import random
-
 from modules.globals import config
+from modules.player.cards import BLACKJACK_VALUES, CARD_LABELS, SUIT_LABELS, Shoe, is_ace
+
+
+class BlackjackHand:
+    __slots__ = ("cards", "hard_total", "aces")
+
+    def __init__(self, cards=()) -> None:
+        """
+        Constructor for the BlackjackHand class.
+        - Keeps a running hard total (aces counting 1) and ace count, so the value is known without rescanning the cards.
+        Parameters:
+            - cards: Cards the hand starts with.
+        """
+        self.cards: list[int] = []
+        self.hard_total = 0
+        self.aces = 0
+        for card in cards:
+            self.add(card)
+
+    def add(self, card: int) -> None:
+        self.cards.append(card)
+        if is_ace(card):
+            self.aces += 1
+            self.hard_total += 1
+        else:
+            self.hard_total += BLACKJACK_VALUES[card]
+
+    @property
+    def soft(self) -> bool:
+        """
+        Whether an ace is counted as 11 in the hand value.
+        """
+        return self.aces > 0 and self.hard_total + 10 <= 21
+
+    @property
+    def value(self) -> int:
+        return self.hard_total + 10 if self.soft else self.hard_total
+
+    @property
+    def bust(self) -> bool:
+        return self.hard_total > 21
+
+    def __getitem__(self, index):
+        return self.cards[index]
+
+    def __iter__(self):
+        return iter(self.cards)
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def __repr__(self) -> str:
+        return f"BlackjackHand({' '.join(CARD_LABELS[card] for card in self.cards)}, value={self.value}, soft={self.soft})"
 
 
 class BlackjackDealer:
-    def __init__(self):
-        self.deck = self.create_deck()
-        self.hand = []
+    def __init__(self, shoe: Shoe | None = None):
+        """
+        Constructor for the BlackjackDealer class.
+        Parameters:
+            - shoe (Shoe | None): Shoe kept across rounds. A new one is created if not given.
+        """
+        self.shoe = shoe or self.create_shoe()
+        self.shoe.start_round()
+        self.hand = BlackjackHand()
 
     @staticmethod
-    def create_deck():
-        suits = [config.emoji.cassino.blackjack.hearts, config.emoji.cassino.blackjack.diamonds, config.emoji.cassino.blackjack.clubs, config.emoji.cassino.blackjack.spades]
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-        return [{'suit': suit, 'rank': rank} for suit in suits for rank in ranks]*8
+    def create_shoe() -> Shoe:
+        return Shoe(decks=config.fun.blackjack_decks, penetration=config.fun.blackjack_penetration)
 
     @staticmethod
-    def display(hand: list, dealer: bool, force_display: bool = False):
+    def display(hand: BlackjackHand, dealer: bool, force_display: bool = False):
         if dealer and len(hand) == 2 and not force_display:
-            return f"[{hand[0]['rank']}{hand[0]['suit']}] [?{hand[0]['suit']}]"
-        return ' '.join([f"[{card['rank']}{card['suit']}]" for card in hand])
+            return f"[{CARD_LABELS[hand[0]]}] [?{SUIT_LABELS[hand[0]]}]"
+        return ' '.join([f"[{CARD_LABELS[card]}]" for card in hand])
 
     def shuffle_deck(self):
-        random.shuffle(self.deck)
+        self.shoe.shuffle()
 
     def deal_card(self):
-        if not self.deck:
-            self.deck = self.create_deck()
-            self.shuffle_deck()
-        return self.deck.pop(random.randrange(len(self.deck)))
+        return self.shoe.deal()
 
     def add_to_hand(self, card):
-        self.hand.append(card)
+        self.hand.add(card)
 
     def show_hand(self):
         return self.hand
 
     def reset_hand(self):
-        self.hand = []
+        self.hand = BlackjackHand()
+
+    def new_round(self):
+        """
+        Starts a round on the same shoe, reshuffling it past the cut card.
+        """
+        self.shoe.start_round()
+        self.reset_hand()
 
     @property
     def hand_value(self):
-        value = 0
-        ace_count = 0
-
-        for card in self.hand:
-            rank = card['rank']
-            if rank in ['J', 'Q', 'K']:
-                value += 10
-            elif rank == 'A':
-                ace_count += 1
-                value += 11
-            else:
-                value += int(rank)
-
-        while value > 21 and ace_count:
-            value -= 10
-            ace_count -= 1
-
-        return value
+        return self.hand.value
 
     @property
     def bust(self) -> bool:
         """
         Property that returns if the player has busted.
         """
-        return self.hand_value > 21
+        return self.hand.bust
 
     def play(self) -> list:
         # The dealer must hit until the cards total 17 or more points.
         plays = ""
         while self.hand_value < 17:
             card = self.deal_card()
-            plays += f"Dealer got {card['rank']}{card['suit']}\n"
+            plays += f"Dealer got {CARD_LABELS[card]}\n"
             self.add_to_hand(card)
         return plays
     
@@ -80,7 +122,7 @@ class BlackjackDealer:
         self.add_to_hand(self.deal_card())
 
     def reset_deck(self) -> None:
-        self.deck = self.create_deck()
+        self.shoe.shuffle()
 
     def hit(self, player) -> None:
         player.add_to_hand(self.deal_card())       
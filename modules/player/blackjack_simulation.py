@@ -0,0 +1,182 @@
+"""
+Module Documentation: Blackjack Monte Carlo Simulation
+
+Offline tool to measure the house edge of the cassino blackjack before rule changes ship.
+It replays the rules of modules/buttons/blackjack/actions.py with the same Shoe and BlackjackHand:
+- The player and the dealer get two cards each, there is no blackjack check nor bonus.
+- The player may hit, stand or double (one more card, twice the bet) at any point of the hand.
+- A busted player loses at once. Otherwise the dealer draws while under 17, standing on soft 17.
+- A win pays even money, a tie returns the bet. There are no splits.
+
+1. basic_strategy(hand: BlackjackHand, dealer_up: int) -> str
+   Basic strategy for these rules: HIT, STAND or DOUBLE, from the hard and soft tables below.
+
+2. play_round(shoe: Shoe) -> int
+   Plays one round with basic strategy, returning the net result in bets (-2 to 2).
+
+3. simulate_blackjack(hands: int, processes=None, seed=None, decks=..., penetration=..., chunk_size=200_000)
+   Plays `hands` rounds across a multiprocessing pool and returns a dictionary with the house edge,
+   its 95% confidence interval, the standard deviation and the win/push/loss/double rates.
+
+Run from the repository root:
+    python -m modules.player.blackjack_simulation --hands 2000000
+"""
+import argparse
+import math
+import multiprocessing
+import random
+import time
+
+from modules.globals import config
+from modules.player.blackjack import BlackjackHand
+from modules.player.cards import BLACKJACK_VALUES, Shoe
+
+HIT, STAND, DOUBLE = "H", "S", "D"
+
+# Columns are the dealer up card, from 2 to 11 (ace).
+HARD_STRATEGY = {
+    **{total: "HHHHHHHHHH" for total in range(4, 9)},
+    9: "HDDDDHHHHH",
+    10: "DDDDDDDDHH",
+    11: "DDDDDDDDDH",
+    12: "HHSSSHHHHH",
+    **{total: "SSSSSHHHHH" for total in range(13, 17)},
+    **{total: "SSSSSSSSSS" for total in range(17, 22)},
+}
+SOFT_STRATEGY = {
+    12: "HHHHHHHHHH",
+    13: "HHHDDHHHHH",
+    14: "HHHDDHHHHH",
+    15: "HHDDDHHHHH",
+    16: "HHDDDHHHHH",
+    17: "HDDDDHHHHH",
+    18: "SDDDDSSHHH",
+    **{total: "SSSSSSSSSS" for total in range(19, 22)},
+}
+
+
+def basic_strategy(hand: BlackjackHand, dealer_up: int) -> str:
+    table = SOFT_STRATEGY if hand.soft else HARD_STRATEGY
+    return table[hand.value][dealer_up - 2]
+
+
+def play_round(shoe: Shoe) -> int:
+    """
+    Plays one round of a unit bet with basic strategy and returns the player's net result.
+    """
+    shoe.start_round()
+    player = BlackjackHand((shoe.deal(), shoe.deal()))
+    dealer = BlackjackHand((shoe.deal(), shoe.deal()))
+    dealer_up = BLACKJACK_VALUES[dealer[0]]
+
+    bet = 1
+    while True:
+        action = basic_strategy(player, dealer_up)
+        if action == STAND:
+            break
+        player.add(shoe.deal())
+        if action == DOUBLE:
+            bet = 2
+            break
+        if player.bust:
+            return -bet
+
+    # The dealer plays out the hand even after a busted double, as the game does.
+    while dealer.value < 17:
+        dealer.add(shoe.deal())
+
+    if player.bust:
+        return -bet
+    if dealer.bust or player.value > dealer.value:
+        return bet
+    if player.value < dealer.value:
+        return -bet
+    return 0
+
+
+def _simulate_chunk(arguments: tuple) -> tuple:
+    """
+    Plays a chunk of rounds on its own shoe. Returns the sums needed to merge chunks.
+    """
+    hands, seed, decks, penetration = arguments
+    shoe = Shoe(decks=decks, penetration=penetration, rng=random.Random(seed))
+    total = squares = wins = pushes = doubles = 0
+    for _ in range(hands):
+        result = play_round(shoe)
+        total += result
+        squares += result * result
+        if result > 0:
+            wins += 1
+        elif result == 0:
+            pushes += 1
+        if abs(result) == 2:
+            doubles += 1
+    return hands, total, squares, wins, pushes, doubles
+
+
+def simulate_blackjack(
+    hands: int,
+    processes: int | None = None,
+    seed=None,
+    decks: int = config.fun.blackjack_decks,
+    penetration: float = config.fun.blackjack_penetration,
+    chunk_size: int = 200_000,
+) -> dict:
+    """
+    Plays `hands` rounds with basic strategy across a process pool.
+    Parameters:
+        - hands (int): Number of rounds to play.
+        - processes (int | None): Worker processes, one per core by default.
+        - seed: Seed deriving the seed of every chunk, for reproducible runs.
+        - decks (int) / penetration (float): Shoe rules, the game's ones by default.
+        - chunk_size (int): Rounds played by a worker per task, on a shoe of its own.
+    """
+    seeds = random.Random(seed)
+    chunks = [
+        (min(chunk_size, hands - start), seeds.getrandbits(64), decks, penetration)
+        for start in range(0, hands, chunk_size)
+    ]
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.map(_simulate_chunk, chunks)
+
+    played, total, squares, wins, pushes, doubles = (sum(column) for column in zip(*results))
+    mean = total / played
+    variance = squares / played - mean**2
+    error = math.sqrt(variance / played)
+    return {
+        "hands": played,
+        "house_edge": -mean,
+        "confidence_interval": (-mean - 1.96 * error, -mean + 1.96 * error),
+        "std": math.sqrt(variance),
+        "win_rate": wins / played,
+        "push_rate": pushes / played,
+        "loss_rate": (played - wins - pushes) / played,
+        "double_rate": doubles / played,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo simulation of the cassino blackjack.")
+    parser.add_argument("--hands", type=int, default=2_000_000)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--decks", type=int, default=config.fun.blackjack_decks)
+    parser.add_argument("--penetration", type=float, default=config.fun.blackjack_penetration)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = simulate_blackjack(
+        args.hands, processes=args.processes, seed=args.seed, decks=args.decks, penetration=args.penetration
+    )
+    low, high = result["confidence_interval"]
+    print(f"Hands: {result['hands']} in {time.perf_counter() - start:.1f}s")
+    print(f"House edge: {result['house_edge']:.4%} (95% CI {low:.4%} to {high:.4%})")
+    print(f"Std per hand: {result['std']:.3f}")
+    print(
+        f"Win {result['win_rate']:.2%} | Push {result['push_rate']:.2%} | "
+        f"Loss {result['loss_rate']:.2%} | Double {result['double_rate']:.2%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Module Documentation: Playing Cards
+
+Cards are plain ints from 0 to 51, `rank * 4 + suit`, so decks are lists of small ints and every
+property of a card is a tuple lookup instead of string parsing.
+
+1. Lookup tables, indexed by card
+   - RANK_LABELS / SUIT_LABELS / CARD_LABELS: Rank ('2'...'A'), suit emoji and `rank + suit` labels.
+   - BLACKJACK_VALUES: Blackjack value of the card, aces counting 11.
+   - POKER_RANKS: Poker rank of the card, from 2 to 14 (ace high).
+
+2. Helpers
+   - make_card(rank_index, suit_index): Builds a card from a rank index (0 = '2', 12 = 'A') and a suit index.
+   - is_ace(card): Whether the card is an ace.
+   - new_deck(decks=1): Returns a fresh, ordered list with `decks` decks.
+
+3. Shoe(decks: int = 1, penetration: float = 0.75, rng: random.Random | None = None)
+   One or more decks shuffled once (Fisher-Yates, `random.shuffle`) and dealt by advancing a cursor.
+   - deal(): Returns the next card in O(1), reshuffling only if the shoe runs out mid-round.
+   - start_round(): Reshuffles once the cut card (`penetration` of the shoe) has been reached.
+   - shuffle(): Reshuffles the whole shoe and moves the cursor back to the top.
+   - remaining: Number of cards left before the shoe runs out.
+"""
+import random
+
+from modules.globals import config
+
+RANKS = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
+SUITS = (
+    config.emoji.cassino.blackjack.hearts,
+    config.emoji.cassino.blackjack.diamonds,
+    config.emoji.cassino.blackjack.clubs,
+    config.emoji.cassino.blackjack.spades,
+)
+ACE = len(RANKS) - 1
+DECK = tuple(range(len(RANKS) * len(SUITS)))
+
+RANK_LABELS = tuple(RANKS[card // 4] for card in DECK)
+SUIT_LABELS = tuple(SUITS[card % 4] for card in DECK)
+CARD_LABELS = tuple(f"{rank}{suit}" for rank, suit in zip(RANK_LABELS, SUIT_LABELS))
+BLACKJACK_VALUES = tuple(11 if card // 4 == ACE else min(card // 4 + 2, 10) for card in DECK)
+POKER_RANKS = tuple(card // 4 + 2 for card in DECK)
+
+
+def make_card(rank_index: int, suit_index: int) -> int:
+    return rank_index * 4 + suit_index
+
+
+def is_ace(card: int) -> bool:
+    return card // 4 == ACE
+
+
+def new_deck(decks: int = 1) -> list[int]:
+    return list(DECK) * decks
+
+
+class Shoe:
+    __slots__ = ("cards", "cursor", "cut", "rng")
+
+    def __init__(self, decks: int = 1, penetration: float = 0.75, rng: random.Random | None = None) -> None:
+        """
+        Constructor for the Shoe class.
+        Parameters:
+            - decks (int): Number of decks in the shoe.
+            - penetration (float): Share of the shoe dealt before reshuffling at the start of a round.
+              0 reshuffles before every round.
+            - rng (random.Random | None): Random generator used to shuffle, the module one by default.
+        """
+        self.cards = new_deck(decks)
+        self.cut = int(len(self.cards) * penetration)
+        self.rng = rng or random
+        self.cursor = 0
+        self.shuffle()
+
+    def shuffle(self) -> None:
+        self.rng.shuffle(self.cards)
+        self.cursor = 0
+
+    def start_round(self) -> None:
+        """
+        Reshuffles the shoe if the cut card has been reached. A shoe nothing was dealt from is left as is.
+        """
+        if self.cursor and self.cursor >= self.cut:
+            self.shuffle()
+
+    def deal(self) -> int:
+        if self.cursor >= len(self.cards):
+            self.shuffle()
+        card = self.cards[self.cursor]
+        self.cursor += 1
+        return card
+
+    @property
+    def remaining(self) -> int:
+        return len(self.cards) - self.cursor
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def __repr__(self) -> str:
+        return f"Shoe(cards={len(self.cards)}, remaining={self.remaining}, cut={self.cut})"
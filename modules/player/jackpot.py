@@ -0,0 +1,158 @@
+"""
+Module Documentation: Slots Jackpot Accumulator
+
+This module keeps the slots jackpot in memory and writes it behind to the `persistent_values` table,
+so losing spins no longer serialize on the jackpot row.
+
+1. JackpotAccumulator(flush_interval: float, flush_spins: int)
+   Process-wide jackpot counter.
+   - get(): Returns the current jackpot, loading (or creating) its row on first use.
+   - add(amount): Adds a losing spin's contribution in memory. Flushes once `flush_spins` contributions are pending.
+   - claim(): Takes the whole jackpot for a triple diamond win and returns it. The claimed amount is
+     subtracted on the next flush, so contributions written by other processes are never lost.
+   - flush(): Persists the pending delta with an atomic `UPDATE persistent_values SET value = value + :delta`
+     and reloads the stored value.
+   - start()/stop(): Starts the background flush task, and stops it after a final flush.
+
+The module exposes the `jackpot_pool` instance used by the whole bot.
+"""
+import asyncio
+import logging
+
+from sqlalchemy import select, update
+
+from modules.globals import config
+from modules.orm.database import PersistentValues
+from modules.utils._database_utils import get_session
+
+JACKPOT_KEY = "jackpot"
+
+
+class JackpotAccumulator:
+    def __init__(self, flush_interval: float, flush_spins: int) -> None:
+        """
+        Constructor for the JackpotAccumulator class.
+        Parameters:
+            - flush_interval (float): Seconds between two background flushes.
+            - flush_spins (int): Number of pending contributions that triggers a flush before the interval.
+        """
+        self.flush_interval = flush_interval
+        self.flush_spins = flush_spins
+        self._stored = 0
+        self._pending = 0
+        self._pending_spins = 0
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def value(self) -> int:
+        return self._stored + self._pending
+
+    async def _ensure_loaded(self) -> None:
+        """
+        Loads the stored jackpot, creating its row if needed, the first time the jackpot is used.
+        """
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            async with get_session() as session:
+                jackpot = await session.get(PersistentValues, JACKPOT_KEY)
+                if not jackpot:
+                    jackpot = PersistentValues(name=JACKPOT_KEY, value=0)
+                    session.add(jackpot)
+                    await session.commit()
+                    await session.refresh(jackpot)
+                self._stored = jackpot.value
+            self._loaded = True
+
+    async def get(self) -> int:
+        """
+        Returns the current jackpot, including contributions not yet persisted.
+        """
+        await self._ensure_loaded()
+        return self.value
+
+    async def add(self, amount: int) -> None:
+        """
+        Adds a contribution to the jackpot in memory.
+        - Flushes right away once `flush_spins` contributions are pending.
+        """
+        await self._ensure_loaded()
+        self._pending += int(amount)
+        self._pending_spins += 1
+        if self._pending_spins >= self.flush_spins:
+            await self.flush()
+
+    async def claim(self) -> int:
+        """
+        Empties the jackpot and returns the claimed amount.
+        - Reading and emptying happen without awaiting in between, so two winners cannot claim the same jackpot.
+        """
+        await self._ensure_loaded()
+        amount = self.value
+        self._pending -= amount
+        self._pending_spins += 1
+        return amount
+
+    async def flush(self) -> None:
+        """
+        Persists the pending delta with a single atomic increment and reloads the stored jackpot.
+        A failed delta is kept for the next flush.
+        """
+        async with self._flush_lock:
+            if not self._loaded or not self._pending_spins:
+                return
+            delta, self._pending, self._pending_spins = self._pending, 0, 0
+            # Counted as stored while in flight, so readers keep seeing the same jackpot.
+            self._stored += delta
+            try:
+                async with get_session() as session:
+                    await session.execute(
+                        update(PersistentValues)
+                        .where(PersistentValues.name == JACKPOT_KEY)
+                        .values(value=PersistentValues.value + delta)
+                    )
+                    await session.commit()
+                    stored = await session.scalar(
+                        select(PersistentValues.value).where(PersistentValues.name == JACKPOT_KEY)
+                    )
+                self._stored = stored
+            except Exception:
+                logging.exception("Failed to flush the jackpot, retrying later")
+                self._stored -= delta
+                self._pending += delta
+                self._pending_spins += 1
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        """
+        Starts the background flush task.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stops the background flush task and flushes whatever is still pending.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    def __repr__(self) -> str:
+        return f"JackpotAccumulator(value={self.value}, pending={self._pending})"
+
+
+jackpot_pool = JackpotAccumulator(
+    flush_interval=config.fun.jackpot_flush_interval,
+    flush_spins=config.fun.jackpot_flush_spins,
+)
@@ -0,0 +1,268 @@
+"""
+Module Documentation: Cassino Balance Ledger
+
+This module keeps the cassino balances and stats of active players in memory and writes them
+behind to the `cassino` table, so casino clicks do not wait on MySQL.
+
+1. LedgerEntry
+   In-memory state of one player.
+   - values: Current balance and stat counters, as seen by the games.
+   - pending: Deltas applied since the last flush.
+   - lock: asyncio.Lock serializing mutations of this player.
+
+2. BalanceLedger(flush_interval: float, idle_ttl: float)
+   Process-wide write-behind ledger.
+   - get(member_id): Returns the current values of a player, loading (or creating) its row on first use.
+   - apply(member_id, **deltas): Applies balance/stat deltas in memory under the player's lock.
+   - wager(member_id, bet, prize, **stats): Checks the balance covers `bet` and applies the bet, prize and
+     stat changes as one step under the player's lock. Returns None if the balance is too low.
+   - flush(): Writes the coalesced deltas with `balance_mutation` statements, reconciling the players
+     whose stored balance no longer covers their debit.
+   - start()/stop(): Starts the background flush task, and stops it after a final flush.
+
+3. balance_mutation(member_id: int, deltas: dict)
+   Builds the single conditional statement persisting a player's deltas:
+   `UPDATE cassino SET balance = balance + :delta, ... WHERE id = :id AND balance >= :debit`.
+
+The module exposes the `ledger` instance used by the whole bot.
+"""
+import asyncio
+import logging
+import time
+
+from sqlalchemy import update
+
+from modules.globals import config
+from modules.orm.database import Cassino
+from modules.utils._database_utils import get_session
+
+LEDGER_FIELDS = (
+    "balance",
+    "slot_wins",
+    "blackjack_wins",
+    "roulette_wins",
+    "video_poker_wins",
+    "dig_trash_wins",
+    "money_won",
+    "money_lost",
+)
+
+
+def balance_mutation(member_id: int, deltas: dict):
+    """
+    Builds the statement applying `deltas` to a player's row in one round trip.
+    A net debit is only applied if the stored balance covers it, so the check and the debit
+    are atomic and concurrent writers can never overdraw a balance or lose an update.
+    """
+    debit = max(0, -deltas.get("balance", 0))
+    return (
+        update(Cassino)
+        .where(Cassino.id == member_id, Cassino.balance >= debit)
+        .values({getattr(Cassino, field): getattr(Cassino, field) + delta for field, delta in deltas.items()})
+    )
+
+
+class LedgerEntry:
+    __slots__ = ("values", "pending", "lock", "last_access")
+
+    def __init__(self, values: dict) -> None:
+        self.values: dict[str, int] = values
+        self.pending: dict[str, int] = {}
+        self.lock = asyncio.Lock()
+        self.last_access = time.monotonic()
+
+
+class BalanceLedger:
+    def __init__(self, flush_interval: float, idle_ttl: float) -> None:
+        """
+        Constructor for the BalanceLedger class.
+        Parameters:
+            - flush_interval (float): Seconds between two background flushes.
+            - idle_ttl (float): Seconds after which a fully flushed, unused entry is dropped from memory.
+        """
+        self.flush_interval = flush_interval
+        self.idle_ttl = idle_ttl
+        self._entries: dict[int, LedgerEntry] = {}
+        self._loading: dict[int, asyncio.Lock] = {}
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    async def _entry(self, member_id: int) -> LedgerEntry:
+        """
+        Returns the entry of a player, loading its row (or creating it with the starting balance) on first use.
+        """
+        entry = self._entries.get(member_id)
+        if entry is None:
+            loading = self._loading.setdefault(member_id, asyncio.Lock())
+            async with loading:
+                entry = self._entries.get(member_id)
+                if entry is None:
+                    async with get_session() as session:
+                        player = await session.get(Cassino, member_id)
+                        if not player:
+                            player = Cassino(id=member_id, balance=1000)
+                            session.add(player)
+                            await session.commit()
+                            await session.refresh(player)
+                    entry = LedgerEntry({field: getattr(player, field) for field in LEDGER_FIELDS})
+                    self._entries[member_id] = entry
+            self._loading.pop(member_id, None)
+        entry.last_access = time.monotonic()
+        return entry
+
+    async def get(self, member_id: int) -> dict:
+        """
+        Returns a copy of the current balance and stats of a player.
+        """
+        entry = await self._entry(int(member_id))
+        return dict(entry.values)
+
+    async def apply(self, member_id: int, **deltas: int) -> dict:
+        """
+        Applies balance and stat deltas to a player in memory, to be persisted by the next flush.
+        Returns a copy of the player's updated values.
+        """
+        entry = await self._entry(int(member_id))
+        async with entry.lock:
+            for field, delta in deltas.items():
+                if not delta:
+                    continue
+                entry.values[field] += delta
+                entry.pending[field] = entry.pending.get(field, 0) + delta
+            return dict(entry.values)
+
+    async def wager(self, member_id: int, bet: int = 0, prize: int = 0, **stats: int) -> dict | None:
+        """
+        Debits `bet` and credits `prize` if the player's balance covers the bet, applying the stat
+        changes with it. The check and the mutation happen under the player's lock without awaiting
+        in between, so two views of the same player cannot interleave.
+        Returns a copy of the player's updated values, or None if the balance is too low.
+        """
+        entry = await self._entry(int(member_id))
+        async with entry.lock:
+            if entry.values["balance"] < bet:
+                return None
+            for field, delta in (("balance", prize - bet), *stats.items()):
+                if not delta:
+                    continue
+                entry.values[field] += delta
+                entry.pending[field] = entry.pending.get(field, 0) + delta
+            return dict(entry.values)
+
+    async def flush(self) -> None:
+        """
+        Persists the pending deltas of every player in one transaction, each player as a single
+        `balance_mutation` statement. Failed deltas are kept for the next flush. A player whose stored
+        balance no longer covers its debit was changed outside the ledger, so its entry is reconciled
+        with the stored row.
+        """
+        async with self._flush_lock:
+            batch = {}
+            for member_id, entry in self._entries.items():
+                if entry.pending:
+                    batch[member_id], entry.pending = entry.pending, {}
+            if not batch:
+                return
+            rejected = []
+            try:
+                async with get_session() as session:
+                    for member_id, deltas in batch.items():
+                        result = await session.execute(balance_mutation(member_id, deltas))
+                        if not result.rowcount:
+                            rejected.append(member_id)
+                    await session.commit()
+            except Exception:
+                logging.exception("Failed to flush %s cassino ledger entries, retrying later", len(batch))
+                for member_id, deltas in batch.items():
+                    self._restore(self._entries[member_id], deltas)
+                return
+            for member_id in rejected:
+                logging.warning("Cassino balance of %s changed outside the ledger, reconciling it", member_id)
+                await self._reconcile(member_id, batch[member_id])
+
+    @staticmethod
+    def _restore(entry: LedgerEntry, deltas: dict) -> None:
+        """
+        Puts deltas that were not persisted back in front of the entry's pending deltas.
+        """
+        for field, delta in deltas.items():
+            entry.pending[field] = entry.pending.get(field, 0) + delta
+
+    async def _reconcile(self, member_id: int, rejected: dict) -> None:
+        """
+        Rebuilds the values of a player from its stored row, then re-applies the rejected deltas and the
+        deltas added while the flush was running, to be persisted by the next flush.
+        Stat deltas are always re-applied. A balance delta the stored balance no longer covers is logged and dropped.
+        The entry itself is kept, so games holding it keep seeing the player's current values.
+        Parameters:
+            - member_id (int): The player whose `balance_mutation` was rejected.
+            - rejected (dict): The deltas of the rejected statement.
+        """
+        entry = self._entries[member_id]
+        async with entry.lock:
+            try:
+                async with get_session() as session:
+                    player = await session.get(Cassino, member_id)
+            except Exception:
+                logging.exception("Failed to reload the cassino balance of %s, retrying later", member_id)
+                self._restore(entry, rejected)
+                return
+            if player is None:
+                logging.warning("Cassino row of %s was deleted, dropping its deltas %s", member_id, rejected)
+                self._entries.pop(member_id, None)
+                return
+            values = {field: getattr(player, field) for field in LEDGER_FIELDS}
+            pending = {}
+            for deltas in (rejected, entry.pending):
+                for field, delta in deltas.items():
+                    if field == "balance" and values["balance"] + delta < 0:
+                        logging.warning(
+                            "Dropping a balance change of %s for %s, not covered by its stored balance of %s",
+                            delta, member_id, values["balance"],
+                        )
+                        continue
+                    values[field] += delta
+                    pending[field] = pending.get(field, 0) + delta
+            entry.values = values
+            entry.pending = {field: delta for field, delta in pending.items() if delta}
+
+    def evict_idle(self) -> None:
+        """
+        Drops fully flushed entries that have not been used for `idle_ttl` seconds.
+        """
+        deadline = time.monotonic() - self.idle_ttl
+        for member_id, entry in list(self._entries.items()):
+            if not entry.pending and not entry.lock.locked() and entry.last_access < deadline:
+                del self._entries[member_id]
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+            self.evict_idle()
+
+    def start(self) -> None:
+        """
+        Starts the background flush task.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stops the background flush task and flushes whatever is still pending.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    def __repr__(self) -> str:
+        pending = sum(1 for entry in self._entries.values() if entry.pending)
+        return f"BalanceLedger(entries={len(self._entries)}, pending={pending})"
+
+
+ledger = BalanceLedger(
+    flush_interval=config.fun.ledger_flush_interval,
+    idle_ttl=config.fun.ledger_idle_ttl,
+)
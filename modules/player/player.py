@@ -1,11 +1,13 @@
 import random
 import discord
 
-from collections import Counter
 from modules.globals import config
 from modules.orm.database import Cassino, PersistentValues
+from modules.player.blackjack import BlackjackHand
+from modules.player.cards import RANK_LABELS, SUIT_LABELS
+from modules.player.poker import VIDEO_POKER_PAYOUTS, evaluate_hand
+from modules.player.ledger import ledger
 from modules.player.video_poker import VideoPokerDealer
-from modules.utils._database_utils import get_session
 
 
 
@@ -21,32 +23,45 @@ class CassinoPlayer:
         return self
 
     async def initialize(self):
-        async with get_session() as session:
-            player = await session.get(Cassino, int(self.member.id))
-            if not player:
-                player = Cassino(id=self.member.id, balance=1000)
-                session.add(player)
-                await session.commit()
-                await session.refresh(player)
-            self.db_player = player
-    
-    async def update(self, player):
-        async with get_session() as session:
-            session.add(player)
-            await session.commit()
-            await session.refresh(player)
+        await self.refresh()
+
+    def _load(self, values: dict):
+        """
+        Exposes the ledger values as a detached `Cassino` object.
+        """
+        self.db_player = Cassino(id=self.member.id, **values)
+
+    async def mutate_balance(self, bet: int = 0, prize: int = 0, **stats: int) -> bool:
+        """
+        Debits `bet`, credits `prize` and adds the given stat counters in a single step,
+        only if the player's balance covers the bet.
+        Parameters:
+            - bet (int): Amount taken from the balance, checked against it.
+            - prize (int): Amount added to the balance.
+            - stats: Increments for the stat columns (money_won, money_lost, slot_wins...).
+        Returns:
+            - (bool): False if the balance was too low and nothing changed.
+        """
+        values = await ledger.wager(self.member.id, bet=bet, prize=prize, **stats)
+        if values is None:
+            await self.refresh()
+            return False
+        self._load(values)
+        return True
 
     async def refresh(self):
-        async with get_session() as session:
-            self.db_player = await session.get(Cassino, int(self.member.id))
+        self._load(await ledger.get(self.member.id))
 
 class BlackjackPlayer(CassinoPlayer):
     def __init__(self, member: discord.Member) -> None:
         super().__init__(member)
-        self.hand = []
+        self.hand = BlackjackHand()
 
     def add_to_hand(self, card):
-        self.hand.append(card)
+        self.hand.add(card)
+
+    def reset_hand(self):
+        self.hand = BlackjackHand()
 
     @classmethod
     async def create(cls, member: discord.Member):
@@ -56,31 +71,21 @@ class BlackjackPlayer(CassinoPlayer):
 
     @property
     def hand_value(self) -> int:
-        value = 0
-        ace_count = 0
-
-        for card in self.hand:
-            rank = card['rank']
-            if rank in ['J', 'Q', 'K']:
-                value += 10
-            elif rank == 'A':
-                ace_count += 1
-                value += 11
-            else:
-                value += int(rank)
+        return self.hand.value
 
-        while value > 21 and ace_count:
-            value -= 10
-            ace_count -= 1
-
-        return value
+    @property
+    def soft(self) -> bool:
+        """
+        Property that returns if the player's hand is soft (an ace counts as 11).
+        """
+        return self.hand.soft
 
     @property
     def bust(self) -> bool:
         """
         Property that returns if the player has busted.
         """
-        return self.hand_value > 21
+        return self.hand.bust
     
 
 class VideoPokerPlayer(CassinoPlayer):
@@ -89,9 +94,19 @@ class VideoPokerPlayer(CassinoPlayer):
         self.dealer = dealer
         self.hand = self.start_hand()
         self.hand_locks = [False, False, False, False, False]
+        self._evaluation: tuple | None = None
 
     def start_hand(self):
         return self.dealer.deal(5)
+
+    def new_hand(self):
+        """
+        Deals a new hand for the next round, with no card held.
+        """
+        self.dealer.new_round()
+        self.hand = self.start_hand()
+        self.hand_locks = [False, False, False, False, False]
+        self._evaluation = None
     
     def redraw(self):
         for i in range(5):
@@ -108,90 +123,18 @@ class VideoPokerPlayer(CassinoPlayer):
     def hand_evaluation(self) -> str:
         """
         Evaluate the player's hand and return the ranking as a string.
+        - The result is memoized for the current hand, so a hand is evaluated once however often it is read.
         """
-        # Implement hand evaluation logic here
-        return self.evaluate_hand(self.hand)
+        key = tuple(self.hand)
+        if self._evaluation is None or self._evaluation[0] != key:
+            self._evaluation = (key, self.evaluate_hand(key))
+        return self._evaluation[1]
 
     def calculate_winnings(self, bet_amount):
-        payouts = {
-            "Royal Flush": 801,
-            "Straight Flush": 51,
-            "Four of a Kind": 26,
-            "Full House": 10,
-            "Flush": 7,
-            "Straight": 5,
-            "Three of a Kind": 4,
-            "Two Pair": 3,
-            "Jacks or Better": 2,
-            "High Card": 0,
-        }
-        hand_rank = self.hand_evaluation
-
-        return bet_amount * payouts.get(hand_rank, 0)
+        return bet_amount * VIDEO_POKER_PAYOUTS.get(self.hand_evaluation, 0)
         
     def evaluate_hand(self, hand):
-        ranks = [card['rank'] for card in hand]
-        suits = [card['suit'] for card in hand]
-        
-        rank_counter = Counter(ranks)
-        suit_counter = Counter(suits)
-        
-        is_flush = len(suit_counter) == 1
-        is_straight = False
-        sorted_ranks = sorted([int(card) if card.isdigit() else {'J': 11, 'Q': 12, 'K': 13, 'A': 14}[card] for card in ranks])
-        
-        # Check for straight
-        if len(rank_counter) == 5 and sorted_ranks[-1] - sorted_ranks[0] == 4:
-            is_straight = True
-        elif sorted_ranks == [2, 3, 4, 5, 14]:  # Handle special case: A-2-3-4-5
-            is_straight = True
-            sorted_ranks = [1, 2, 3, 4, 5]  # Adjusted ranking for A-2-3-4-5 straight
-
-        # Check for Royal Flush
-        if is_straight and is_flush and sorted_ranks[-1] == 14:
-            return "Royal Flush"
-
-        # Check for Straight Flush
-        if is_straight and is_flush:
-            return "Straight Flush"
-
-        # Check for Four of a Kind
-        if 4 in rank_counter.values():
-            return "Four of a Kind"
-
-        # Check for Full House
-        if 3 in rank_counter.values() and 2 in rank_counter.values():
-            return "Full House"
-
-        # Check for Flush
-        if is_flush:
-            return "Flush"
-
-        # Check for Straight
-        if is_straight:
-            return "Straight"
-
-        # Check for Three of a Kind
-        if 3 in rank_counter.values():
-            return "Three of a Kind"
-
-        # Check for Two Pair
-        if list(rank_counter.values()).count(2) == 2:
-            return "Two Pair"
-
-        # Check for One Pair
-        if 2 in rank_counter.values():
-            pairs = [rank for rank, count in rank_counter.items() if count == 2]
-            face_cards = {'J', 'Q', 'K', 'A'}
-            if any(pair in face_cards or pair.isdigit() and int(pair) >= 11 for pair in pairs):
-                return "Jacks or Better"
-            return "One Pair"
-
-        # High Card
-        high_card_rank = max(sorted_ranks)
-        high_card = [rank for rank in rank_counter.keys() if rank_counter[rank] == 1 and (int(rank) if rank.isdigit() else {'J': 11, 'Q': 12, 'K': 13, 'A': 14}[rank]) == high_card_rank][0]
-        return f"High Card: {high_card}"
-
+        return evaluate_hand(hand)
 
     def display_hand(self):
-        return " ".join([f"[{card['rank']} {card['suit']}]" for card in self.hand])
\ No newline at end of file
+        return " ".join([f"[{RANK_LABELS[card]} {SUIT_LABELS[card]}]" for card in self.hand])
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Module Documentation: Video Poker Hand Evaluator
+
+Evaluates 5-card hands (see modules/player/cards.py) with tables built once at import:
+- Hands with 5 different ranks are keyed by their rank bitmask, which tells straights apart and
+  gives the category with and without a flush.
+- Hands with repeated ranks cannot be flushes and are keyed by the product of one prime per rank,
+  which is unique for every multiset of ranks.
+
+1. evaluate_hand(hand) -> str
+   Returns the hand category ("Royal Flush", "Two Pair", "High Card: K"...) with a few table lookups.
+
+2. VIDEO_POKER_PAYOUTS
+   Payout multiplier of every paying category (a "Jacks or Better" table).
+"""
+import itertools
+import math
+
+from modules.player.cards import DECK, RANKS
+
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+RANK_BITS = tuple(1 << (card // 4) for card in DECK)
+RANK_PRIMES = tuple(PRIMES[card // 4] for card in DECK)
+
+VIDEO_POKER_PAYOUTS = {
+    "Royal Flush": 801,
+    "Straight Flush": 51,
+    "Four of a Kind": 26,
+    "Full House": 10,
+    "Flush": 7,
+    "Straight": 5,
+    "Three of a Kind": 4,
+    "Two Pair": 3,
+    "Jacks or Better": 2,
+    "High Card": 0,
+}
+
+# Rank index of a Jack, the lowest paying pair.
+JACK = RANKS.index('J')
+
+
+def _build_distinct_table() -> dict:
+    """
+    Maps the rank bitmask of every 5 different ranks to its `(category, flush category)`.
+    """
+    straights = {sum(1 << rank for rank in range(low, low + 5)): low + 4 for low in range(len(RANKS) - 4)}
+    wheel = sum(1 << rank for rank in (12, 0, 1, 2, 3))  # A-2-3-4-5
+    straights[wheel] = 3
+    table = {}
+    for ranks in itertools.combinations(range(len(RANKS)), 5):
+        bits = sum(1 << rank for rank in ranks)
+        if bits in straights:
+            royal = straights[bits] == len(RANKS) - 1
+            table[bits] = ("Straight", "Royal Flush" if royal else "Straight Flush")
+        else:
+            table[bits] = (f"High Card: {RANKS[max(ranks)]}", "Flush")
+    return table
+
+
+def _build_repeated_table() -> dict:
+    """
+    Maps the prime product of every multiset of 5 ranks with a repeated rank to its category.
+    """
+    table = {}
+    for ranks in itertools.combinations_with_replacement(range(len(RANKS)), 5):
+        counts = sorted((ranks.count(rank), rank) for rank in set(ranks))
+        if len(counts) == 5 or counts[-1][0] > 4:
+            continue
+        shape = [count for count, _ in counts]
+        if shape[-1] == 4:
+            category = "Four of a Kind"
+        elif shape == [2, 3]:
+            category = "Full House"
+        elif shape[-1] == 3:
+            category = "Three of a Kind"
+        elif shape == [1, 2, 2]:
+            category = "Two Pair"
+        elif counts[-1][1] >= JACK:
+            category = "Jacks or Better"
+        else:
+            category = "One Pair"
+        table[math.prod(PRIMES[rank] for rank in ranks)] = category
+    return table
+
+
+DISTINCT_RANKS = _build_distinct_table()
+REPEATED_RANKS = _build_repeated_table()
+
+
+def evaluate_hand(hand) -> str:
+    """
+    Returns the category of a 5-card hand.
+    """
+    first, second, third, fourth, fifth = hand
+    bits = RANK_BITS[first] | RANK_BITS[second] | RANK_BITS[third] | RANK_BITS[fourth] | RANK_BITS[fifth]
+    categories = DISTINCT_RANKS.get(bits)
+    if categories is None:
+        return REPEATED_RANKS[
+            RANK_PRIMES[first] * RANK_PRIMES[second] * RANK_PRIMES[third] * RANK_PRIMES[fourth] * RANK_PRIMES[fifth]
+        ]
+    suit = first & 3
+    flush = suit == second & 3 == third & 3 == fourth & 3 == fifth & 3
+    return categories[flush]
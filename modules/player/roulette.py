@@ -1,34 +1,124 @@
+"""
+Module Documentation: Roulette
+
+Every pocket of the wheel (0 to 36) is resolved once, at import, into a bitmask with one bit per bet type,
+so a spin settles any bet with a single mask test.
+
+1. Tables
+   - BET_TYPES: Every bet type, in bit order ("red", "black", "green", "1st_12", ..., "3rd_row").
+   - BET_BITS: Bit of each bet type.
+   - POCKETS: 37 entries, the mask of the bet types won by each pocket.
+   - PAYOUTS: Net winnings per unit bet of each bet type.
+   - BET_LABELS: Display name of each bet type.
+   - COLORS: Numbers of each color.
+
+2. Roulette
+   - spin_wheel(): Draws a new winning number and its mask.
+   - wins(bet_type): Whether a bet type wins on the current number.
+   - settle(bets): Winnings and lost stakes of several `(bet_type, amount)` bets on the current number.
+   - is_red, is_black, ...: One property per bet type, kept for the bet buttons.
+"""
 import random
 
+from types import MappingProxyType
+
+COLORS = MappingProxyType({
+    "red": frozenset({1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36}),
+    "black": frozenset({2, 4, 6, 8, 10, 11, 13, 15, 17, 20, 22, 24, 26, 28, 29, 31, 33, 35}),
+    "green": frozenset({0}),
+})
+PAYOUTS = MappingProxyType({
+    "red": 1,
+    "black": 1,
+    "green": 35,
+    "1st_12": 2,
+    "2nd_12": 2,
+    "3rd_12": 2,
+    "1_to_18": 2,
+    "19_to_36": 2,
+    "even": 2,
+    "odd": 2,
+    "1st_row": 3,
+    "2nd_row": 3,
+    "3rd_row": 3
+})
+BET_LABELS = MappingProxyType({
+    "red": "Red",
+    "black": "Black",
+    "green": "Green",
+    "1st_12": "1st 12",
+    "2nd_12": "2nd 12",
+    "3rd_12": "3rd 12",
+    "1_to_18": "1 to 18",
+    "19_to_36": "19 to 36",
+    "even": "Even",
+    "odd": "Odd",
+    "1st_row": "1st Row",
+    "2nd_row": "2nd Row",
+    "3rd_row": "3rd Row",
+})
+_BET_RULES = {
+    "red": lambda number: number in COLORS["red"],
+    "black": lambda number: number in COLORS["black"],
+    "green": lambda number: number in COLORS["green"],
+    "1st_12": lambda number: 1 <= number <= 12,
+    "2nd_12": lambda number: 13 <= number <= 24,
+    "3rd_12": lambda number: 25 <= number <= 36,
+    "1_to_18": lambda number: 1 <= number <= 18,
+    "19_to_36": lambda number: 19 <= number <= 36,
+    "even": lambda number: number % 2 == 0,
+    "odd": lambda number: number % 2 != 0,
+    "1st_row": lambda number: number % 3 == 0,
+    "2nd_row": lambda number: number % 3 == 1,
+    "3rd_row": lambda number: number % 3 == 2,
+}
+BET_TYPES = tuple(_BET_RULES)
+BET_BITS = MappingProxyType({bet_type: 1 << bit for bit, bet_type in enumerate(BET_TYPES)})
+POCKETS = tuple(
+    sum(BET_BITS[bet_type] for bet_type, rule in _BET_RULES.items() if rule(number)) for number in range(37)
+)
+
+_RED, _BLACK, _GREEN = BET_BITS["red"], BET_BITS["black"], BET_BITS["green"]
+_1ST_12, _2ND_12, _3RD_12 = BET_BITS["1st_12"], BET_BITS["2nd_12"], BET_BITS["3rd_12"]
+_1_TO_18, _19_TO_36 = BET_BITS["1_to_18"], BET_BITS["19_to_36"]
+_EVEN, _ODD = BET_BITS["even"], BET_BITS["odd"]
+_1ST_ROW, _2ND_ROW, _3RD_ROW = BET_BITS["1st_row"], BET_BITS["2nd_row"], BET_BITS["3rd_row"]
+
+
 class Roulette:
     def __init__(self):
+        self.colors = COLORS
+        self.payout = PAYOUTS
+        self.winning_number: int | None = None
+        self.mask = 0
         self.result = self.spin_wheel()
-        self.colors = {
-            "red": [1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36],
-            "black": [2, 4, 6, 8, 10, 11, 13, 15, 17, 20, 22, 24, 26, 28, 29, 31, 33, 35],
-            "green": [0]
-        }
-        self.payout = {
-            "red": 1,
-            "black": 1,
-            "green": 35,
-            "1st_12": 2,
-            "2nd_12": 2,
-            "3rd_12": 2,
-            "1_to_18": 2,
-            "19_to_36": 2,
-            "even": 2,
-            "odd": 2,
-            "1st_row": 3,
-            "2nd_row": 3,
-            "3rd_row": 3
-        }
 
     def remove_player(self):
         self.player = None
 
     def spin_wheel(self):
         self.winning_number = random.randint(0, 36)
+        self.mask = POCKETS[self.winning_number]
+
+    def wins(self, bet_type: str) -> bool:
+        return bool(self.mask & BET_BITS[bet_type])
+
+    def settle(self, bets) -> tuple[int, int]:
+        """
+        Resolves several bets on the current number.
+        Parameters:
+            - bets: Iterable of `(bet_type, amount)` pairs.
+        Returns:
+            - (tuple[int, int]): Winnings of the winning bets, and stakes of the losing ones.
+        """
+        mask = self.mask
+        won = lost = 0
+        for bet_type, amount in bets:
+            if mask & BET_BITS[bet_type]:
+                won += amount * PAYOUTS[bet_type]
+            else:
+                lost += amount
+        return won, lost
 
     def announce_winner(self):
         if self.winning_number is None:
@@ -41,54 +131,52 @@ class Roulette:
     
     @property
     def is_red(self):
-        return self.winning_number in self.colors["red"]
+        return bool(self.mask & _RED)
     
     @property
     def is_black(self):
-        return self.winning_number in self.colors["black"]
+        return bool(self.mask & _BLACK)
     
     @property
     def is_1st_12(self):
-        return self.winning_number in range(1, 13)
+        return bool(self.mask & _1ST_12)
     
     @property
     def is_2nd_12(self):
-        return self.winning_number in range(13, 25)
+        return bool(self.mask & _2ND_12)
     
     @property
     def is_3rd_12(self):
-        return self.winning_number in range(25, 37)
+        return bool(self.mask & _3RD_12)
     
     @property
     def is_1_to_18(self):
-        return self.winning_number in range(1, 19)
+        return bool(self.mask & _1_TO_18)
     
     @property
     def is_19_to_36(self):
-        return self.winning_number in range(19, 37)
+        return bool(self.mask & _19_TO_36)
     
     @property
     def is_even(self):
-        return self.winning_number%2 == 0
+        return bool(self.mask & _EVEN)
     
     @property
     def is_odd(self):
-        return self.winning_number%2 != 0
+        return bool(self.mask & _ODD)
     
     @property
     def is_green(self):
-        return self.winning_number in self.colors["green"]
+        return bool(self.mask & _GREEN)
     
     @property
     def is_first_row(self):
-        return self.winning_number%3 == 0
+        return bool(self.mask & _1ST_ROW)
     
     @property
     def is_second_row(self):
-        return self.winning_number%3 == 1
+        return bool(self.mask & _2ND_ROW)
     
     @property
     def is_third_row(self):
-        return self.winning_number%3 == 2
-    
-    
\ No newline at end of file
+        return bool(self.mask & _3RD_ROW)
@@ -0,0 +1,178 @@
+"""
+Module Documentation: Slot Machine Model
+
+This module describes the slot machine without any database or Discord dependency, so it can be
+shared by the interactive game and by offline tools (simulations, payout analysis).
+
+1. SlotModel
+   Immutable description of the slot machine, built once per adjustment factor.
+   - symbols / cum_weights: Reel symbols and their cumulative weights, ready for `random.choices`.
+   - probabilities: Probability of each symbol on a single reel.
+   - full_prizes / two_of_a_kind_prizes / one_of_a_kind_prizes: Prize multipliers shown to the players.
+   - multipliers: Prize multiplier of every one of the 343 reel combinations.
+   - combination_probabilities: Exact probability of every reel combination.
+   - feeds_jackpot: Combinations whose lost bet is added to the jackpot.
+   - spin(): Spins the three reels once.
+   - spin_many(n): Spins the three reels `n` times with a single `random.choices` call.
+
+2. build_slot_model(adjustment_factor: float)
+   Builds the SlotModel, weighting each symbol by `1 / (full prize * adjustment_factor)`.
+
+3. expected_value(model: SlotModel, house_retain: float)
+   Exact per unit bet figures, enumerating the 343 combinations: rtp of the prize table, jackpot_feed
+   (share of every bet paid back through the jackpot), rtp_with_jackpot and house_edge.
+
+4. validate_slot_model(model: SlotModel, house_retain: float)
+   Raises HouseEdgeError if the house edge, counting the jackpot as paid back, is negative.
+
+`SLOT_MODEL` is the module-level model built from `config.fun.cassino_adjustment_factor`.
+"""
+import itertools
+import math
+import random
+
+from types import MappingProxyType
+
+from modules.exceptions import HouseEdgeError
+from modules.globals import config
+
+
+class SlotModel:
+    __slots__ = (
+        "symbols",
+        "cum_weights",
+        "probabilities",
+        "full_prizes",
+        "two_of_a_kind_prizes",
+        "one_of_a_kind_prizes",
+        "multipliers",
+        "combination_probabilities",
+        "feeds_jackpot",
+        "jackpot_combination",
+    )
+
+    def __init__(self, probabilities: dict, full_prizes: dict, two_of_a_kind_prizes: dict, one_of_a_kind_prizes: dict) -> None:
+        """
+        Constructor for the SlotModel class.
+        Parameters:
+            - probabilities (dict): Probability of each symbol on a single reel.
+            - full_prizes (dict): Multiplier of three equal symbols.
+            - two_of_a_kind_prizes (dict): Multiplier of two equal symbols.
+            - one_of_a_kind_prizes (dict): Multiplier of a single symbol on three different reels.
+        """
+        self.probabilities = MappingProxyType(dict(probabilities))
+        self.symbols = tuple(probabilities)
+        self.cum_weights = tuple(itertools.accumulate(probabilities.values()))
+        self.full_prizes = MappingProxyType(dict(full_prizes))
+        self.two_of_a_kind_prizes = MappingProxyType(dict(two_of_a_kind_prizes))
+        self.one_of_a_kind_prizes = MappingProxyType(dict(one_of_a_kind_prizes))
+        self.jackpot_combination = (config.emoji.cassino.diamond,) * 3
+
+        multipliers, feeds_jackpot = {}, set()
+        for combination in itertools.product(self.symbols, repeat=3):
+            counts = {symbol: combination.count(symbol) for symbol in combination}
+            if len(counts) == 1:
+                multiplier = self.full_prizes.get(combination[0], 0)
+            elif len(counts) == 2:
+                pair = next(symbol for symbol, count in counts.items() if count == 2)
+                multiplier = self.two_of_a_kind_prizes.get(pair, 0)
+            else:
+                single = next((symbol for symbol in combination if symbol in self.one_of_a_kind_prizes), None)
+                multiplier = self.one_of_a_kind_prizes[single] if single else 0
+                if not multiplier:
+                    feeds_jackpot.add(combination)
+            multipliers[combination] = multiplier
+        self.multipliers = MappingProxyType(multipliers)
+        self.combination_probabilities = MappingProxyType({
+            combination: math.prod(self.probabilities[symbol] for symbol in combination) for combination in multipliers
+        })
+        self.feeds_jackpot = frozenset(feeds_jackpot)
+
+    def spin(self) -> list:
+        return random.choices(self.symbols, cum_weights=self.cum_weights, k=3)
+
+    def spin_many(self, n: int) -> list[tuple]:
+        """
+        Spins the reels `n` times, drawing all `3 * n` symbols in one call.
+        Returns a list of `n` combinations.
+        """
+        reels = random.choices(self.symbols, cum_weights=self.cum_weights, k=3 * n)
+        return list(zip(reels[0::3], reels[1::3], reels[2::3]))
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(f"SlotModel is immutable, cannot set {name!r}")
+        super().__setattr__(name, value)
+
+    def __repr__(self) -> str:
+        return f"SlotModel(symbols={self.symbols!r}, combinations={len(self.multipliers)})"
+
+
+def build_slot_model(adjustment_factor: float) -> SlotModel:
+    """
+    Builds the slot machine model, making symbols with bigger full prizes rarer.
+    Parameters:
+        - adjustment_factor (float): Factor applied to every full prize when weighting the symbols.
+    """
+    full_prizes = {
+        config.emoji.cassino.diamond: 100,
+        config.emoji.cassino.cherry: 50,
+        config.emoji.cassino.lemon: 25,
+        config.emoji.cassino.orange: 10,
+        config.emoji.cassino.apple: 8,
+        config.emoji.cassino.grapes: 5,
+        config.emoji.cassino.banana: 2,
+    }
+    two_of_a_kind_prizes = {
+        config.emoji.cassino.diamond: 20,
+        config.emoji.cassino.cherry: 15,
+        config.emoji.cassino.lemon: 10,
+        config.emoji.cassino.orange: 6,
+        config.emoji.cassino.apple: 3,
+    }
+    one_of_a_kind_prizes = {
+        config.emoji.cassino.diamond: 6,
+        config.emoji.cassino.cherry: 2
+    }
+    total_weight = sum(1 / (prize * adjustment_factor) for prize in full_prizes.values())
+    probabilities = {symbol: (1 / (prize * adjustment_factor)) / total_weight for symbol, prize in full_prizes.items()}
+    return SlotModel(probabilities, full_prizes, two_of_a_kind_prizes, one_of_a_kind_prizes)
+
+
+SLOT_MODEL = build_slot_model(config.fun.cassino_adjustment_factor)
+
+
+def expected_value(model: SlotModel, house_retain: float) -> dict:
+    """
+    Computes the exact expected return of a unit bet.
+    Parameters:
+        - model (SlotModel): Slot machine to evaluate.
+        - house_retain (float): Share of a losing bet kept by the house instead of feeding the jackpot.
+    Returns:
+        - (dict): rtp, jackpot_feed, rtp_with_jackpot, house_edge and jackpot_hit_rate.
+    """
+    rtp = sum(model.combination_probabilities[combination] * multiplier for combination, multiplier in model.multipliers.items())
+    jackpot_feed = sum(model.combination_probabilities[combination] for combination in model.feeds_jackpot) * (1 - house_retain)
+    return {
+        "rtp": rtp,
+        "jackpot_feed": jackpot_feed,
+        "rtp_with_jackpot": rtp + jackpot_feed,
+        "house_edge": 1 - rtp - jackpot_feed,
+        "jackpot_hit_rate": model.combination_probabilities[model.jackpot_combination],
+    }
+
+
+def validate_slot_model(model: SlotModel, house_retain: float) -> dict:
+    """
+    Ensures the slot machine does not pay back more than it takes.
+    - Every fed jackpot is eventually won, so the jackpot feed counts as paid back.
+    - Raises HouseEdgeError if the house edge is negative, returns the expected value otherwise.
+    """
+    value = expected_value(model, house_retain)
+    if value["house_edge"] < 0:
+        raise HouseEdgeError(
+            f"Slot machine pays back {value['rtp_with_jackpot']:.2%} of every bet "
+            f"({value['rtp']:.2%} in prizes, {value['jackpot_feed']:.2%} through the jackpot), "
+            f"raise config.fun.house_retain or lower the prizes"
+        )
+    return value
@@ -0,0 +1,155 @@
+"""
+Module Documentation: Slot Machine Monte Carlo Simulation
+
+Offline tool to tune `config.fun.cassino_adjustment_factor` and `config.fun.house_retain`.
+It needs no database nor Discord connection: it only uses the prize tables of a SlotModel.
+
+1. combination_tables(model: SlotModel)
+   Flattens the model into NumPy lookup tables indexed by `reel1 * 49 + reel2 * 7 + reel3`:
+   the prize multiplier, the outcome category (triple, pair, single, nothing) and whether the
+   combination feeds or wins the jackpot.
+
+2. simulate_slots(model: SlotModel, spins: int, house_retain: float, seed=None, chunk_size=1_000_000)
+   Draws `spins` spins in batches, as a categorical sample over the cumulative weights, and
+   computes every payout with vectorized table lookups. Returns a dictionary (per unit bet) with:
+   - rtp: Return to player of the prize table alone.
+   - jackpot_feed: Jackpot growth per spin, a share of every bet paid back through the jackpot.
+   - rtp_with_jackpot: Long run return to player once the jackpot is paid out (rtp + jackpot_feed).
+   - hit_frequency: Share of spins paying a prize, split into triple/pair/single frequencies.
+   - variance / std: Dispersion of the prize multiplier.
+   - jackpot_hit_rate / mean_jackpot: How often the jackpot is won and its expected size when won.
+
+Run from the repository root to sweep adjustment factors and house retains:
+    python -m modules.player.slot_simulation --spins 5000000 --factors 1.0 1.2 1.5 --retains 0.1 0.2
+"""
+import argparse
+import time
+
+import numpy as np
+from tabulate import tabulate
+
+from modules.globals import config
+from modules.player.slot_model import SlotModel, build_slot_model
+
+NOTHING, SINGLE, PAIR, TRIPLE = range(4)
+
+
+def combination_tables(model: SlotModel) -> dict:
+    """
+    Builds the NumPy lookup tables of the 343 combinations of a model.
+    """
+    size = len(model.symbols)
+    index = {symbol: position for position, symbol in enumerate(model.symbols)}
+    multipliers = np.zeros(size**3, dtype=np.float64)
+    categories = np.zeros(size**3, dtype=np.int8)
+    feeds_jackpot = np.zeros(size**3, dtype=bool)
+    for combination, multiplier in model.multipliers.items():
+        code = index[combination[0]] * size * size + index[combination[1]] * size + index[combination[2]]
+        multipliers[code] = multiplier
+        distinct = len(set(combination))
+        if distinct == 1:
+            categories[code] = TRIPLE
+        elif distinct == 2:
+            categories[code] = PAIR if multiplier else NOTHING
+        else:
+            categories[code] = SINGLE if multiplier else NOTHING
+        feeds_jackpot[code] = combination in model.feeds_jackpot
+    jackpot = model.jackpot_combination
+    jackpot_code = index[jackpot[0]] * size * size + index[jackpot[1]] * size + index[jackpot[2]]
+    return {
+        "size": size,
+        "multipliers": multipliers,
+        "categories": categories,
+        "feeds_jackpot": feeds_jackpot,
+        "jackpot_code": jackpot_code,
+    }
+
+
+def simulate_slots(model: SlotModel, spins: int, house_retain: float, seed=None, chunk_size: int = 1_000_000) -> dict:
+    """
+    Simulates `spins` spins of a unit bet.
+    Parameters:
+        - model (SlotModel): Slot machine to simulate.
+        - spins (int): Number of spins to draw.
+        - house_retain (float): Share of a losing bet kept by the house instead of feeding the jackpot.
+        - seed: Seed of the NumPy random generator, for reproducible runs.
+        - chunk_size (int): Spins drawn per batch, bounding the memory used.
+    """
+    rng = np.random.default_rng(seed)
+    tables = combination_tables(model)
+    size = tables["size"]
+    cum_weights = np.asarray(model.cum_weights) / model.cum_weights[-1]
+    weights = np.array([size * size, size, 1])
+
+    total = total_squared = fed = jackpots = 0.0
+    category_counts = np.zeros(4, dtype=np.int64)
+    drawn = 0
+    while drawn < spins:
+        batch = min(chunk_size, spins - drawn)
+        reels = np.searchsorted(cum_weights, rng.random((batch, 3)), side="right")
+        np.minimum(reels, size - 1, out=reels)
+        codes = reels @ weights
+        payouts = tables["multipliers"][codes]
+        total += payouts.sum()
+        total_squared += np.square(payouts).sum()
+        fed += np.count_nonzero(tables["feeds_jackpot"][codes])
+        jackpots += np.count_nonzero(codes == tables["jackpot_code"])
+        category_counts += np.bincount(tables["categories"][codes], minlength=4)
+        drawn += batch
+
+    rtp = total / spins
+    variance = total_squared / spins - rtp**2
+    jackpot_feed = fed / spins * (1 - house_retain)
+    jackpot_hit_rate = jackpots / spins
+    return {
+        "spins": spins,
+        "rtp": rtp,
+        "jackpot_feed": jackpot_feed,
+        "rtp_with_jackpot": rtp + jackpot_feed,
+        "hit_frequency": (spins - category_counts[NOTHING]) / spins,
+        "triple_frequency": category_counts[TRIPLE] / spins,
+        "pair_frequency": category_counts[PAIR] / spins,
+        "single_frequency": category_counts[SINGLE] / spins,
+        "variance": variance,
+        "std": variance**0.5,
+        "jackpot_hit_rate": jackpot_hit_rate,
+        "mean_jackpot": jackpot_feed / jackpot_hit_rate if jackpot_hit_rate else float("inf"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo simulation of the cassino slot machine.")
+    parser.add_argument("--spins", type=int, default=5_000_000)
+    parser.add_argument("--factors", type=float, nargs="+", default=[config.fun.cassino_adjustment_factor])
+    parser.add_argument("--retains", type=float, nargs="+", default=[config.fun.house_retain])
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    rows = []
+    for factor in args.factors:
+        model = build_slot_model(factor)
+        for retain in args.retains:
+            start = time.perf_counter()
+            result = simulate_slots(model, args.spins, retain, seed=args.seed)
+            elapsed = time.perf_counter() - start
+            rows.append([
+                factor,
+                retain,
+                f"{result['rtp']:.4f}",
+                f"{result['rtp_with_jackpot']:.4f}",
+                f"{result['hit_frequency']:.4f}",
+                f"{result['std']:.3f}",
+                f"{result['jackpot_feed']:.4f}",
+                f"{result['mean_jackpot']:.1f}",
+                f"{elapsed:.2f}s",
+            ])
+    print(
+        tabulate(
+            rows,
+            headers=["factor", "retain", "rtp", "rtp+jackpot", "hit freq", "std", "jackpot/spin", "jackpot when won", "time"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
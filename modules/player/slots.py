@@ -1,75 +1,56 @@
-import random
+"""
+Module Documentation: Slot Machine
 
+1. SlotMachine
+   Interactive slot machine used by the cassino views, backed by the shared `SLOT_MODEL`
+   (see modules/player/slot_model.py).
+   - spin(): Spins the three reels once.
+   - calculate_prize(combination, bet_amount): Looks the prize up, without the jackpot.
+   - settle_jackpot(combination, bet_amount): Claims or feeds the jackpot, once the bet has been debited.
+   - display_prizes(): Renders the prize table.
+   - get_jackpot()/add_jackpot(value)/reset_jackpot(): Delegate to the in-memory jackpot accumulator.
+"""
 from tabulate import tabulate
 
 from modules.globals import config
-from modules.orm.database import PersistentValues
-from modules.utils._database_utils import get_session
+from modules.player.jackpot import jackpot_pool
+from modules.player.slot_model import SLOT_MODEL, SlotModel
 
 
 class SlotMachine:
-    def __init__(self) -> None:
-        self.full_prizes = {
-            config.emoji.cassino.diamond: 100,
-            config.emoji.cassino.cherry: 50,
-            config.emoji.cassino.lemon: 25,
-            config.emoji.cassino.orange: 10,
-            config.emoji.cassino.apple: 8,
-            config.emoji.cassino.grapes: 5,
-            config.emoji.cassino.banana: 2,
-        }
-        self.two_of_a_kind_prizes = {
-            config.emoji.cassino.diamond: 20,
-            config.emoji.cassino.cherry: 15,
-            config.emoji.cassino.lemon: 10,
-            config.emoji.cassino.orange: 6,
-            config.emoji.cassino.apple: 3,
-        }
-        self.one_of_a_kind_prizes = {
-            config.emoji.cassino.diamond: 6,
-            config.emoji.cassino.cherry: 2
-        }
-        self.probability_distribution = self.calculate_probabilities()
-
-    def calculate_probabilities(self):
-        adjustment_factor = config.fun.cassino_adjustment_factor
-        total_weight = sum(1 / (prize * adjustment_factor) for prize in self.full_prizes.values())
-        probabilities = {symbol: (1 / (prize * adjustment_factor)) / total_weight for symbol, prize in self.full_prizes.items()}
-        return probabilities
+    def __init__(self, model: SlotModel = SLOT_MODEL) -> None:
+        self.model = model
+        self.full_prizes = model.full_prizes
+        self.two_of_a_kind_prizes = model.two_of_a_kind_prizes
+        self.one_of_a_kind_prizes = model.one_of_a_kind_prizes
+        self.probability_distribution = model.probabilities
     
     def spin(self):
-        symbols, weights = zip(*self.probability_distribution.items())
-        return random.choices(symbols, weights, k=3)
+        return self.model.spin()
     
-    async def calculate_prize(self, combination, bet_amount):
+    def calculate_prize(self, combination, bet_amount):
         """
-        Calculate the prize based on the combination of symbols and the bet amount.
+        Calculate the prize based on the combination of symbols and the bet amount, without the jackpot.
         :param combination: tuple of symbols
         :param bet_amount: the amount of bet placed
         :return: prize amount
         """
-        if combination[0] == combination[1] == combination[2]:
-            if combination[0] == config.emoji.cassino.diamond:
-                jackpot = await self.get_jackpot()
-            else:
-                jackpot = 0
-            multiplier = self.full_prizes.get(combination[0], 0)
-            return bet_amount * multiplier + jackpot
+        return bet_amount * self.model.multipliers[tuple(combination)]
 
-        elif combination[0] == combination[1] or combination[0] == combination[2] or combination[1] == combination[2]:
-            for symbol in combination:
-                if combination.count(symbol) == 2:
-                    multiplier = self.two_of_a_kind_prizes.get(symbol, 0)
-                    return bet_amount * multiplier
-            return 0
-        
-        else:
-            for symbol in combination:
-                if combination.count(symbol) == 1 and symbol in self.one_of_a_kind_prizes:
-                    multiplier = self.one_of_a_kind_prizes.get(symbol, 0)
-                    return bet_amount * multiplier
-            await self.add_jackpot(bet_amount * (1-config.fun.house_retain)) #add 90% of the bet amount to the jackpot
-            return 0
+    async def settle_jackpot(self, combination, bet_amount):
+        """
+        Claims the jackpot for a jackpot combination, or feeds it for a losing one.
+        Only called once the bet has been debited, so a refused bet never touches the shared jackpot.
+        :param combination: tuple of symbols
+        :param bet_amount: the amount of bet placed
+        :return: claimed jackpot, 0 if it was not won
+        """
+        combination = tuple(combination)
+        if combination == self.model.jackpot_combination:
+            return await self.reset_jackpot()
+        if combination in self.model.feeds_jackpot:
+            await self.add_jackpot(bet_amount * (1-config.fun.house_retain)) #add the share not retained by the house to the jackpot
+        return 0
         
     def display_prizes(self):
         table_data = [
@@ -85,36 +66,14 @@ class SlotMachine:
         return tabulate(table_data, tablefmt="plain")
     
     async def get_jackpot(self):
-        async with get_session() as session:
-            jackpot = await session.get(PersistentValues, "jackpot")
-            if not jackpot:
-                jackpot = PersistentValues(name="jackpot", value="0")
-                session.add(jackpot)
-                await session.commit()
-                await session.refresh(jackpot)
-            return jackpot.value
+        return await jackpot_pool.get()
         
     async def add_jackpot(self, value: int):
-        async with get_session() as session:
-            jackpot = await session.get(PersistentValues, "jackpot")
-            if not jackpot:
-                jackpot = PersistentValues(name="jackpot", value="0")
-                session.add(jackpot)
-                await session.commit()
-                await session.refresh(jackpot)
-            jackpot.value += value
-            await session.commit()
-            await session.refresh(jackpot)
+        await jackpot_pool.add(value)
     
     async def reset_jackpot(self):
-        async with get_session() as session:
-            jackpot = await session.get(PersistentValues, "jackpot")
-            if not jackpot:
-                jackpot = PersistentValues(name="jackpot", value="0")
-                session.add(jackpot)
-                await session.commit()
-                await session.refresh(jackpot)
-            jackpot.value = 0
-            await session.commit()
-            await session.refresh(jackpot)
+        """
+        Claims the whole jackpot, returning the amount won.
+        """
+        return await jackpot_pool.claim()
 
@@ -0,0 +1,95 @@
+"""
+Module Documentation: Open Cassino Stakes
+
+This module remembers the bets debited for blackjack and video poker rounds that are not settled yet, by cassino
+message, so a round interrupted by a restart or a dropped view is refunded when its cassino is restored.
+The stakes are kept in memory, saved to the `persistent_values` table when the bot stops and loaded back when it starts.
+
+1. OpenStakes
+   Process-wide book of the stakes in flight.
+   - open(message_id, amount): Adds a debited bet to the round in flight on a cassino message.
+   - settle(message_id): Forgets the stake of a message whose round ended.
+   - refund(message_id, member_id): Credits the open stake of a message back through the ledger and returns it.
+   - start()/stop(): Loads the stakes saved by the last shutdown, and saves the ones still open.
+
+The module exposes the `open_stakes` instance used by the whole bot.
+"""
+import logging
+
+from sqlalchemy import delete, select
+
+from modules.orm.database import PersistentValues
+from modules.player.ledger import ledger
+from modules.utils._database_utils import get_session
+
+STAKE_PREFIX = "stake:"
+
+
+class OpenStakes:
+    def __init__(self) -> None:
+        self._stakes: dict[int, int] = {}
+
+    def open(self, message_id: int, amount: int) -> None:
+        """
+        Records a bet taken from the balance for the round in flight on a message.
+        A doubled blackjack bet is added to the stake already open.
+        """
+        self._stakes[message_id] = self._stakes.get(message_id, 0) + amount
+
+    def settle(self, message_id: int) -> None:
+        """
+        Forgets the stake of a message once its round paid out or was lost.
+        """
+        self._stakes.pop(message_id, None)
+
+    async def refund(self, message_id: int, member_id: int) -> int:
+        """
+        Gives the open stake of a message back to its player, undoing the money lost counted when it was taken.
+        Parameters:
+            - message_id (int): The cassino message whose round was interrupted.
+            - member_id (int): The player who owns the cassino.
+        Returns:
+            - (int): The refunded amount, 0 if no round was in flight.
+        """
+        amount = self._stakes.pop(message_id, 0)
+        if amount:
+            await ledger.apply(member_id, balance=amount, money_lost=-amount)
+        return amount
+
+    async def start(self) -> None:
+        """
+        Loads the stakes saved by the last shutdown and removes their rows.
+        """
+        try:
+            async with get_session() as session:
+                rows = await session.execute(
+                    select(PersistentValues).where(PersistentValues.name.startswith(STAKE_PREFIX))
+                )
+                for row in rows.scalars():
+                    self.open(int(row.name.removeprefix(STAKE_PREFIX)), row.value)
+                await session.execute(delete(PersistentValues).where(PersistentValues.name.startswith(STAKE_PREFIX)))
+                await session.commit()
+        except Exception:
+            logging.exception("Failed to load the open cassino stakes")
+
+    async def stop(self) -> None:
+        """
+        Saves the stakes still open, so their rounds can be refunded after the restart.
+        """
+        if not self._stakes:
+            return
+        try:
+            async with get_session() as session:
+                session.add_all(
+                    PersistentValues(name=f"{STAKE_PREFIX}{message_id}", value=amount)
+                    for message_id, amount in self._stakes.items()
+                )
+                await session.commit()
+        except Exception:
+            logging.exception("Failed to save %s open cassino stakes", len(self._stakes))
+
+    def __repr__(self) -> str:
+        return f"OpenStakes(open={len(self._stakes)}, amount={sum(self._stakes.values())})"
+
+
+open_stakes = OpenStakes()
@@ -1,29 +1,32 @@
-import random
-
-from modules.globals import config
+from modules.player.cards import Shoe
 
 
 class VideoPokerDealer:
-    def __init__(self):
-        self.deck = self.create_deck()
+    def __init__(self, shoe: Shoe | None = None):
+        """
+        Constructor for the VideoPokerDealer class.
+        Parameters:
+            - shoe (Shoe | None): Single deck shoe kept across hands. A new one is created if not given.
+        """
+        self.shoe = shoe or self.create_shoe()
+        self.shoe.start_round()
 
     @staticmethod
-    def create_deck():
-        suits = [config.emoji.cassino.blackjack.hearts, config.emoji.cassino.blackjack.diamonds, config.emoji.cassino.blackjack.clubs, config.emoji.cassino.blackjack.spades]
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-        return [{'suit': suit, 'rank': rank} for suit in suits for rank in ranks]
+    def create_shoe() -> Shoe:
+        # Every hand is dealt from a freshly shuffled deck.
+        return Shoe(decks=1, penetration=0)
+
+    def new_round(self):
+        self.shoe.start_round()
 
     def shuffle_deck(self):
-        random.shuffle(self.deck)
+        self.shoe.shuffle()
 
     def deal_card(self):
-        if not self.deck:
-            self.deck = self.create_deck()
-            self.shuffle_deck()
-        return self.deck.pop(random.randrange(len(self.deck)))
+        return self.shoe.deal()
     
     def deal(self, n):
-        return [self.deal_card() for _ in range(n) if self.deck]
+        return [self.deal_card() for _ in range(n)]
 
     def reset_deck(self) -> None:
-        self.deck = self.create_deck()
\ No newline at end of file
+        self.shoe.shuffle()
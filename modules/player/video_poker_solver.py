@@ -0,0 +1,177 @@
+"""
+Module Documentation: Video Poker Hold Solver
+
+Finds the best cards to hold in a video poker hand by computing the exact expected payout of the
+32 hold patterns over every possible draw from the 47 remaining cards (2,598,960 hands per decision),
+with NumPy versions of the tables in modules/player/poker.py.
+
+1. hold_values(hand) -> list[tuple[list[bool], float]]
+   Expected payout, per unit bet, of every hold pattern, best first. Each pattern is a list of 5 booleans
+   in the order of the hand, like `VideoPokerPlayer.hand_locks`.
+
+2. best_hold(hand) -> tuple[list[bool], float]
+   The hold pattern with the highest expected payout. An uncached hand takes around a second of CPU,
+   so it is meant to run in a thread (`asyncio.to_thread`) with a bounded number of solves at once.
+
+3. estimate_return(hands: int, seed=None)
+   Plays `hands` random deals with the best hold and returns the mean payout and its standard error,
+   to check the pay table offline:
+       python -m modules.player.video_poker_solver --hands 200
+
+Results are cached per hand, after mapping it to a canonical suit order, since a hand and its
+suit permutations have the same expected payouts.
+"""
+import argparse
+import functools
+import itertools
+import random
+
+import numpy as np
+
+from modules.globals import config
+from modules.player.cards import DECK, RANKS
+from modules.player.poker import DISTINCT_RANKS, REPEATED_RANKS, RANK_PRIMES, VIDEO_POKER_PAYOUTS
+
+SUIT_PERMUTATIONS = tuple(itertools.permutations(range(4)))
+HOLD_PATTERNS = tuple(tuple(bool(mask >> position & 1) for position in range(5)) for mask in range(32))
+# Draws scored at once by _expected_payout, bounding its memory to a few MB instead of ~180 MB per hand.
+DRAW_CHUNK_SIZE = 1 << 16
+
+
+def _payout(category: str) -> int:
+    return VIDEO_POKER_PAYOUTS.get(category.split(":")[0], 0)
+
+
+def _build_tables():
+    rank_bits = np.array([1 << (card // 4) for card in DECK], dtype=np.int64)
+    rank_primes = np.array(RANK_PRIMES, dtype=np.int64)
+    suits = np.array([card % 4 for card in DECK], dtype=np.int64)
+
+    plain = np.zeros(1 << len(RANKS), dtype=np.int64)
+    flush = np.zeros(1 << len(RANKS), dtype=np.int64)
+    distinct = np.zeros(1 << len(RANKS), dtype=bool)
+    for bits, (category, flush_category) in DISTINCT_RANKS.items():
+        plain[bits] = _payout(category)
+        flush[bits] = _payout(flush_category)
+        distinct[bits] = True
+
+    products = np.array(sorted(REPEATED_RANKS), dtype=np.int64)
+    repeated = np.array([_payout(REPEATED_RANKS[product]) for product in products], dtype=np.int64)
+    return rank_bits, rank_primes, suits, plain, flush, distinct, products, repeated
+
+
+RANK_BITS, PRIMES, SUITS, PLAIN_PAYOUTS, FLUSH_PAYOUTS, DISTINCT, PRODUCTS, REPEATED_PAYOUTS = _build_tables()
+
+
+@functools.lru_cache(maxsize=None)
+def _draw_combinations(draws: int) -> np.ndarray:
+    """
+    Returns every way to pick `draws` of the 47 remaining cards, as an array of positions.
+    """
+    if not draws:
+        return np.zeros((1, 0), dtype=np.int8)
+    positions = itertools.chain.from_iterable(itertools.combinations(range(47), draws))
+    return np.fromiter(positions, dtype=np.int8).reshape(-1, draws)
+
+
+def _expected_payout(held: list[int], rest: np.ndarray) -> float:
+    """
+    Mean payout of holding `held` and drawing the other cards from `rest`.
+    The draws are scored DRAW_CHUNK_SIZE at a time, so the int64 working arrays stay a few megabytes.
+    """
+    combinations = _draw_combinations(5 - len(held))
+    total = 0
+    for start in range(0, len(combinations), DRAW_CHUNK_SIZE):
+        total += _total_payout(held, rest[combinations[start:start + DRAW_CHUNK_SIZE]])
+    return total / len(combinations)
+
+
+def _total_payout(held: list[int], drawn: np.ndarray) -> int:
+    """
+    Sum of the payouts of holding `held` with each row of `drawn`.
+    """
+    bits = np.bitwise_or.reduce(RANK_BITS[drawn], axis=1, initial=0)
+    primes = np.prod(PRIMES[drawn], axis=1)
+    suits = SUITS[drawn]
+    for card in held:
+        bits |= RANK_BITS[card]
+        primes *= PRIMES[card]
+    if held:
+        suit = SUITS[held[0]]
+        is_flush = np.all(suits == suit, axis=1) & all(SUITS[card] == suit for card in held)
+    else:
+        is_flush = np.all(suits == suits[:, :1], axis=1)
+
+    payouts = np.where(is_flush, FLUSH_PAYOUTS[bits], PLAIN_PAYOUTS[bits])
+    repeated = ~DISTINCT[bits]
+    positions = np.searchsorted(PRODUCTS, primes[repeated])
+    payouts[repeated] = REPEATED_PAYOUTS[positions]
+    return int(payouts.sum())
+
+
+@functools.lru_cache(maxsize=config.fun.video_poker_hint_cache_size)
+def _canonical_hold_values(hand: tuple) -> tuple:
+    """
+    Expected payout of every hold pattern of a sorted, suit-canonical hand.
+    """
+    rest = np.array([card for card in DECK if card not in hand], dtype=np.int8)
+    return tuple(
+        _expected_payout([card for card, hold in zip(hand, pattern) if hold], rest) for pattern in HOLD_PATTERNS
+    )
+
+
+def _canonicalize(hand) -> tuple:
+    """
+    Returns the smallest sorted hand among the suit permutations of `hand`, and the permuted cards in hand order.
+    """
+    best = None
+    for permutation in SUIT_PERMUTATIONS:
+        permuted = [card - card % 4 + permutation[card % 4] for card in hand]
+        key = tuple(sorted(permuted))
+        if best is None or key < best[0]:
+            best = (key, permuted)
+    return best
+
+
+def hold_values(hand) -> list[tuple[list[bool], float]]:
+    """
+    Returns the expected payout, per unit bet, of every hold pattern of `hand`, best first.
+    """
+    canonical, permuted = _canonicalize(hand)
+    values = _canonical_hold_values(canonical)
+    positions = [canonical.index(card) for card in permuted]
+    results = [
+        ([pattern[position] for position in positions], value) for pattern, value in zip(HOLD_PATTERNS, values)
+    ]
+    results.sort(key=lambda result: result[1], reverse=True)
+    return results
+
+
+def best_hold(hand) -> tuple[list[bool], float]:
+    """
+    Returns the hold pattern of `hand` with the highest expected payout, and that payout.
+    """
+    return hold_values(hand)[0]
+
+
+def estimate_return(hands: int, seed=None) -> tuple[float, float]:
+    """
+    Estimates the return of the pay table with optimal holds over `hands` random deals.
+    Returns the mean payout per unit bet and its standard error.
+    """
+    rng = random.Random(seed)
+    values = np.array([best_hold(rng.sample(DECK, 5))[1] for _ in range(hands)])
+    return float(values.mean()), float(values.std(ddof=1) / np.sqrt(len(values))) if len(values) > 1 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimates the video poker return with optimal holds.")
+    parser.add_argument("--hands", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    mean, error = estimate_return(args.hands, seed=args.seed)
+    print(f"Return with optimal holds over {args.hands} deals: {mean:.4f} +/- {1.96 * error:.4f} (95%)")
+
+
+if __name__ == "__main__":
+    main()
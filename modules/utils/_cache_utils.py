@@ -0,0 +1,256 @@
+"""
+Module Documentation: Cache Utils
+
+This module provides small in-process caches used on the bot's hot paths (message handling,
+command checks) so that they do not need a database round trip once warm.
+
+1. LRUCache(maxsize: int)
+   A bounded mapping that evicts the least recently used entry once `maxsize` is exceeded.
+   - get(key, default=None): Returns the cached value and marks it as recently used.
+     Counts a hit or a miss.
+   - put(key, value): Inserts or replaces a value, evicting the oldest entry if needed.
+   - invalidate(key): Removes a single entry, if present.
+   - clear(): Removes every entry and resets the counters.
+   - stats: Dictionary with size, maxsize, hits, misses and evictions, for debugging/metrics.
+
+2. TTLCache(maxsize: int, ttl: float)
+   An LRUCache whose entries also expire `ttl` seconds after they were put.
+   - Expired entries count as misses and are dropped when read. `stats` adds ttl and expirations.
+
+3. CommandRestrictions(channels=(), roles=())
+   Immutable channels and roles (frozensets) a command is restricted to within a guild.
+   - allows(channel_id, role_ids): Returns `(channel_allowed, role_allowed)`, costing one set lookup
+     and one role-set intersection regardless of how many restrictions exist.
+   - NO_RESTRICTIONS is the shared, empty instance returned for unrestricted commands.
+
+4. CommandRestrictionIndex()
+   In-memory index of every command restriction, keyed by `(guild_id, command_name)`.
+   - get(guild_id, command_name): O(1) lookup, returns NO_RESTRICTIONS when the command is unrestricted.
+   - load(rows): Rebuilds the index from `(guild_id, command_name, restriction_type, restriction_target)` rows.
+   - add(...)/remove(...): Keeps the index in sync with the restrict/unrestrict commands.
+"""
+import time
+
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class LRUCache:
+    def __init__(self, maxsize: int) -> None:
+        """
+        Constructor for the LRUCache class.
+        Parameters:
+            - maxsize (int): Maximum number of entries kept before the least recently used one is evicted.
+        """
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the value cached for `key`, or `default` if it is not cached.
+        - Marks the entry as recently used and counts a hit or a miss.
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Caches `value` under `key`, evicting the least recently used entry if the cache is full.
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Removes `key` from the cache, if present.
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Removes every entry and resets the counters.
+        """
+        self._data.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def stats(self) -> dict:
+        """
+        Returns the cache counters, useful to confirm the hot path is served from memory.
+        """
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"LRUCache({self.stats})"
+
+
+class TTLCache(LRUCache):
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """
+        Constructor for the TTLCache class.
+        Parameters:
+            - maxsize (int): Maximum number of entries kept before the least recently used one is evicted.
+            - ttl (float): Seconds an entry stays valid after being put.
+        """
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the value cached for `key`, or `default` if it is not cached or has expired.
+        """
+        entry = super().get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.hits -= 1
+            self.misses += 1
+            self.expirations += 1
+            return default
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Caches `value` under `key` for `ttl` seconds, evicting the least recently used entry if the cache is full.
+        """
+        super().put(key, (time.monotonic() + self.ttl, value))
+
+    def clear(self) -> None:
+        super().clear()
+        self.expirations = 0
+
+    @property
+    def stats(self) -> dict:
+        return {**super().stats, "ttl": self.ttl, "expirations": self.expirations}
+
+    def __repr__(self) -> str:
+        return f"TTLCache({self.stats})"
+
+
+class CommandRestrictions:
+    __slots__ = ("channels", "roles")
+
+    def __init__(self, channels=(), roles=()) -> None:
+        """
+        Constructor for the CommandRestrictions class.
+        Parameters:
+            - channels: IDs of the channels the command is restricted to.
+            - roles: IDs of the roles the command is restricted to.
+        """
+        self.channels: frozenset[int] = frozenset(channels)
+        self.roles: frozenset[int] = frozenset(roles)
+
+    def allows(self, channel_id: int, role_ids) -> tuple[bool, bool]:
+        """
+        Evaluates the restrictions for an invocation.
+        Parameters:
+            - channel_id (int): ID of the channel the command was invoked in.
+            - role_ids: Iterable with the IDs of the invoking member's roles.
+        Returns:
+            - (tuple[bool, bool]): Whether the channel and the member's roles are allowed.
+        """
+        channel_allowed = not self.channels or channel_id in self.channels
+        role_allowed = not self.roles or not self.roles.isdisjoint(role_ids)
+        return channel_allowed, role_allowed
+
+    def __bool__(self) -> bool:
+        return bool(self.channels or self.roles)
+
+    def __repr__(self) -> str:
+        return f"CommandRestrictions(channels={set(self.channels)!r}, roles={set(self.roles)!r})"
+
+
+NO_RESTRICTIONS = CommandRestrictions()
+
+
+class CommandRestrictionIndex:
+    def __init__(self) -> None:
+        """
+        Constructor for the CommandRestrictionIndex class.
+        - The index starts empty and is filled by `load` at startup.
+        """
+        self._index: dict[tuple[int, str], CommandRestrictions] = {}
+
+    def get(self, guild_id: int, command_name: str) -> CommandRestrictions:
+        """
+        Returns the restrictions of a command in a guild, or NO_RESTRICTIONS if it has none.
+        """
+        return self._index.get((guild_id, command_name), NO_RESTRICTIONS)
+
+    def load(self, rows) -> None:
+        """
+        Rebuilds the index from `(guild_id, command_name, restriction_type, restriction_target)` rows.
+        """
+        grouped: dict[tuple[int, str], tuple[set, set]] = {}
+        for guild_id, command_name, restriction_type, restriction_target in rows:
+            channels, roles = grouped.setdefault((guild_id, command_name), (set(), set()))
+            if restriction_type == "channel":
+                channels.add(restriction_target)
+            elif restriction_type == "role":
+                roles.add(restriction_target)
+        self._index = {
+            key: CommandRestrictions(channels, roles) for key, (channels, roles) in grouped.items()
+        }
+
+    def add(self, guild_id: int, command_name: str, restriction_type: str, restriction_target: int) -> None:
+        """
+        Restricts a command to a channel or a role, replacing the command's entry with a rebuilt one.
+        """
+        restrictions = self.get(guild_id, command_name)
+        channels, roles = restrictions.channels, restrictions.roles
+        if restriction_type == "channel":
+            channels = channels | {restriction_target}
+        elif restriction_type == "role":
+            roles = roles | {restriction_target}
+        self._index[(guild_id, command_name)] = CommandRestrictions(channels, roles)
+
+    def remove(self, guild_id: int, command_name: str, restriction_type: str, restriction_target: int) -> None:
+        """
+        Removes a channel or role restriction, dropping the entry once the command is unrestricted.
+        """
+        restrictions = self._index.get((guild_id, command_name))
+        if restrictions is None:
+            return
+        channels, roles = restrictions.channels, restrictions.roles
+        if restriction_type == "channel":
+            channels = channels - {restriction_target}
+        elif restriction_type == "role":
+            roles = roles - {restriction_target}
+        restrictions = CommandRestrictions(channels, roles)
+        if restrictions:
+            self._index[(guild_id, command_name)] = restrictions
+        else:
+            del self._index[(guild_id, command_name)]
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        return f"CommandRestrictionIndex({self._index!r})"
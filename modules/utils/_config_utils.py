@@ -41,69 +41,52 @@ Class Methods:
 
 
 from discord.ext import commands
-from sqlalchemy import select, insert
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, func
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from modules.utils._database_utils import get_session
+from modules.utils._cache_utils import CommandRestrictionIndex
 from modules.orm.database import Command, CommandRestriction
 
 
-from sqlalchemy.future import select
-from discord.ext import commands
-from sqlalchemy.exc import IntegrityError
+async def load_command_restrictions(index: CommandRestrictionIndex) -> None:
+    """
+    Loads every command restriction into `index` with a single joined query on
+    `commands` and `command_restrictions`.
+    """
+    stmt = select(
+        Command.guild_id,
+        Command.command_name,
+        CommandRestriction.restriction_type,
+        CommandRestriction.restriction_target,
+    ).join(CommandRestriction, CommandRestriction.command_id == Command.command_id)
+    async with get_session() as session:
+        result = await session.execute(stmt)
+        index.load(result.all())
+
+
+async def get_or_create_command_id(session: AsyncSession, guild_id: int, command_name: str) -> int:
+    """
+    Returns the `command_id` of a guild's command, creating its row if needed, in a single
+    `INSERT ... ON DUPLICATE KEY UPDATE command_id = LAST_INSERT_ID(command_id)` round trip.
+    Rows are only needed by restrictions, so this is only called when a command gets restricted.
+    """
+    stmt = insert(Command).values(guild_id=guild_id, command_name=command_name)
+    stmt = stmt.on_duplicate_key_update(command_id=func.last_insert_id(Command.command_id))
+    result = await session.execute(stmt)
+    return result.lastrowid
 
-from sqlalchemy.future import select
-from discord.ext import commands
-from sqlalchemy.exc import IntegrityError
 
 async def is_command_allowed(command_name: str, bot: commands.Bot, ctx: commands.Context):
-    guild_id = ctx.guild.id
-    channel_id = ctx.channel.id
-    user_roles = [role.id for role in ctx.author.roles]
-    
-    command_restrictions = bot.restricted_commands_cache.get(guild_id, {}).get(command_name, None)
-
-    if command_restrictions:
-        channels = command_restrictions.get('channels', [])
-        roles = command_restrictions.get('roles', [])
-
-    else:
-        async with get_session() as session:
-            # Query to find or insert the command in the database
-            stmt = select(Command).where(
-                Command.guild_id == ctx.guild.id,
-                Command.command_name == command_name
-            )
-            result = await session.execute(stmt)
-            command = result.scalars().first()
-
-            if not command:
-                new_command = Command(guild_id=ctx.guild.id, command_name=command_name)
-                session.add(new_command)
-                await session.commit()
-                command = new_command
-
-            stmt = select(CommandRestriction).where(
-                CommandRestriction.command_id == command.command_id
-            )
-
-            restrictions = await session.execute(stmt)
-            restrictions = restrictions.scalars().all()
-
-            channels, roles = [], []
-            for restriction in restrictions:
-                if restriction.restriction_type == 'channel':
-                    channels.append(restriction.restriction_target)
-                elif restriction.restriction_type == 'role':
-                    roles.append(restriction.restriction_target)
-                    
-            if guild_id not in bot.restricted_commands_cache:
-                bot.restricted_commands_cache[guild_id] = {}
-
-            bot.restricted_commands_cache[guild_id][command_name] = {'channels': channels, 'roles': roles}
-
-    channel_allowed = channel_id in channels if channels else True
-    role_allowed = any(role_id in roles for role_id in user_roles) if roles else True    
+    """
+    Checks the command restrictions of the invoking guild, served entirely from the
+    in-memory restriction index loaded at startup.
+    """
+    command_restrictions = bot.restricted_commands_cache.get(ctx.guild.id, command_name)
+    channel_allowed, role_allowed = command_restrictions.allows(
+        ctx.channel.id, (role.id for role in ctx.author.roles)
+    )
 
     if channel_allowed and role_allowed:
         return True
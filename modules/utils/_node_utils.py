@@ -0,0 +1,237 @@
+"""
+Module Documentation: Node Utils
+
+This module spreads the players of the bot over the Lavalink nodes of `config.lavalink.nodes`.
+
+Nodes are scored with the penalties of the Lavalink clients: the number of playing players, an exponential
+penalty on the system CPU load and on the frames Lavalink failed to send or sent empty. Lavalink's stats
+messages do not name their node, so the stats are fetched from each node every `stats_interval` seconds.
+
+1. node_penalty(node, stats, placed): Returns the load score of a node, lower is better.
+
+2. NodeBalancer(interval: float, cpu_load: float, frame_deficit: float)
+   - best_node(exclude): Returns the connected and healthy node with the lowest penalty, counting the players
+     placed on each node since its stats were fetched.
+   - player(client, channel): Player factory for `connect(cls=...)`, placing the player on the best node.
+   - refresh(): Fetches the stats of every node, marks the degraded ones and moves their players away.
+   - evacuate(node, disconnected): Moves the players of `node` to the best other node, disconnecting those that can not be moved.
+     A degraded node that did not disconnect only sheds players while another node is less loaded.
+   - start(client)/stop(): Start and stop the background task refreshing the node stats.
+   - stats: Dictionary with the status, players, load and penalty of every node.
+
+3. node_balancer
+   The NodeBalancer shared by the bot, configured by `config.lavalink`.
+"""
+import asyncio
+import logging
+
+import discord
+import wavelink
+
+from modules.globals import config
+
+# Lavalink sends 50 frames per second, its frame stats are averages per player and per minute.
+FRAMES_PER_MINUTE = 3000
+
+
+def node_penalty(node: wavelink.Node, stats: wavelink.StatsResponsePayload | None, placed: int = 0) -> float:
+    """
+    Returns the load score of a node, lower is better.
+    Parameters:
+        - node (wavelink.Node): The node to score.
+        - stats (wavelink.StatsResponsePayload | None): The last stats fetched from the node, None if there are none yet.
+        - placed (int): Players placed on the node since the stats were fetched.
+    """
+    if stats is None:
+        return float(len(node.players) + placed)
+    penalty = stats.playing + placed
+    penalty += 1.05 ** (100 * stats.cpu.system_load) * 10 - 10
+    if stats.frames is not None:
+        penalty += 1.03 ** (500 * stats.frames.deficit / FRAMES_PER_MINUTE) * 600 - 600
+        penalty += (1.03 ** (500 * stats.frames.nulled / FRAMES_PER_MINUTE) * 300 - 300) * 2
+    return penalty
+
+
+class NodeBalancer:
+    def __init__(self, interval: float, cpu_load: float, frame_deficit: float) -> None:
+        """
+        Constructor for the NodeBalancer class.
+        Parameters:
+            - interval (float): Seconds between two fetches of the node stats.
+            - cpu_load (float): Lavalink CPU load, between 0 and 1, from which a node is degraded.
+            - frame_deficit (float): Share of missing frames from which a node is degraded.
+        """
+        self.interval = interval
+        self.cpu_load = cpu_load
+        self.frame_deficit = frame_deficit
+        self.node_stats: dict[str, wavelink.StatsResponsePayload] = {}
+        self.placed: dict[str, int] = {}
+        self.degraded: set[str] = set()
+        self.migrations = 0
+        self.client: discord.Client | None = None
+        self._task: asyncio.Task | None = None
+
+    @staticmethod
+    def nodes() -> list[wavelink.Node]:
+        return list(wavelink.Pool.nodes.values())
+
+    def is_healthy(self, node: wavelink.Node) -> bool:
+        return node.status is wavelink.NodeStatus.CONNECTED and node.identifier not in self.degraded
+
+    def penalty(self, node: wavelink.Node) -> float:
+        return node_penalty(node, self.node_stats.get(node.identifier), self.placed.get(node.identifier, 0))
+
+    def best_node(self, exclude: wavelink.Node | None = None) -> wavelink.Node | None:
+        """
+        Returns the healthy node with the lowest penalty, or the least loaded connected one if all are degraded.
+        Returns None if no node other than `exclude` is connected.
+        """
+        candidates = [
+            node for node in self.nodes()
+            if node.status is wavelink.NodeStatus.CONNECTED and node is not exclude
+        ]
+        if not candidates:
+            return None
+        healthy = [node for node in candidates if node.identifier not in self.degraded]
+        return min(healthy or candidates, key=self.penalty)
+
+    def player(self, client: discord.Client, channel: discord.abc.Connectable) -> wavelink.Player:
+        """
+        Creates a player on the best node. Passed to `connect(cls=...)` in place of the Player class.
+        """
+        node = self.best_node()
+        if node is None:
+            # Let wavelink raise its own error when no node is connected.
+            return wavelink.Player(client, channel)
+        self.placed[node.identifier] = self.placed.get(node.identifier, 0) + 1
+        return wavelink.Player(client, channel, nodes=[node])
+
+    def players_on(self, node: wavelink.Node) -> list[wavelink.Player]:
+        """
+        Returns the players of `node`. Wavelink forgets them when the node disconnects, the voice clients do not.
+        """
+        if self.client is None:
+            return []
+        return [
+            player for player in self.client.voice_clients
+            if isinstance(player, wavelink.Player) and player.node.identifier == node.identifier
+        ]
+
+    async def refresh(self) -> None:
+        """
+        Fetches the stats of every connected node, updates the degraded nodes and moves the players off them.
+        """
+        for node in self.nodes():
+            if node.status is not wavelink.NodeStatus.CONNECTED:
+                self.node_stats.pop(node.identifier, None)
+                continue
+            try:
+                stats = await node.fetch_stats()
+            except Exception:
+                logging.exception("Failed to fetch the stats of Lavalink node %s", node.identifier)
+                self.degraded.add(node.identifier)
+                continue
+            self.node_stats[node.identifier] = stats
+            self.placed[node.identifier] = 0
+            if self.is_degraded(stats):
+                if node.identifier not in self.degraded:
+                    logging.warning("Lavalink node %s is degraded: %s", node.identifier, self.describe(stats))
+                self.degraded.add(node.identifier)
+            else:
+                self.degraded.discard(node.identifier)
+
+        for node in self.nodes():
+            if node.identifier in self.degraded and any(self.is_healthy(other) for other in self.nodes()):
+                await self.evacuate(node)
+
+    def is_degraded(self, stats: wavelink.StatsResponsePayload) -> bool:
+        if stats.cpu.lavalink_load >= self.cpu_load:
+            return True
+        return stats.frames is not None and stats.frames.deficit / FRAMES_PER_MINUTE >= self.frame_deficit
+
+    @staticmethod
+    def describe(stats: wavelink.StatsResponsePayload) -> str:
+        deficit = stats.frames.deficit if stats.frames is not None else 0
+        return f"{stats.playing} playing, {stats.cpu.lavalink_load:.0%} CPU, {deficit} missing frames/min"
+
+    async def evacuate(self, node: wavelink.Node, disconnected: bool = False) -> None:
+        """
+        Moves every player of `node` to the best other node. Players that fail to move are disconnected,
+        as wavelink leaves them in a stale state.
+        Parameters:
+            - node (wavelink.Node): The node that disconnected or degraded.
+            - disconnected (bool): Whether the node lost its connection, in which case every player is moved.
+        """
+        for player in self.players_on(node):
+            target = self.best_node(exclude=node)
+            if target is None:
+                logging.warning("No Lavalink node to move the players of %s to", node.identifier)
+                return
+            # A degraded node only sheds players while another node is less loaded than itself.
+            if not disconnected and self.penalty(target) >= self.penalty(node):
+                return
+            try:
+                await player.switch_node(target)
+            except Exception:
+                logging.exception("Failed to move guild %s from %s to %s", player.guild.id, node.identifier, target.identifier)
+                await player.disconnect()
+                continue
+            self.placed[target.identifier] = self.placed.get(target.identifier, 0) + 1
+            self.placed[node.identifier] = self.placed.get(node.identifier, 0) - 1
+            self.migrations += 1
+            logging.info("Moved guild %s from Lavalink node %s to %s", player.guild.id, node.identifier, target.identifier)
+
+    def start(self, client: discord.Client) -> None:
+        """
+        Starts the background task refreshing the node stats.
+        """
+        self.client = client
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stops the background task.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logging.exception("Failed to refresh the Lavalink node stats")
+
+    @property
+    def stats(self) -> dict:
+        """
+        Returns the status, players, CPU load and penalty of every node, and the number of players moved.
+        """
+        stats = {"migrations": self.migrations}
+        for node in self.nodes():
+            node_stats = self.node_stats.get(node.identifier)
+            stats[node.identifier] = {
+                "status": node.status.name,
+                "degraded": node.identifier in self.degraded,
+                "players": len(node.players),
+                "cpu": round(node_stats.cpu.lavalink_load, 2) if node_stats else None,
+                "penalty": round(self.penalty(node), 1),
+            }
+        return stats
+
+    def __repr__(self) -> str:
+        return f"NodeBalancer({self.stats})"
+
+
+node_balancer = NodeBalancer(
+    interval=config.lavalink.stats_interval,
+    cpu_load=config.lavalink.degraded_cpu_load,
+    frame_deficit=config.lavalink.degraded_frame_deficit,
+)
@@ -0,0 +1,159 @@
+"""
+Module Documentation: Prefetch Utils
+
+This module resolves the upcoming tracks of a player while the current one plays, so that the next song
+starts without the lookup Lavalink would otherwise run when it is played.
+
+Spotify tracks are played by LavaSrc through a YouTube mirror found when the track starts, with the providers
+of application.yml: `ytsearch:"<ISRC>"`, then `ytsearch:<title> <author>`. The prefetcher runs the same
+searches ahead of time (through the track search cache) and plays the mirror directly.
+
+1. TrackPrefetcher(depth: int, cache_size: int, samples: int)
+   - schedule(player): Resolves the mirrors of the next `depth` queued Spotify tracks in the background,
+     replacing the player's previous prefetch.
+   - next_track(player): Takes the next track out of the queue, swapped for its mirror when it was prefetched.
+   - original(player, track): Returns the queued track a mirror was played for, to display it instead.
+   - start_transition(player)/end_transition(player): Time the gap between the end of a track and the start
+     of the next one.
+   - stats: Dictionary with the mirror cache counters and the transition latencies, prefetched or not.
+
+2. track_prefetcher
+   The TrackPrefetcher shared by the bot, sized by `config.music`.
+"""
+import asyncio
+import logging
+import statistics
+import time
+
+from collections import deque
+
+import wavelink
+
+from modules.globals import config
+from modules.utils._cache_utils import LRUCache
+from modules.utils._search_utils import track_search_cache
+
+
+def mirror_queries(track: wavelink.Playable) -> list[str]:
+    """
+    Returns the searches LavaSrc would run to find the YouTube mirror of a Spotify track, in order.
+    """
+    queries = [f'ytsearch:"{track.isrc}"'] if track.isrc else []
+    queries.append(f"ytsearch:{track.title} {track.author}")
+    return queries
+
+
+class TrackPrefetcher:
+    def __init__(self, depth: int, cache_size: int, samples: int) -> None:
+        """
+        Constructor for the TrackPrefetcher class.
+        Parameters:
+            - depth (int): Number of queued tracks resolved ahead of the current one.
+            - cache_size (int): Number of mirrors kept, by Spotify track.
+            - samples (int): Number of recent transitions the latency statistics are computed on.
+        """
+        self.depth = depth
+        self.mirrors = LRUCache(maxsize=cache_size)
+        self.transitions = {"prefetched": deque(maxlen=samples), "cold": deque(maxlen=samples)}
+        self._tasks: dict[int, asyncio.Task] = {}
+
+    def schedule(self, player: wavelink.Player) -> None:
+        """
+        Starts resolving the next queued tracks of `player`, cancelling the prefetch it replaces.
+        """
+        guild_id = player.guild.id
+        previous = self._tasks.get(guild_id)
+        if previous is not None and not previous.done():
+            previous.cancel()
+        task = self._tasks[guild_id] = asyncio.create_task(self._prefetch(player))
+        task.add_done_callback(lambda done: self._tasks.pop(guild_id) if self._tasks.get(guild_id) is done else None)
+
+    async def _prefetch(self, player: wavelink.Player) -> None:
+        for track in player.queue[:self.depth]:
+            if track.source != "spotify" or track.identifier in self.mirrors:
+                continue
+            try:
+                mirror = await self.resolve_mirror(track)
+            except Exception:
+                logging.exception("Failed to prefetch %s", track)
+                continue
+            if mirror is not None:
+                self.mirrors.put(track.identifier, mirror.raw_data)
+
+    async def resolve_mirror(self, track: wavelink.Playable) -> wavelink.Playable | None:
+        """
+        Returns the YouTube mirror of a Spotify track, or None if none was found.
+        """
+        for query in mirror_queries(track):
+            results = await track_search_cache.search(query)
+            if results:
+                return results[0]
+        return None
+
+    def next_track(self, player: wavelink.Player) -> wavelink.Playable:
+        """
+        Takes the next track out of the queue, swapped for its prefetched mirror if there is one.
+        """
+        track = player.queue.get()
+        mirror = self.mirrors.get(track.identifier) if track.source == "spotify" else None
+        player.transition_prefetched = mirror is not None
+        if mirror is None:
+            return track
+        mirrored = wavelink.Playable(mirror)
+        # Added to, never replaced, so a mirror skipped before it started does not lose the next one's track.
+        mirrored_tracks = getattr(player, "mirrored_tracks", None)
+        if mirrored_tracks is None:
+            mirrored_tracks = player.mirrored_tracks = {}
+        mirrored_tracks[mirrored.encoded] = track
+        return mirrored
+
+    @staticmethod
+    def original(player: wavelink.Player, track: wavelink.Playable) -> wavelink.Playable:
+        """
+        Returns the queued track `track` was played as a mirror of, or `track` itself, removing it from the mapping.
+        """
+        return getattr(player, "mirrored_tracks", {}).pop(track.encoded, track)
+
+    @staticmethod
+    def start_transition(player: wavelink.Player) -> None:
+        player.transition_started = time.monotonic()
+
+    def end_transition(self, player: wavelink.Player) -> None:
+        """
+        Records the time since `start_transition`, if a transition was started.
+        """
+        started = getattr(player, "transition_started", None)
+        if started is None:
+            return
+        player.transition_started = None
+        kind = "prefetched" if getattr(player, "transition_prefetched", False) else "cold"
+        self.transitions[kind].append(time.monotonic() - started)
+
+    @property
+    def stats(self) -> dict:
+        """
+        Returns the mirror cache counters and, for prefetched and cold transitions, their count and latency in ms.
+        """
+        stats = {"mirrors": self.mirrors.stats}
+        for kind, samples in self.transitions.items():
+            if len(samples) < 2:
+                stats[kind] = {"count": len(samples)}
+                continue
+            latencies = sorted(sample * 1000 for sample in samples)
+            stats[kind] = {
+                "count": len(latencies),
+                "mean_ms": round(statistics.fmean(latencies), 1),
+                "p95_ms": round(statistics.quantiles(latencies, n=20, method="inclusive")[-1], 1),
+                "max_ms": round(latencies[-1], 1),
+            }
+        return stats
+
+    def __repr__(self) -> str:
+        return f"TrackPrefetcher({self.stats})"
+
+
+track_prefetcher = TrackPrefetcher(
+    depth=config.music.prefetch_depth,
+    cache_size=config.music.prefetch_cache_size,
+    samples=config.music.transition_samples,
+)
@@ -0,0 +1,387 @@
+"""
+Module Documentation: Search Utils
+
+This module routes music queries to a Lavalink search source and caches what they resolve to, so that
+popular tracks and playlists are not searched again for every guild that plays them.
+
+1. resolve_query(query: str) -> tuple[str | None, str]
+   Splits a `p!play` query into the search source and the term to search:
+   - URLs are loaded as they are (source None).
+   - "music:" searches YouTube Music, "speak:"/"tts:" uses text to speech, "ytsearch:"/"yt:" searches YouTube.
+   - "spotify:" and plain queries search Spotify.
+
+2. TrackStore(max_entries: int, ttl: float, flush_interval: float, eviction_interval: float)
+   Search results persisted in the `track_cache` table, so they survive restarts.
+   - get(key): Returns the stored payload of a search, or None if it is missing or older than `ttl`.
+   - put(key, payload)/played(key): Queue a new search and mark a search as played. Both are written
+     by the background task with one upsert and one update.
+   - evict(): Deletes the least recently played searches beyond `max_entries`.
+   - start()/stop(): Creates the table if needed and starts the background task, and stops it after a final flush.
+     If the table can not be created, the store stays disabled and every search goes to Lavalink.
+
+3. TrackSearchCache(maxsize: int, ttl: float, store: TrackStore | None = None)
+   TTL and LRU cache of search results in front of `wavelink.Playable.search`, backed by a TrackStore.
+   - search(query): Returns a `wavelink.Search` for the query, from memory or the store when possible.
+     Identical searches running at the same time share a single lookup.
+   - stats: Dictionary with the cache counters, the store hits, the Lavalink requests, the shared requests
+     and the hit rate.
+   Results are kept as raw Lavalink payloads and rebuilt on every hit, so no two players share a track object.
+   A single track is also cached under its URI, so playing its link later does not search it again.
+
+4. track_store / track_search_cache
+   The TrackStore and TrackSearchCache shared by the bot, sized by `config.cache`.
+"""
+import asyncio
+import datetime
+import hashlib
+import logging
+import time
+
+import wavelink
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.mysql import insert
+
+from modules.globals import config
+from modules.orm.database import Base, TrackCache
+from modules.utils._cache_utils import TTLCache
+from modules.utils._database_utils import engine, get_session
+
+QUERY_PREFIXES = {
+    "music:": "ytmsearch:",
+    "spotify:": "spsearch:",
+    "speak:": "speak:",
+    "tts:": "speak:",
+    "ytsearch:": "ytsearch:",
+    "yt:": "ytsearch:",
+}
+DEFAULT_SOURCE = "spsearch:"
+# Sources whose results do not depend on the case or spacing of the term.
+SEARCH_SOURCES = {"spsearch:", "ytsearch:", "ytmsearch:"}
+
+
+def resolve_query(query: str) -> tuple[str | None, str]:
+    """
+    Returns the source and the term a query is searched with.
+    """
+    if query.startswith("http"):
+        return None, query
+    for prefix, source in QUERY_PREFIXES.items():
+        if query.startswith(prefix):
+            return source, query.split(":", 1)[1]
+    return DEFAULT_SOURCE, query
+
+
+def search_key(source: str | None, term: str) -> tuple[str | None, str]:
+    """
+    Returns the cache key of a search, so that "Ocean  Drive" and "ocean drive" share their results.
+    """
+    if source in SEARCH_SOURCES:
+        return source, " ".join(term.split()).casefold()
+    return source, term.strip()
+
+
+def hash_key(key: tuple[str | None, str]) -> str:
+    """
+    Returns the fixed size id a search is stored under.
+    """
+    source, term = key
+    return hashlib.sha1(f"{source or ''}\x00{term}".encode()).hexdigest()
+
+
+def to_payload(tracks: wavelink.Search) -> tuple:
+    """
+    Returns the raw Lavalink data of a search result.
+    """
+    if isinstance(tracks, wavelink.Playlist):
+        plugin = {"type": tracks.type, "url": tracks.url, "artworkUrl": tracks.artwork, "author": tracks.author}
+        return "playlist", {
+            "info": {"name": tracks.name, "selectedTrack": tracks.selected},
+            "pluginInfo": {key: value for key, value in plugin.items() if value is not None},
+            "tracks": [track.raw_data for track in tracks.tracks],
+        }
+    return "tracks", [track.raw_data for track in tracks]
+
+
+def from_payload(payload: tuple) -> wavelink.Search:
+    """
+    Builds new track objects from the raw data returned by `to_payload`.
+    """
+    kind, data = payload
+    if kind == "playlist":
+        return wavelink.Playlist(data)
+    return [wavelink.Playable(track) for track in data]
+
+
+def utc_now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class TrackStore:
+    def __init__(self, max_entries: int, ttl: float, flush_interval: float, eviction_interval: float) -> None:
+        """
+        Constructor for the TrackStore class.
+        Parameters:
+            - max_entries (int): Number of stored searches kept by `evict`.
+            - ttl (float): Seconds a stored search is reused.
+            - flush_interval (float): Seconds between two background writes.
+            - eviction_interval (float): Seconds between two background evictions.
+        """
+        self.max_entries = max_entries
+        self.ttl = datetime.timedelta(seconds=ttl)
+        self.flush_interval = flush_interval
+        self.eviction_interval = eviction_interval
+        self._pending: dict[str, tuple] = {}
+        self._played: set[str] = set()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._ready = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, key: tuple) -> tuple | None:
+        """
+        Returns the stored payload of a search and marks it as played, or None if it is missing or expired.
+        - Database errors are logged and treated as a miss, so music keeps working without the store.
+        """
+        if not self._ready:
+            return None
+        key_hash = hash_key(key)
+        # Searches resolved since the last flush are served before they reach the table.
+        payload = self._pending.get(key_hash)
+        if payload is None:
+            try:
+                async with get_session() as session:
+                    row = (await session.execute(
+                        select(TrackCache.kind, TrackCache.payload, TrackCache.resolved_at)
+                        .where(TrackCache.key_hash == key_hash)
+                    )).first()
+            except Exception:
+                logging.exception("Failed to read the track store")
+                return None
+            # DATETIME columns come back naive, they hold UTC.
+            if row is None or row.resolved_at.replace(tzinfo=datetime.timezone.utc) < utc_now() - self.ttl:
+                self.misses += 1
+                return None
+            payload = row.kind, row.payload
+        self.hits += 1
+        self._played.add(key_hash)
+        return payload
+
+    def put(self, key: tuple, payload: tuple) -> None:
+        """
+        Queues a resolved search to be stored by the next flush.
+        """
+        if self._ready:
+            self._pending[hash_key(key)] = payload
+
+    def played(self, key: tuple) -> None:
+        """
+        Marks a search as played, so eviction keeps it.
+        """
+        if self._ready:
+            self._played.add(hash_key(key))
+
+    async def flush(self) -> None:
+        """
+        Writes the queued searches with a single upsert and the played ones with a single update.
+        Failed writes are kept for the next flush.
+        """
+        async with self._flush_lock:
+            if not self._pending and not self._played:
+                return
+            pending, self._pending = self._pending, {}
+            played, self._played = self._played - pending.keys(), set()
+            now = utc_now()
+            try:
+                async with get_session() as session:
+                    if pending:
+                        stmt = insert(TrackCache).values([
+                            {"key_hash": key_hash, "kind": kind, "payload": data, "resolved_at": now, "last_played": now}
+                            for key_hash, (kind, data) in pending.items()
+                        ])
+                        await session.execute(stmt.on_duplicate_key_update(
+                            kind=stmt.inserted.kind,
+                            payload=stmt.inserted.payload,
+                            resolved_at=stmt.inserted.resolved_at,
+                            last_played=stmt.inserted.last_played,
+                        ))
+                    if played:
+                        await session.execute(
+                            update(TrackCache).where(TrackCache.key_hash.in_(played)).values(last_played=now)
+                        )
+                    await session.commit()
+            except Exception:
+                logging.exception("Failed to flush the track store, retrying later")
+                self._pending = {**pending, **self._pending}
+                self._played |= played
+
+    async def evict(self) -> None:
+        """
+        Deletes the searches played less recently than the `max_entries` most recently played ones.
+        """
+        async with get_session() as session:
+            cutoff = await session.scalar(
+                select(TrackCache.last_played)
+                .order_by(TrackCache.last_played.desc())
+                .offset(self.max_entries)
+                .limit(1)
+            )
+            if cutoff is None:
+                return
+            result = await session.execute(delete(TrackCache).where(TrackCache.last_played <= cutoff))
+            await session.commit()
+        self.evictions += result.rowcount
+        logging.info("Evicted %s searches from the track store", result.rowcount)
+
+    async def _run(self) -> None:
+        evicted_at = time.monotonic()
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+            if time.monotonic() - evicted_at >= self.eviction_interval:
+                evicted_at = time.monotonic()
+                try:
+                    await self.evict()
+                except Exception:
+                    logging.exception("Failed to evict from the track store")
+
+    async def start(self) -> None:
+        """
+        Creates the `track_cache` table if it does not exist and starts the background task.
+        - Database errors are logged and leave the store disabled, so searches go straight to Lavalink.
+        """
+        try:
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all, tables=[TrackCache.__table__])
+        except Exception:
+            logging.exception("Failed to create the track_cache table, searches will not be persisted")
+            return
+        self._ready = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stops the background task and writes whatever is still queued.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "pending": len(self._pending),
+            "evictions": self.evictions,
+        }
+
+    def __repr__(self) -> str:
+        return f"TrackStore({self.stats})"
+
+
+class TrackSearchCache:
+    def __init__(self, maxsize: int, ttl: float, store: TrackStore | None = None) -> None:
+        """
+        Constructor for the TrackSearchCache class.
+        Parameters:
+            - maxsize (int): Maximum number of searches kept in memory.
+            - ttl (float): Seconds the results of a search are reused from memory.
+            - store (TrackStore | None): Persistent store looked up before Lavalink.
+        """
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.store = store
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self.requests = 0
+        self.shared = 0
+
+    async def search(self, query: str) -> wavelink.Search:
+        """
+        Searches a `p!play` query, returning the cached results if they are still valid.
+        - Raises what `wavelink.Playable.search` raises, for every caller sharing the failed request.
+        """
+        source, term = resolve_query(query)
+        key = search_key(source, term)
+        payload = self.cache.get(key)
+        if payload is not None and self.store is not None:
+            self.store.played(key)
+        if payload is None:
+            task = self._inflight.get(key)
+            if task is None:
+                task = self._inflight[key] = asyncio.create_task(self._fetch(key, source, term))
+            else:
+                self.shared += 1
+            # Shielded, so a caller giving up does not cancel the search for the others.
+            payload = await asyncio.shield(task)
+        return from_payload(payload)
+
+    async def _fetch(self, key: tuple, source: str | None, term: str) -> tuple:
+        """
+        Looks a search up in the store, then on Lavalink, and caches the results unless nothing was found.
+        """
+        try:
+            payload = await self.store.get(key) if self.store is not None else None
+            if payload is None:
+                self.requests += 1
+                tracks = await wavelink.Playable.search(term, source=source)
+                payload = to_payload(tracks)
+                if not tracks:
+                    return payload
+                self.persist(key, payload)
+            self.cache.put(key, payload)
+            return payload
+        finally:
+            del self._inflight[key]
+
+    def persist(self, key: tuple, payload: tuple) -> None:
+        """
+        Stores a search resolved by Lavalink, and its first track under its URI.
+        - Only the first track of a search is stored, as it is the one `p!play` queues.
+        """
+        kind, data = payload
+        if kind == "tracks":
+            payload = kind, data[:1]
+            uri = data[0]["info"].get("uri")
+            if uri and key[0] is not None:
+                self.cache.put(search_key(None, uri), payload)
+                if self.store is not None:
+                    self.store.put(search_key(None, uri), payload)
+        if self.store is not None:
+            self.store.put(key, payload)
+
+    def clear(self) -> None:
+        self.cache.clear()
+        self.requests = self.shared = 0
+
+    @property
+    def stats(self) -> dict:
+        """
+        Returns the cache counters. `hit_rate` is the share of searches served from the cache.
+        """
+        stats = self.cache.stats
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "store": self.store.stats if self.store is not None else None,
+            "requests": self.requests,
+            "shared": self.shared,
+            "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+        }
+
+    def __repr__(self) -> str:
+        return f"TrackSearchCache({self.stats})"
+
+
+track_store = TrackStore(
+    max_entries=config.cache.track_store_max_entries,
+    ttl=config.cache.track_store_ttl,
+    flush_interval=config.cache.track_store_flush_interval,
+    eviction_interval=config.cache.track_store_eviction_interval,
+)
+track_search_cache = TrackSearchCache(
+    maxsize=config.cache.track_search_max_size, ttl=config.cache.track_search_ttl, store=track_store
+)
@@ -1,5 +1,8 @@
+import re
 import discord
 
+from collections import OrderedDict
+
 from modules.globals import config
 
 from modules.buttons.cassino import CassinoSelect
@@ -8,6 +11,7 @@ from modules.player.blackjack import BlackjackDealer
 from modules.player.video_poker import VideoPokerDealer
 from modules.player.roulette import Roulette
 from modules.player.slots import SlotMachine
+from modules.player.stakes import open_stakes
 
 from modules.buttons.slots.buttons import SlotButton
 from modules.buttons.slots.actions import *
@@ -25,23 +29,118 @@ from modules.buttons.dig_trash.buttons import DigTrashButton
 from modules.buttons.dig_trash.actions import *
 
 
+# Every cassino component has a custom id like "cassino:<member id>:<game>:<control>".
+CASSINO_CUSTOM_ID = re.compile(r"cassino:(?P<member_id>\d+):(?P<game>\w+):(?P<control>[\w-]+)")
+
+
 class CassinoView(discord.ui.View):
-    def __init__(self, *, member: discord.Member, timeout: float | None = 180):
-        super().__init__(timeout=timeout)
+    # Live views by message id, least recently used first. Past `config.fun.cassino_live_views` the oldest
+    # stops listening, and the clicks on its message are handled by `CassinoControl` like those lost in a restart.
+    sessions: OrderedDict[int, "CassinoView"] = OrderedDict()
+
+    def __init__(self, *, member: discord.Member):
+        super().__init__(timeout=None)
         self.member = member
+        self.message: discord.Message | None = None
         self.cassino_player: CassinoPlayer | BlackjackDealer = None
+        self.players: dict[str, CassinoPlayer] = {}
         self.bet: int = None
         
         self.slot_machine: SlotMachine | None = None
         self.bet_multiplier: int = 1
         self.blackjack_dealer: BlackjackDealer | None = None
+        self.dealer: VideoPokerDealer | None = None
         self.roulette = None
+        # Stacked roulette bets by type, None while bets spin one at a time.
+        self.roulette_slip: dict[str, int] | None = None
+        # Components of every game shown so far, with the style, label and disabled state they were built with.
+        self.layouts: dict[str, list[tuple]] = {}
         self.prepare_menu()
 
-    def prepare_menu(self):
+    def bind(self, message: discord.Message):
+        """
+        Attaches the view to its message and drops the least recently used views past `config.fun.cassino_live_views`.
+        """
+        self.message = message
+        CassinoView.sessions[message.id] = self
+        CassinoView.sessions.move_to_end(message.id)
+        while len(CassinoView.sessions) > config.fun.cassino_live_views:
+            _, view = CassinoView.sessions.popitem(last=False)
+            view.stop()
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.message is not None and self.message.id in CassinoView.sessions:
+            CassinoView.sessions.move_to_end(self.message.id)
+        return True
+
+    def component_id(self, game: str, control: str) -> str:
+        return f"cassino:{self.member.id}:{game}:{control}"
+
+    async def load_player(self, key: str, create):
+        """
+        Returns the player kept for `key`, creating it with `create(member)` on first use.
+        """
+        player = self.players.get(key)
+        if player is None:
+            player = self.players[key] = await create(self.member)
+        return player
+
+    def show_layout(self, game: str, build):
+        """
+        Shows the components of `game`. They are built by `build` the first time and reset
+        to their built state afterwards, instead of being created again every round.
+        A round left in flight is forfeited, so its bet is no longer refunded.
+        """
+        if self.message is not None:
+            open_stakes.settle(self.message.id)
         self.clear_items()
+        layout = self.layouts.get(game)
+        if layout is None:
+            build()
+            self.layouts[game] = [
+                (item, getattr(item, "style", None), getattr(item, "label", None), item.disabled)
+                for item in self.children
+            ]
+        else:
+            for item, style, label, disabled in layout:
+                if isinstance(item, discord.ui.Button):
+                    item.style = style
+                    item.label = label
+                item.disabled = disabled
+                self.add_item(item)
+        self.update_bet_buttons()
+
+    def update_bet_buttons(self):
+        """
+        Sets the label and amount of the bet buttons shown to the current bet multiplier.
+        """
+        for item in self.children:
+            control = getattr(item, "custom_id", "").rsplit(":", 1)[-1]
+            if control.startswith("amount-"):
+                chips = int(control.removeprefix("amount-"))
+                item.label = f"${chips}" + "0"*self.bet_multiplier
+                item.action.amount = chips*(10**self.bet_multiplier)
+
+    async def prepare_game(self, game: str):
+        if game == "slots":
+            await self.prepare_slots()
+        elif game == "blackjack":
+            await self.prepare_blackjack()
+        elif game == "roulette":
+            await self.prepare_roulette()
+        elif game == "video_poker":
+            await self.prepare_video_poker()
+        elif game == "dig_trash":
+            await self.prepare_dig_trash()
+        else:
+            self.prepare_menu()
+
+    def prepare_menu(self):
+        self.show_layout("menu", self.build_menu)
+
+    def build_menu(self):
         self.add_item(
-            CassinoSelect()
+            CassinoSelect(custom_id=self.component_id("menu", "select"))
         )
 
     def set_bet(self, bet: int):
@@ -51,13 +150,16 @@ class CassinoView(discord.ui.View):
         return self.cassino_player.bet
 
     async def prepare_dig_trash(self):
-        self.cassino_player = await CassinoPlayer.create(self.member)
-        self.clear_items()
+        self.cassino_player = await self.load_player("cassino", CassinoPlayer.create)
+        self.show_layout("dig_trash", self.build_dig_trash)
+
+    def build_dig_trash(self):
         self.add_item(
             DigTrashButton(
                 style=discord.ButtonStyle.blurple,
                 label="<<",
                 action=DigTrashReturnAction(self),
+                custom_id=self.component_id("dig_trash", "return"),
                 row=0,
             )
         )
@@ -66,20 +168,27 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="Search Trash",
                 action=DigTrashAction(self),
+                custom_id=self.component_id("dig_trash", "search-trash"),
                 row=0,
             )
         )
 
     async def prepare_blackjack(self):
-        self.blackjack_dealer = BlackjackDealer()
-        self.cassino_player = await BlackjackPlayer.create(self.member)
+        if self.blackjack_dealer is None:
+            self.blackjack_dealer = BlackjackDealer()
+        else:
+            self.blackjack_dealer.new_round()
+        self.cassino_player = await self.load_player("blackjack", BlackjackPlayer.create)
+        self.cassino_player.reset_hand()
+        self.show_layout("blackjack", self.build_blackjack)
 
-        self.clear_items()
+    def build_blackjack(self):
         self.add_item(
             BlackjackButton(
                 style=discord.ButtonStyle.grey,
                 label="$1" + "0"*self.bet_multiplier,
                 action=BlackjackBetAction(self, 1*(10**self.bet_multiplier)),
+                custom_id=self.component_id("blackjack", "amount-1"),
                 row=0,
             )
         )
@@ -88,6 +197,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="$2" + "0"*self.bet_multiplier,
                 action=BlackjackBetAction(self, 2*(10**self.bet_multiplier)),
+                custom_id=self.component_id("blackjack", "amount-2"),
                 row=0,
             )
         )
@@ -96,6 +206,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="$3" + "0"*self.bet_multiplier,
                 action=BlackjackBetAction(self, 3*(10**self.bet_multiplier)),
+                custom_id=self.component_id("blackjack", "amount-3"),
                 row=0,
             )
         )
@@ -104,6 +215,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="$4" + "0"*self.bet_multiplier,
                 action=BlackjackBetAction(self, 4*(10**self.bet_multiplier)),
+                custom_id=self.component_id("blackjack", "amount-4"),
                 row=0,
             )
         )
@@ -112,6 +224,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="$5" + "0"*self.bet_multiplier,
                 action=BlackjackBetAction(self, 5*(10**self.bet_multiplier)),
+                custom_id=self.component_id("blackjack", "amount-5"),
                 row=0,
             )
         )
@@ -121,6 +234,7 @@ class CassinoView(discord.ui.View):
                 disabled=True,
                 label="Stand",
                 action=StandAction(self),
+                custom_id=self.component_id("blackjack", "stand"),
                 row=1,
             )
         )
@@ -130,6 +244,7 @@ class CassinoView(discord.ui.View):
                 disabled=True,
                 label="Double",
                 action=DoubleAction(self),
+                custom_id=self.component_id("blackjack", "double"),
                 row=1,
             )
         )
@@ -139,6 +254,7 @@ class CassinoView(discord.ui.View):
                 disabled=True,
                 label="Hit",
                 action=HitAction(self),
+                custom_id=self.component_id("blackjack", "hit"),
                 row=1,
             )
         )
@@ -147,6 +263,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="<<",
                 action=BlackjackReturnAction(self),
+                custom_id=self.component_id("blackjack", "return"),
                 row=2,
             )
         )
@@ -155,6 +272,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="Start",
                 action=StartAction(self),
+                custom_id=self.component_id("blackjack", "start"),
                 row=2,
             )
         )
@@ -163,6 +281,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label=f"/10",
                 action=BlackjackModifyBetAction(self, -1),
+                custom_id=self.component_id("blackjack", "bet-down"),
                 row=2,
             )
         )
@@ -171,20 +290,23 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label=f"x10",
                 action=BlackjackModifyBetAction(self, 1),
+                custom_id=self.component_id("blackjack", "bet-up"),
                 row=2,
             )
         )
 
     async def prepare_slots(self):
-        self.slot_machine = SlotMachine()
-        self.cassino_player = await CassinoPlayer.create(self.member)
+        self.slot_machine = self.slot_machine or SlotMachine()
+        self.cassino_player = await self.load_player("cassino", CassinoPlayer.create)
+        self.show_layout("slots", self.build_slots)
 
-        self.clear_items()
+    def build_slots(self):
         self.add_item(
             SlotButton(
                 style=discord.ButtonStyle.grey,
                 label="$1" + "0"*self.bet_multiplier,
                 action=SlotsBetAction(self, 1*(10**self.bet_multiplier)),
+                custom_id=self.component_id("slots", "amount-1"),
                 row=0,
             )
         )
@@ -193,6 +315,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="$2" + "0"*self.bet_multiplier,
                 action=SlotsBetAction(self, 2*(10**self.bet_multiplier)),
+                custom_id=self.component_id("slots", "amount-2"),
                 row=0,
             )
         )
@@ -201,6 +324,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="$3" + "0"*self.bet_multiplier,
                 action=SlotsBetAction(self, 3*(10**self.bet_multiplier)),
+                custom_id=self.component_id("slots", "amount-3"),
                 row=0,
             )
         )
@@ -209,6 +333,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="$4" + "0"*self.bet_multiplier,
                 action=SlotsBetAction(self, 4*(10**self.bet_multiplier)),
+                custom_id=self.component_id("slots", "amount-4"),
                 row=0,
             )
         )
@@ -217,6 +342,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="$5" + "0"*self.bet_multiplier,
                 action=SlotsBetAction(self, 5*(10**self.bet_multiplier)),
+                custom_id=self.component_id("slots", "amount-5"),
                 row=0,
             )
         )
@@ -225,6 +351,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="<<",
                 action=SlotsReturnAction(self),
+                custom_id=self.component_id("slots", "return"),
                 row=1,
             )
         )
@@ -233,6 +360,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label=f"Prizes",
                 action=DisplayPrizesAction(self),
+                custom_id=self.component_id("slots", "prizes"),
                 row=1,
             )
         )
@@ -241,6 +369,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.red,
                 label=f"{config.emoji.cassino.slots} Spin",
                 action=SpinAction(self),
+                custom_id=self.component_id("slots", "spin"),
                 row=1,
             )
         )
@@ -249,6 +378,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label=f"/10",
                 action=SlotsModifyBetAction(self, -1),
+                custom_id=self.component_id("slots", "bet-down"),
                 row=1,
             )
         )
@@ -257,20 +387,31 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label=f"x10",
                 action=SlotsModifyBetAction(self, 1),
+                custom_id=self.component_id("slots", "bet-up"),
                 row=1,
             )
         )
 
     async def prepare_roulette(self):
-        self.roulette = Roulette()
-        self.cassino_player = await CassinoPlayer.create(self.member)
+        if self.roulette is None:
+            self.roulette = Roulette()
+        else:
+            self.roulette.spin_wheel()
+        self.cassino_player = await self.load_player("cassino", CassinoPlayer.create)
+        self.show_layout("roulette", self.build_roulette)
+        for item in self.children:
+            if isinstance(item, discord.ui.Button) and isinstance(item.action, RouletteSlipAction):
+                item.style = discord.ButtonStyle.green if self.roulette_slip is not None else discord.ButtonStyle.grey
+            elif isinstance(item, discord.ui.Button) and isinstance(item.action, RouletteSpinSlipAction):
+                item.disabled = not self.roulette_slip
 
-        self.clear_items()
+    def build_roulette(self):
         self.add_item(
             RouletteButton(
                 style=discord.ButtonStyle.grey,
                 label="$1" + "0"*self.bet_multiplier,
                 action=RouletteBetAction(self, 1*(10**self.bet_multiplier)),
+                custom_id=self.component_id("roulette", "amount-1"),
                 row=0,
             )
         )
@@ -279,6 +420,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="$2" + "0"*self.bet_multiplier,
                 action=RouletteBetAction(self, 2*(10**self.bet_multiplier)),
+                custom_id=self.component_id("roulette", "amount-2"),
                 row=0,
             )
         )
@@ -287,6 +429,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="$3" + "0"*self.bet_multiplier,
                 action=RouletteBetAction(self, 3*(10**self.bet_multiplier)),
+                custom_id=self.component_id("roulette", "amount-3"),
                 row=0,
             )
         )
@@ -295,6 +438,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="$4" + "0"*self.bet_multiplier,
                 action=RouletteBetAction(self, 4*(10**self.bet_multiplier)),
+                custom_id=self.component_id("roulette", "amount-4"),
                 row=0,
             )
         )
@@ -303,6 +447,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="$5" + "0"*self.bet_multiplier,
                 action=RouletteBetAction(self, 5*(10**self.bet_multiplier)),
+                custom_id=self.component_id("roulette", "amount-5"),
                 row=0,
             )
         )
@@ -311,6 +456,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="1 to 18",
                 action=Bet1to18Action(self),
+                custom_id=self.component_id("roulette", "1-to-18"),
                 row=1,
             )
         )
@@ -319,6 +465,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="Red",
                 action=BetRedAction(self),
+                custom_id=self.component_id("roulette", "red"),
                 row=1,
             )
         )
@@ -327,6 +474,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="Green",
                 action=BetGreenAction(self),
+                custom_id=self.component_id("roulette", "green"),
                 row=1,
             )
         )
@@ -335,6 +483,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="Black",
                 action=BetBlackAction(self),
+                custom_id=self.component_id("roulette", "black"),
                 row=1,
             )
         )
@@ -343,6 +492,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="19 to 36",
                 action=Bet19to36Action(self),
+                custom_id=self.component_id("roulette", "19-to-36"),
                 row=1,
             )
         )
@@ -351,6 +501,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="Even",
                 action=BetEvenAction(self),
+                custom_id=self.component_id("roulette", "even"),
                 row=2,
             )
         )
@@ -359,6 +510,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="1st 12",
                 action=Bet1st12Action(self),
+                custom_id=self.component_id("roulette", "1st-12"),
                 row=2,
             )
         )
@@ -367,6 +519,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="2nd 12",
                 action=Bet2nd12Action(self),
+                custom_id=self.component_id("roulette", "2nd-12"),
                 row=2,
             )
         )
@@ -375,6 +528,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="3rd 12",
                 action=Bet3rd12Action(self),
+                custom_id=self.component_id("roulette", "3rd-12"),
                 row=2,
             )
         )
@@ -383,6 +537,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="Odd",
                 action=BetOddAction(self),
+                custom_id=self.component_id("roulette", "odd"),
                 row=2,
             )
         )
@@ -391,6 +546,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="1st Row",
                 action=Bet1stRowAction(self),
+                custom_id=self.component_id("roulette", "1st-row"),
                 row=3,
             )
         )
@@ -399,6 +555,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="2nd Row",
                 action=Bet2ndRowAction(self),
+                custom_id=self.component_id("roulette", "2nd-row"),
                 row=3,
             )
         )
@@ -407,14 +564,35 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="3rd Row",
                 action=Bet3rdRowAction(self),
+                custom_id=self.component_id("roulette", "3rd-row"),
                 row=3,
             )
         )
+        self.add_item(
+            RouletteButton(
+                style=discord.ButtonStyle.grey,
+                label="Bet Slip",
+                action=RouletteSlipAction(self),
+                custom_id=self.component_id("roulette", "bet-slip"),
+                row=3,
+            )
+        )
+        self.add_item(
+            RouletteButton(
+                style=discord.ButtonStyle.red,
+                label="Spin",
+                action=RouletteSpinSlipAction(self),
+                custom_id=self.component_id("roulette", "spin"),
+                row=3,
+                disabled=True,
+            )
+        )
         self.add_item(
             RouletteButton(
                 style=discord.ButtonStyle.grey,
                 label="<<",
                 action=RouletteReturnAction(self),
+                custom_id=self.component_id("roulette", "return"),
                 row=4,
             )
         )
@@ -423,6 +601,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label=f"/10",
                 action=RouletteModifyBetAction(self, -1),
+                custom_id=self.component_id("roulette", "bet-down"),
                 row=4,
             )
         )
@@ -431,6 +610,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label=f"x10",
                 action=RouletteModifyBetAction(self, 1),
+                custom_id=self.component_id("roulette", "bet-up"),
                 row=4,
             )
         )
@@ -439,20 +619,27 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label=f"Help",
                 action=GetRouletteTable(self),
+                custom_id=self.component_id("roulette", "help"),
                 row=4,
             )
         )
 
     async def prepare_video_poker(self):
-        self.dealer = VideoPokerDealer()
-        self.cassino_player = await VideoPokerPlayer.create(self.member, self.dealer)
-        self.clear_items()
+        self.dealer = self.dealer or VideoPokerDealer()
+        self.cassino_player = await self.load_player(
+            "video_poker", lambda member: VideoPokerPlayer.create(member, self.dealer)
+        )
+        self.cassino_player.new_hand()
+        self.show_layout("video_poker", self.build_video_poker)
+
+    def build_video_poker(self):
 
         self.add_item(
             VideoPokerButton(
                 style=discord.ButtonStyle.grey,
                 label="$1" + "0"*self.bet_multiplier,
                 action=VideoPokerBetAction(self, 1*(10**self.bet_multiplier)),
+                custom_id=self.component_id("video_poker", "amount-1"),
                 row=0,
             )
         )
@@ -461,6 +648,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="$2" + "0"*self.bet_multiplier,
                 action=VideoPokerBetAction(self, 2*(10**self.bet_multiplier)),
+                custom_id=self.component_id("video_poker", "amount-2"),
                 row=0,
             )
         )
@@ -469,6 +657,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="$3" + "0"*self.bet_multiplier,
                 action=VideoPokerBetAction(self, 3*(10**self.bet_multiplier)),
+                custom_id=self.component_id("video_poker", "amount-3"),
                 row=0,
             )
         )
@@ -477,6 +666,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="$4" + "0"*self.bet_multiplier,
                 action=VideoPokerBetAction(self, 4*(10**self.bet_multiplier)),
+                custom_id=self.component_id("video_poker", "amount-4"),
                 row=0,
             )
         )
@@ -485,6 +675,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.grey,
                 label="$5" + "0"*self.bet_multiplier,
                 action=VideoPokerBetAction(self, 5*(10**self.bet_multiplier)),
+                custom_id=self.component_id("video_poker", "amount-5"),
                 row=0,
             )
         )
@@ -494,6 +685,7 @@ class CassinoView(discord.ui.View):
                 label=config.emoji.cassino.video_poker.unlock,
                 action=LockCardAction(self, 0),
                 disabled=True,
+                custom_id=self.component_id("video_poker", "lock-0"),
                 row=1,
             )
         )
@@ -503,6 +695,7 @@ class CassinoView(discord.ui.View):
                 label=config.emoji.cassino.video_poker.unlock,
                 action=LockCardAction(self, 1),
                 disabled=True,
+                custom_id=self.component_id("video_poker", "lock-1"),
                 row=1,
             )
         )
@@ -512,6 +705,7 @@ class CassinoView(discord.ui.View):
                 label=config.emoji.cassino.video_poker.unlock,
                 action=LockCardAction(self, 2),
                 disabled=True,
+                custom_id=self.component_id("video_poker", "lock-2"),
                 row=1,
             )
         )
@@ -521,6 +715,7 @@ class CassinoView(discord.ui.View):
                 label=config.emoji.cassino.video_poker.unlock,
                 action=LockCardAction(self, 3),
                 disabled=True,
+                custom_id=self.component_id("video_poker", "lock-3"),
                 row=1,
             )
         )
@@ -530,6 +725,7 @@ class CassinoView(discord.ui.View):
                 label=config.emoji.cassino.video_poker.unlock,
                 action=LockCardAction(self, 4),
                 disabled=True,
+                custom_id=self.component_id("video_poker", "lock-4"),
                 row=1,
             )
         )
@@ -538,6 +734,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="<<",
                 action=VideoPokerReturnAction(self),
+                custom_id=self.component_id("video_poker", "return"),
                 row=2,
             )
         )
@@ -546,6 +743,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label="Start",
                 action=VideoPokerStartAction(self),
+                custom_id=self.component_id("video_poker", "start"),
                 row=2,
             )
         )
@@ -555,6 +753,7 @@ class CassinoView(discord.ui.View):
                 label="Draw",
                 action=RedrawAction(self),
                 disabled=True,
+                custom_id=self.component_id("video_poker", "draw"),
                 row=2,
             
             )
@@ -564,6 +763,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label=f"/10",
                 action=VideoPokerModifyBetAction(self, -1),
+                custom_id=self.component_id("video_poker", "bet-down"),
                 row=2,
             )
         )
@@ -572,6 +772,7 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label=f"x10",
                 action=VideoPokerModifyBetAction(self, 1),
+                custom_id=self.component_id("video_poker", "bet-up"),
                 row=2,
             )
         )
@@ -580,6 +781,55 @@ class CassinoView(discord.ui.View):
                 style=discord.ButtonStyle.blurple,
                 label=f"Help",
                 action=DisplayHandsAction(self),
+                custom_id=self.component_id("video_poker", "help"),
+                row=3,
+            )
+        )
+        self.add_item(
+            VideoPokerButton(
+                style=discord.ButtonStyle.blurple,
+                label=f"Hint",
+                action=VideoPokerHintAction(self),
+                disabled=True,
+                custom_id=self.component_id("video_poker", "hint"),
                 row=3,
             )
-        )
\ No newline at end of file
+        )
+
+class CassinoControl(discord.ui.DynamicItem[discord.ui.Item], template=CASSINO_CUSTOM_ID):
+    """
+    Handles the clicks on cassino messages without a live view, sent before a restart or dropped from
+    `CassinoView.sessions`. The cassino is rebuilt on the game of the clicked control, which is then played.
+    A round that was in flight is lost with the old view, so its bet is refunded instead.
+    """
+    def __init__(self, item: discord.ui.Item, match: re.Match[str]):
+        super().__init__(item)
+        self.match = match
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Item, match: re.Match[str]):
+        return cls(item, match)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Messages with a live view are handled by that view.
+        return interaction.message.id not in CassinoView.sessions
+
+    async def callback(self, interaction: discord.Interaction):
+        if interaction.user.id != int(self.match["member_id"]):
+            await interaction.response.send_message("This is not your cassino!", ephemeral=True)
+            return
+
+        view = CassinoView(member=interaction.user)
+        view.bind(interaction.message)
+        refund = await open_stakes.refund(interaction.message.id, interaction.user.id)
+        await view.prepare_game(self.match["game"])
+        interaction.client.add_view(view, message_id=interaction.message.id)
+
+        control = discord.utils.get(view.children, custom_id=self.custom_id)
+        if refund or control is None or control.disabled:
+            content = f"Your round was interrupted, your ${refund} bet was refunded." if refund else None
+            await interaction.response.edit_message(content=content, view=view)
+            return
+        # Done by discord.py before dispatching to a live view, it gives a select its chosen values.
+        control._refresh_state(interaction, interaction.data)
+        await control.callback(interaction)
@@ -0,0 +1,212 @@
+"""
+Tests for the Lavalink node balancer, run against local stand-in nodes.
+
+The stand-in nodes are real `wavelink.Node` objects that never open a connection: their status is set
+directly and `fetch_stats` returns canned Lavalink stats. The players are `wavelink.Player` subclasses
+that record the node switches and disconnections instead of talking to Lavalink or Discord.
+"""
+import asyncio
+import types
+
+import pytest
+import wavelink
+
+from modules.utils._node_utils import NodeBalancer, node_penalty
+
+
+def make_stats(playing=0, system_load=0.0, lavalink_load=0.0, deficit=0, nulled=0):
+    return wavelink.StatsResponsePayload({
+        "players": playing,
+        "playingPlayers": playing,
+        "uptime": 0,
+        "memory": {"free": 0, "used": 0, "allocated": 0, "reservable": 0},
+        "cpu": {"cores": 4, "systemLoad": system_load, "lavalinkLoad": lavalink_load},
+        "frameStats": {"sent": 3000, "nulled": nulled, "deficit": deficit},
+    })
+
+
+def make_node(identifier, stats=None, status=wavelink.NodeStatus.CONNECTED):
+    """
+    Returns a stand-in node, which must be created inside a running event loop.
+    """
+    node = wavelink.Node(identifier=identifier, uri=f"http://{identifier}:2333", password="stand-in")
+    node._status = status
+
+    async def fetch_stats():
+        if stats is None:
+            raise wavelink.NodeException("Stand-in node is unreachable")
+        return stats
+
+    node.fetch_stats = fetch_stats
+    return node
+
+
+class StandInPlayer(wavelink.Player):
+    def __init__(self, node, guild_id, fail_switch=False):
+        self._stand_in_node = node
+        self._stand_in_guild = types.SimpleNamespace(id=guild_id)
+        self.fail_switch = fail_switch
+        self.disconnected = False
+
+    @property
+    def node(self):
+        return self._stand_in_node
+
+    @property
+    def guild(self):
+        return self._stand_in_guild
+
+    async def switch_node(self, new_node):
+        if self.fail_switch:
+            raise RuntimeError("Stand-in player failed to switch")
+        self._stand_in_node = new_node
+
+    async def disconnect(self, **kwargs):
+        self.disconnected = True
+
+
+def make_balancer(nodes, players=()):
+    balancer = NodeBalancer(interval=30, cpu_load=0.9, frame_deficit=0.05)
+    balancer.nodes = lambda: list(nodes)
+    balancer.client = types.SimpleNamespace(voice_clients=list(players))
+    return balancer
+
+
+def run(scenario):
+    """
+    Runs `scenario` in an event loop and closes the HTTP sessions of the stand-in nodes it returns.
+    """
+    async def main():
+        nodes = await scenario()
+        for node in nodes or ():
+            await node._session.close()
+
+    asyncio.run(main())
+
+
+def test_node_penalty_ordering():
+    node = types.SimpleNamespace(players={})
+    idle = node_penalty(node, make_stats())
+    busy = node_penalty(node, make_stats(playing=20))
+    loaded = node_penalty(node, make_stats(playing=20, system_load=0.8))
+    lagging = node_penalty(node, make_stats(playing=20, deficit=300))
+    nulling = node_penalty(node, make_stats(playing=20, nulled=300))
+
+    assert idle == 0
+    assert idle < busy < loaded
+    assert busy < lagging
+    assert busy < nulling
+    assert node_penalty(node, make_stats(playing=20), placed=5) == busy + 5
+    assert node_penalty(types.SimpleNamespace(players={1: None, 2: None}), None, placed=1) == 3
+
+
+def test_best_node_skips_degraded_and_disconnected_nodes():
+    async def scenario():
+        idle_down = make_node("idle-down", make_stats(), status=wavelink.NodeStatus.DISCONNECTED)
+        idle_degraded = make_node("idle-degraded", make_stats(lavalink_load=0.95))
+        busy = make_node("busy", make_stats(playing=30))
+        balancer = make_balancer([idle_down, idle_degraded, busy])
+        await balancer.refresh()
+
+        assert balancer.degraded == {"idle-degraded"}
+        assert balancer.best_node() is busy
+        assert balancer.best_node(exclude=busy) is idle_degraded
+        return [idle_down, idle_degraded, busy]
+
+    run(scenario)
+
+
+def test_unreachable_node_is_degraded():
+    async def scenario():
+        unreachable = make_node("unreachable")
+        busy = make_node("busy", make_stats(playing=30))
+        balancer = make_balancer([unreachable, busy])
+        await balancer.refresh()
+
+        assert "unreachable" in balancer.degraded
+        assert balancer.best_node() is busy
+        return [unreachable, busy]
+
+    run(scenario)
+
+
+def test_player_counts_placements(monkeypatch):
+    created = []
+    monkeypatch.setattr(wavelink, "Player", lambda client, channel, nodes=None: created.append(nodes) or nodes)
+
+    async def scenario():
+        first = make_node("first", make_stats(playing=3))
+        second = make_node("second", make_stats(playing=4))
+        balancer = make_balancer([first, second])
+        await balancer.refresh()
+
+        balancer.player(None, None)
+        assert balancer.placed == {"first": 1, "second": 0}
+        balancer.player(None, None)
+        balancer.player(None, None)
+        assert balancer.placed == {"first": 2, "second": 1}
+        assert created == [[first], [first], [second]]
+        return [first, second]
+
+    run(scenario)
+
+
+def test_disconnected_node_moves_every_player():
+    async def scenario():
+        dropped = make_node("dropped", make_stats(), status=wavelink.NodeStatus.DISCONNECTED)
+        loaded = make_node("loaded", make_stats(playing=50, system_load=0.7))
+        players = [StandInPlayer(dropped, guild_id) for guild_id in range(3)]
+        stuck = StandInPlayer(dropped, 3, fail_switch=True)
+        balancer = make_balancer([dropped, loaded], players + [stuck])
+        await balancer.refresh()
+
+        await balancer.evacuate(dropped, disconnected=True)
+
+        assert all(player.node is loaded and not player.disconnected for player in players)
+        assert stuck.disconnected and stuck.node is dropped
+        assert balancer.migrations == 3
+        return [dropped, loaded]
+
+    run(scenario)
+
+
+def test_degraded_node_sheds_players_while_another_is_less_loaded():
+    async def scenario():
+        degraded = make_node("degraded", make_stats(playing=4, lavalink_load=0.95))
+        healthy = make_node("healthy", make_stats(playing=1))
+        players = [StandInPlayer(degraded, guild_id) for guild_id in range(4)]
+        balancer = make_balancer([degraded, healthy], players)
+
+        await balancer.refresh()
+
+        moved = [player for player in players if player.node is healthy]
+        # Players move while the healthy node is less loaded: 1 < 4, then 2 < 3, and 3 >= 2 stops the evacuation.
+        assert len(moved) == 2
+        assert balancer.penalty(healthy) >= balancer.penalty(degraded)
+        assert balancer.migrations == 2
+        assert not any(player.disconnected for player in players)
+        return [degraded, healthy]
+
+    run(scenario)
+
+
+def test_degraded_node_keeps_players_when_no_node_is_less_loaded():
+    async def scenario():
+        degraded = make_node("degraded", make_stats(playing=2, lavalink_load=0.95))
+        busy = make_node("busy", make_stats(playing=40))
+        players = [StandInPlayer(degraded, guild_id) for guild_id in range(2)]
+        balancer = make_balancer([degraded, busy], players)
+
+        await balancer.refresh()
+
+        assert "degraded" in balancer.degraded
+        assert all(player.node is degraded for player in players)
+        assert balancer.migrations == 0
+        return [degraded, busy]
+
+    run(scenario)
+
+
+@pytest.fixture(autouse=True)
+def quiet_logging(caplog):
+    caplog.set_level("CRITICAL")